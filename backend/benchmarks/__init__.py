@@ -0,0 +1,8 @@
+"""
+End-to-end benchmarks that run the four services in one process.
+
+    python -m backend.benchmarks run --output before.json
+    python -m backend.benchmarks compare before.json after.json
+
+See the "Benchmarks" section of the README.
+"""
@@ -0,0 +1,96 @@
+"""
+Run the end-to-end benchmarks, or compare two reports.
+
+    python -m backend.benchmarks run --fake-redis --output before.json
+    python -m backend.benchmarks run --database-url postgresql+psycopg2://... --output after.json
+    python -m backend.benchmarks compare before.json after.json
+
+Without --database-url the services share a fresh SQLite file; without
+--fake-redis they use the Redis at REDIS_HOST/REDIS_PORT.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from dataclasses import asdict
+
+from backend.benchmarks.report import ScenarioResult, build_report, compare, environment, write_report
+from backend.benchmarks.scenarios import SCENARIOS, ScenarioOptions
+from backend.benchmarks.stack import QueryCounter, StackOptions, boot
+
+
+async def run(args: argparse.Namespace) -> None:
+    stack_options = StackOptions(
+        database_url=args.database_url,
+        fake_redis=args.fake_redis,
+        users=args.users,
+        threads=args.threads,
+        comments=args.comments,
+        seed=args.seed,
+    )
+    options = ScenarioOptions(
+        operations=args.operations,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        subscribers=args.subscribers,
+        broadcasts=args.broadcasts,
+        fanout=args.fanout,
+        seed=args.seed,
+    )
+    names = args.scenarios or list(SCENARIOS)
+
+    counter = QueryCounter()
+    results: dict[str, ScenarioResult] = {}
+    async with boot(stack_options) as stack:
+        for name in SCENARIOS:
+            if name not in names:
+                continue
+            print(f"Running {name}...", flush=True)
+            outcome = await SCENARIOS[name](stack, counter, options)
+            results.update(outcome if isinstance(outcome, dict) else {name: outcome})
+
+    redis = "fakeredis" if args.fake_redis else f"{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}"
+    settings = {"dataset": asdict(stack_options) | {"database_url": None}, "scenarios": asdict(options)}
+    write_report(build_report(environment(stack.database_url, redis, settings), results), args.output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="boot the services and run scenarios")
+    run_parser.add_argument("--database-url", help="defaults to a new SQLite file")
+    run_parser.add_argument("--fake-redis", action="store_true", help="use fakeredis instead of REDIS_HOST")
+    run_parser.add_argument("--users", type=int, default=2_000)
+    run_parser.add_argument("--threads", type=int, default=500)
+    run_parser.add_argument("--comments", type=int, default=10_000)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--operations", type=int, default=1_000, help="measured requests per HTTP scenario")
+    run_parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients per HTTP scenario")
+    run_parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests first")
+    run_parser.add_argument("--subscribers", type=int, default=10_000, help="websockets on one thread room")
+    run_parser.add_argument("--broadcasts", type=int, default=5, help="updates sent to the subscribers")
+    run_parser.add_argument("--fanout", type=int, default=200, help="users mentioned in the fan-out comment")
+    run_parser.add_argument("--scenario", dest="scenarios", action="append", choices=list(SCENARIOS))
+    run_parser.add_argument("--output", help="write the JSON report here instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="compare two JSON reports")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        with open(args.before) as before, open(args.after) as after:
+            print("\n".join(compare(json.load(before), json.load(after))))
+        return
+
+    # Per-request logging would dominate the timings.
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Minimal in-process ASGI client for HTTP requests and websockets.
+
+Requests are handed straight to the app callable, so timings include
+middleware, routing, dependencies, validation, database work and
+serialization but no sockets or HTTP parsing.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Response:
+    status: int
+    body: bytes = b""
+    headers: list[tuple[bytes, bytes]] = field(default_factory=list)
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def _scope(kind: str, path: str, token: str | None, headers: list[tuple[bytes, bytes]]) -> dict:
+    path, _, query = path.partition("?")
+    headers = [(b"host", b"benchmark"), *headers]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return {
+        "type": kind,
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "http" if kind == "http" else "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+
+
+class ASGIClient:
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, method: str, path: str, *, json_body=None, token: str | None = None) -> Response:
+        body = b"" if json_body is None else json.dumps(json_body).encode()
+        headers = [(b"content-type", b"application/json")] if json_body is not None else []
+        scope = _scope("http", path, token, headers)
+        scope["method"] = method
+
+        response = Response(status=0)
+        finished = asyncio.Event()
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response.status = message["status"]
+                response.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                response.body += message.get("body", b"")
+                if not message.get("more_body", False):
+                    finished.set()
+
+        await self.app(scope, receive, send)
+        finished.set()
+        return response
+
+    async def get(self, path: str, **kwargs) -> Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> Response:
+        return await self.request("POST", path, **kwargs)
+
+    def websocket(self, path: str, token: str | None = None) -> "WebSocketClient":
+        return WebSocketClient(self.app, _scope("websocket", path, token, []))
+
+
+class WebSocketClient:
+    """One websocket connection; received JSON messages queue up in `messages`."""
+
+    def __init__(self, app, scope: dict):
+        self.app = app
+        self.scope = scope
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self._accepted: asyncio.Future | None = None
+        self._task: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        self._accepted = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self.app(self.scope, self.incoming.get, self._send))
+        await self.incoming.put({"type": "websocket.connect"})
+        await self._accepted
+
+    async def _send(self, message: dict) -> None:
+        if message["type"] == "websocket.accept":
+            self._accepted.set_result(True)
+        elif message["type"] == "websocket.close":
+            if not self._accepted.done():
+                self._accepted.set_exception(ConnectionRefusedError(f"closed with {message.get('code')}"))
+        elif message["type"] == "websocket.send":
+            text = message.get("text")
+            self.messages.put_nowait(json.loads(text if text is not None else message["bytes"]))
+
+    async def receive_json(self, timeout: float | None = None):
+        return await asyncio.wait_for(self.messages.get(), timeout)
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        await self.incoming.put({"type": "websocket.disconnect", "code": 1000})
+        await self._task
+        self._task = None
@@ -0,0 +1,125 @@
+"""
+Collect per-scenario samples and turn them into comparable JSON reports.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, as in backend/scripts/benchmark_http_load.py."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+@dataclass
+class ScenarioResult:
+    latencies_ms: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def add(self, latency_ms: float, queries: int | None = None, error: str | None = None) -> None:
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+            return
+        self.latencies_ms.append(latency_ms)
+        if queries is not None:
+            self.queries.append(queries)
+
+    def summary(self) -> dict:
+        latencies = self.latencies_ms
+        summary = {
+            "operations": len(latencies),
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "throughput_per_s": round(len(latencies) / self.seconds, 1) if self.seconds else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50), 2),
+                "p95": round(percentile(latencies, 0.95), 2),
+                "p99": round(percentile(latencies, 0.99), 2),
+                "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+                "max": round(max(latencies), 2) if latencies else 0.0,
+            },
+        }
+        if self.queries:
+            summary["queries_per_request"] = {
+                "mean": round(statistics.fmean(self.queries), 2),
+                "p95": percentile(self.queries, 0.95),
+                "max": max(self.queries),
+            }
+        return summary
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(database_url: str, redis: str, settings: dict) -> dict:
+    """What produced a report, so two runs can be checked for comparability."""
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": database_url.split(":", 1)[0],
+        "redis": redis,
+        "settings": settings,
+    }
+
+
+def build_report(env: dict, results: dict[str, ScenarioResult]) -> dict:
+    return {"environment": env, "scenarios": {name: result.summary() for name, result in results.items()}}
+
+
+def write_report(report: dict, path: str | None) -> None:
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path:
+        Path(path).write_text(text + "\n")
+        print(f"Report written to {path}")
+    else:
+        print(text)
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(before: dict, after: dict) -> list[str]:
+    """Side-by-side lines for the scenarios both reports ran."""
+    lines = []
+    for key in ("database", "redis", "settings"):
+        if before["environment"].get(key) != after["environment"].get(key):
+            lines.append(f"warning: runs differ in {key}; numbers may not be comparable")
+    lines.append(
+        f"{(before['environment'].get('commit') or '?')[:10]} -> {(after['environment'].get('commit') or '?')[:10]}"
+    )
+    lines.append(f"{'scenario':<22}{'metric':<18}{'before':>12}{'after':>12}{'change':>10}")
+    for name in before["scenarios"]:
+        if name not in after["scenarios"]:
+            continue
+        old, new = before["scenarios"][name], after["scenarios"][name]
+        rows = [("throughput/s", old["throughput_per_s"], new["throughput_per_s"])]
+        rows += [(f"{q} ms", old["latency_ms"][q], new["latency_ms"][q]) for q in ("p50", "p95", "p99")]
+        if "queries_per_request" in old and "queries_per_request" in new:
+            rows.append(("queries/request", old["queries_per_request"]["mean"], new["queries_per_request"]["mean"]))
+        for label, a, b in rows:
+            lines.append(f"{name:<22}{label:<18}{a:>12}{b:>12}{_change(a, b):>10}")
+    return lines
@@ -0,0 +1,238 @@
+"""
+Scripted workloads. Each scenario derives its requests from a seeded RNG,
+so two runs against the same dataset issue exactly the same calls.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from backend.benchmarks.report import ScenarioResult
+from backend.benchmarks.stack import QueryCounter, Stack
+
+# (service, method, path, JSON body, acting user index)
+Request = tuple[str, str, str, dict | None, int]
+
+DELIVERY_TIMEOUT_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class ScenarioOptions:
+    operations: int = 1_000
+    concurrency: int = 50
+    warmup: int = 50
+    subscribers: int = 10_000
+    broadcasts: int = 5
+    fanout: int = 200
+    seed: int = 42
+
+
+def _rng(options: ScenarioOptions, name: str) -> random.Random:
+    return random.Random(f"{options.seed}:{name}")
+
+
+def _hot(rng: random.Random, size: int) -> int:
+    """Skewed pick so a few threads and users get most of the traffic."""
+    return min(size - 1, int(size * rng.random() ** 2))
+
+
+async def _issue(stack: Stack, counter: QueryCounter, result: ScenarioResult, request: Request) -> None:
+    service, method, path, body, user = request
+    started = time.perf_counter()
+    with counter.measure() as queries:
+        try:
+            response = await stack.clients[service].request(method, path, json_body=body, token=stack.token(user))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            result.add(0.0, error=type(exc).__name__)
+            return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if response.status >= 400:
+        result.add(elapsed_ms, error=str(response.status))
+    else:
+        result.add(elapsed_ms, queries[0])
+
+
+async def run_requests(
+    stack: Stack, counter: QueryCounter, requests: list[Request], options: ScenarioOptions
+) -> ScenarioResult:
+    """Issue `requests` from `concurrency` clients after an unmeasured warmup."""
+    for request in requests[:options.warmup]:
+        await _issue(stack, counter, ScenarioResult(), request)
+
+    result = ScenarioResult()
+    pending = iter(requests[options.warmup:])
+
+    async def client() -> None:
+        for request in pending:
+            await _issue(stack, counter, result, request)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(options.concurrency)))
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _total(options: ScenarioOptions) -> int:
+    return options.warmup + options.operations
+
+
+async def browse_feed(stack: Stack, counter: QueryCounter, options: ScenarioOptions) -> ScenarioResult:
+    """Home page: feed pages, the current user and the unread badge."""
+    rng = _rng(options, "browse_feed")
+    pages = max(1, min(50, stack.dataset.threads // 20))
+    requests = []
+    for _ in range(_total(options)):
+        user = _hot(rng, stack.dataset.users)
+        requests.append(rng.choice((
+            ("discussion", "GET", f"/threads/?page={rng.randint(1, pages)}&size=20", None, user),
+            ("auth", "GET", "/users/me", None, user),
+            ("notification", "GET", "/notifications/unread-count", None, user),
+        )))
+    return await run_requests(stack, counter, requests, options)
+
+
+async def open_thread(stack: Stack, counter: QueryCounter, options: ScenarioOptions) -> ScenarioResult:
+    """Thread page: the thread and the first page of its comment tree."""
+    rng = _rng(options, "open_thread")
+    requests = []
+    for _ in range(_total(options)):
+        thread_id = stack.thread_id(_hot(rng, stack.dataset.threads))
+        user = _hot(rng, stack.dataset.users)
+        requests.append(rng.choice((
+            ("discussion", "GET", f"/threads/{thread_id}", None, user),
+            ("discussion", "GET", f"/comments/thread/{thread_id}/tree", None, user),
+        )))
+    return await run_requests(stack, counter, requests, options)
+
+
+async def comment(stack: Stack, counter: QueryCounter, options: ScenarioOptions) -> ScenarioResult:
+    """Top-level comments on popular threads."""
+    rng = _rng(options, "comment")
+    requests = [
+        (
+            "discussion",
+            "POST",
+            f"/comments/thread/{stack.thread_id(_hot(rng, stack.dataset.threads))}",
+            {"content": f"benchmark comment {number}"},
+            _hot(rng, stack.dataset.users),
+        )
+        for number in range(_total(options))
+    ]
+    return await run_requests(stack, counter, requests, options)
+
+
+async def like_storm(stack: Stack, counter: QueryCounter, options: ScenarioOptions) -> ScenarioResult:
+    """Many different users liking the same thread at once."""
+    thread_id = stack.thread_id(0)
+    requests = [
+        ("discussion", "POST", f"/likes/thread/{thread_id}", None, user % stack.dataset.users)
+        for user in range(_total(options))
+    ]
+    return await run_requests(stack, counter, requests, options)
+
+
+async def _deliveries(sockets, started: float, result: ScenarioResult, accept: Callable[[dict], bool]) -> float:
+    """Wait for one accepted message per socket; record latency from `started`."""
+    async def delivered(socket) -> None:
+        while True:
+            message = await socket.receive_json()
+            if accept(message):
+                result.add((time.perf_counter() - started) * 1000)
+                return
+
+    _done, pending = await asyncio.wait(
+        [asyncio.create_task(delivered(socket)) for socket in sockets],
+        timeout=DELIVERY_TIMEOUT_SECONDS,
+    )
+    for task in pending:
+        task.cancel()
+        result.add(0.0, error="timeout")
+    return time.perf_counter() - started
+
+
+async def _open_sockets(stack: Stack, paths: list[str], result: ScenarioResult | None = None):
+    """Connect in batches of 500; the realtime routes take the token in the query string."""
+    sockets = []
+    for offset in range(0, len(paths), 500):
+        batch = [stack.clients["realtime"].websocket(path) for path in paths[offset:offset + 500]]
+
+        async def connect(socket):
+            started = time.perf_counter()
+            await socket.connect()
+            if result is not None:
+                result.add((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(connect(socket) for socket in batch))
+        sockets.extend(batch)
+    return sockets
+
+
+async def notification_fanout(stack: Stack, counter: QueryCounter, options: ScenarioOptions) -> ScenarioResult:
+    """
+    One comment mentioning `fanout` users, measured until every mentioned
+    user's /ws/notifications socket has the notification. This crosses
+    discussion -> Redis -> notification -> Redis -> realtime.
+    """
+    recipients = range(1, min(options.fanout, stack.dataset.users - 1) + 1)
+    sockets = await _open_sockets(stack, [f"/ws/notifications?token={stack.token(user)}" for user in recipients])
+    result = ScenarioResult()
+    try:
+        content = " ".join(f"@user{user}" for user in recipients)
+        started = time.perf_counter()
+        response = await stack.clients["discussion"].post(
+            f"/comments/thread/{stack.thread_id(1)}", json_body={"content": content}, token=stack.token(0)
+        )
+        if response.status >= 400:
+            result.add(0.0, error=str(response.status))
+            return result
+        result.seconds = await _deliveries(sockets, started, result, lambda message: message.get("event") == "mention")
+    finally:
+        await asyncio.gather(*(socket.close() for socket in sockets))
+    return result
+
+
+async def websocket_subscribers(stack: Stack, counter: QueryCounter, options: ScenarioOptions) -> dict[str, ScenarioResult]:
+    """
+    `subscribers` sockets on one thread room, then likes on that thread,
+    measured until every socket has received the update.
+    """
+    thread_id = stack.thread_id(0)
+    connects = ScenarioResult()
+    started = time.perf_counter()
+    sockets = await _open_sockets(
+        stack,
+        [f"/ws/threads/{thread_id}?token={stack.token(user % stack.dataset.users)}" for user in range(options.subscribers)],
+        connects,
+    )
+    connects.seconds = time.perf_counter() - started
+
+    broadcasts = ScenarioResult()
+    try:
+        for round_number in range(options.broadcasts):
+            started = time.perf_counter()
+            response = await stack.clients["discussion"].post(
+                f"/likes/thread/{thread_id}", token=stack.token(stack.dataset.users - 1 - round_number)
+            )
+            if response.status >= 400:
+                broadcasts.add(0.0, error=str(response.status))
+                continue
+            broadcasts.seconds += await _deliveries(sockets, started, broadcasts, lambda _message: True)
+    finally:
+        await asyncio.gather(*(socket.close() for socket in sockets))
+    return {"ws_connect": connects, "ws_broadcast": broadcasts}
+
+
+Scenario = Callable[[Stack, QueryCounter, ScenarioOptions], Awaitable["ScenarioResult | dict[str, ScenarioResult]"]]
+
+# Run in this order: reads first, so writes do not change what they see.
+SCENARIOS: dict[str, Scenario] = {
+    "browse_feed": browse_feed,
+    "open_thread": open_thread,
+    "comment": comment,
+    "like_storm": like_storm,
+    "notification_fanout": notification_fanout,
+    "websocket_subscribers": websocket_subscribers,
+}
@@ -0,0 +1,203 @@
+"""
+Boot the auth, discussion, notification and realtime apps in one process.
+
+Settings are read from the environment when the service modules are first
+imported, so `configure_environment` must run before anything imports them;
+this module therefore imports the services lazily.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
+
+from sqlalchemy import create_engine, event, func, inspect, select
+from sqlalchemy.engine import Engine
+
+from backend.benchmarks.asgi import ASGIClient
+
+if TYPE_CHECKING:
+    from backend.scripts.synthetic_data import GeneratorConfig
+
+PASSWORD = "Password@123"
+
+
+@dataclass(frozen=True)
+class StackOptions:
+    database_url: str | None = None
+    fake_redis: bool = False
+    users: int = 2_000
+    threads: int = 500
+    comments: int = 10_000
+    seed: int = 42
+
+
+@dataclass
+class Stack:
+    options: StackOptions
+    database_url: str
+    clients: dict[str, ASGIClient]
+    dataset: GeneratorConfig
+    _tokens: dict[int, str] = field(default_factory=dict)
+
+    def user_id(self, index: int) -> str:
+        from backend.scripts.synthetic_data import user_id
+
+        return str(user_id(self.dataset, index))
+
+    def thread_id(self, index: int) -> str:
+        from backend.scripts.synthetic_data import stable_uuid
+
+        return str(stable_uuid(self.dataset.seed, "thread", index))
+
+    def token(self, index: int) -> str:
+        """Access token for synthetic user `index` (user<index>)."""
+        if index not in self._tokens:
+            from backend.services.auth_service.app.core.security import create_access_token
+
+            self._tokens[index] = create_access_token({"sub": self.user_id(index)}, timedelta(hours=12))
+        return self._tokens[index]
+
+
+class QueryCounter:
+    """
+    Counts statements per request.
+
+    Every engine (sync, async, replicas) reports to one listener; the count
+    goes to whichever request set `measure()` in its context, which follows
+    the request into the threadpool and the async driver's greenlet.
+    """
+
+    def __init__(self):
+        self._current: ContextVar[list[int] | None] = ContextVar("benchmark_queries", default=None)
+        event.listen(Engine, "before_cursor_execute", self._count)
+
+    def _count(self, *_args) -> None:
+        box = self._current.get()
+        if box is not None:
+            box[0] += 1
+
+    @contextmanager
+    def measure(self) -> Iterator[list[int]]:
+        box = [0]
+        token = self._current.set(box)
+        try:
+            yield box
+        finally:
+            self._current.reset(token)
+
+
+def configure_environment(options: StackOptions) -> str:
+    """Point every service at one database and return its URL."""
+    database_url = options.database_url
+    if database_url is None:
+        directory = Path(tempfile.mkdtemp(prefix="forum-bench-"))
+        database_url = f"sqlite+pysqlite:///{directory / 'bench.db'}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-with-at-least-32-bytes")
+    # SQL echo and background work would land in random scenarios and make runs noisy.
+    os.environ["DEBUG"] = "false"
+    os.environ["COUNTER_RECONCILE_ENABLED"] = "false"
+    return database_url
+
+
+def use_fake_redis() -> None:
+    """Swap every Redis client for fakeredis clients sharing one server."""
+    try:
+        import fakeredis
+    except ImportError as exc:
+        raise SystemExit("--fake-redis needs the fakeredis package: pip install fakeredis") from exc
+
+    from backend.services.discussion_service.app.core import events, redis as discussion_redis
+    from backend.services.discussion_service.app.core.thread_cache import thread_cache
+    from backend.services.notification_service.app.core import redis_listener
+    from backend.services.realtime_service.app.core import redis as realtime_redis
+    from backend.shared.database import counts, routing
+
+    server = fakeredis.FakeServer()
+
+    def sync_client():
+        return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+    def async_client():
+        return fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+
+    events.redis_client = sync_client()
+    thread_cache.client = events.redis_client
+    discussion_redis.redis_client = sync_client()
+    counts._redis_client = sync_client()
+    counts._async_redis_client = async_client()
+    routing._redis_client = sync_client()
+    routing._async_redis_client = async_client()
+    redis_listener.redis_client = async_client()
+    realtime_redis.redis_client = async_client()
+
+
+def load_dataset(database_url: str, options: StackOptions) -> GeneratorConfig:
+    """
+    Generate the synthetic dataset, or reuse one already loaded.
+
+    Ids derive from the seed, so an existing database must have been
+    generated with the same --seed and sizes for runs to be comparable.
+    """
+    from pwdlib import PasswordHash
+
+    from backend.scripts.synthetic_data import GeneratorConfig, generate
+
+    config = GeneratorConfig(
+        users=options.users,
+        threads=options.threads,
+        comments=options.comments,
+        seed=options.seed,
+    )
+    engine = create_engine(database_url)
+    try:
+        if inspect(engine).has_table("users"):
+            from backend.services.auth_service.app.models.user import User
+
+            with engine.connect() as connection:
+                if connection.scalar(select(func.count()).select_from(User.__table__)):
+                    print("Reusing the data already in the database.")
+                    return config
+    finally:
+        engine.dispose()
+
+    print(f"Loading {options.users} users, {options.threads} threads, ~{options.comments} comments...")
+    generate(database_url, config, PasswordHash.recommended().hash(PASSWORD))
+    return config
+
+
+@asynccontextmanager
+async def boot(options: StackOptions) -> AsyncIterator[Stack]:
+    """Load data, run every app's lifespan and yield clients for them."""
+    database_url = configure_environment(options)
+    dataset = load_dataset(database_url, options)
+
+    from backend.services.auth_service.app.main import app as auth_app
+    from backend.services.discussion_service.app.main import app as discussion_app
+    from backend.services.notification_service.app.main import app as notification_app
+    from backend.services.realtime_service.app.main import app as realtime_app
+
+    if options.fake_redis:
+        use_fake_redis()
+
+    apps = {
+        "auth": auth_app,
+        "discussion": discussion_app,
+        "notification": notification_app,
+        "realtime": realtime_app,
+    }
+    async with AsyncExitStack() as lifespans:
+        for app in apps.values():
+            await lifespans.enter_async_context(app.router.lifespan_context(app))
+        yield Stack(
+            options=options,
+            database_url=database_url,
+            clients={name: ASGIClient(app) for name, app in apps.items()},
+            dataset=dataset,
+        )
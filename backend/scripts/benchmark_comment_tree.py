@@ -0,0 +1,128 @@
+"""
+Time CommentService.get_thread_comments on one large synthetic thread.
+
+Seeds a throwaway SQLite database with a single thread whose comments form
+a random reply tree plus one long reply chain, likes a share of them as the
+viewer, then reports the query count and the build/serialize times.
+
+    python backend/scripts/benchmark_comment_tree.py --comments 10000 --chain 2000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-with-at-least-32-bytes")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.services.auth_service.app.models.user import User  # noqa: E402
+from backend.services.discussion_service.app.models.comment import Comment, child_path  # noqa: E402
+from backend.services.discussion_service.app.models.like import Like  # noqa: E402
+from backend.services.discussion_service.app.models.thread import Thread  # noqa: E402
+from backend.services.discussion_service.app.schemas.comment import CommentRead  # noqa: E402
+from backend.services.discussion_service.app.services.comment_service import CommentService  # noqa: E402
+from backend.shared.database.base import Base  # noqa: E402
+
+
+def seed(db: Session, comments: int, chain: int, authors: int, like_ratio: float, rng: random.Random):
+    users = [
+        User(username=f"bench{i}", email=f"bench{i}@example.com", hashed_password="x", full_name=f"Bench {i}")
+        for i in range(authors)
+    ]
+    db.add_all(users)
+    db.flush()
+    viewer = users[0]
+
+    thread = Thread(title="Benchmark thread", description="Synthetic comment tree", author_id=viewer.id)
+    db.add(thread)
+    db.flush()
+
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(comments):
+        if i < chain:
+            parent = rows[-1] if rows else None
+        else:
+            # Roughly a third top-level, the rest replying to an earlier comment.
+            parent = rng.choice(rows) if rows and rng.random() > 0.3 else None
+        comment_id = uuid.uuid4()
+        rows.append({
+            "id": comment_id,
+            "content": f"comment {i}",
+            "thread_id": thread.id,
+            "author_id": rng.choice(users).id,
+            "parent_id": parent["id"] if parent else None,
+            "path": child_path(parent["path"] if parent else None, comment_id),
+            "depth": parent["depth"] + 1 if parent else 0,
+            "created_at": base + timedelta(seconds=i),
+            "updated_at": base + timedelta(seconds=i),
+        })
+    db.execute(insert(Comment), rows)
+
+    liked = rng.sample(rows, int(len(rows) * like_ratio))
+    if liked:
+        db.execute(insert(Like), [{"user_id": viewer.id, "comment_id": row["id"]} for row in liked])
+    db.commit()
+    return thread.id, SimpleNamespace(id=viewer.id)
+
+
+def run(args: argparse.Namespace) -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    rng = random.Random(args.seed)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *params: statements.append(params[2]))
+
+    with Session(engine) as db:
+        started = time.perf_counter()
+        thread_id, viewer = seed(db, args.comments, args.chain, args.authors, args.like_ratio, rng)
+        print(f"Seeded {args.comments} comments (chain of {args.chain}) in {time.perf_counter() - started:.1f}s\n")
+
+        build_ms, serialize_ms, queries = [], [], []
+        for _ in range(args.repeat):
+            db.expire_all()
+            statements.clear()
+            started = time.perf_counter()
+            tree = CommentService(db).get_thread_comments(thread_id, viewer)
+            build_ms.append((time.perf_counter() - started) * 1000)
+            queries.append(len(statements))
+
+            started = time.perf_counter()
+            [CommentRead.model_validate(root).model_dump(mode="json") for root in tree]
+            serialize_ms.append((time.perf_counter() - started) * 1000)
+
+        print(f"{'roots':<14}{len(tree):>10}")
+        print(f"{'queries':<14}{max(queries):>10}")
+        print(f"{'build ms':<14}{statistics.median(build_ms):>10.1f}")
+        print(f"{'serialize ms':<14}{statistics.median(serialize_ms):>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comments", type=int, default=10000)
+    parser.add_argument("--chain", type=int, default=1000, help="length of one straight reply chain")
+    parser.add_argument("--authors", type=int, default=200)
+    parser.add_argument("--like-ratio", type=float, default=0.1, help="share of comments the viewer liked")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Measure event encode/decode cost per codec at a target event rate.
+
+Encodes a realistic mix of discussion event envelopes, decodes them the
+way a consumer does, and times the realtime fan-out with and without
+re-encoding per socket. Reports the CPU share one core spends at --rate.
+
+    python backend/scripts/benchmark_event_codec.py --rate 50000 --events 200000 --sockets 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.shared.events.codec import get_codec  # noqa: E402
+from backend.shared.events.envelope import make_envelope  # noqa: E402
+
+
+def sample_events(count: int, rng: random.Random) -> list[dict]:
+    thread_ids = [str(uuid.uuid4()) for _ in range(200)]
+    user_ids = [str(uuid.uuid4()) for _ in range(1000)]
+    events = []
+    for _ in range(count):
+        thread_id, actor_id = rng.choice(thread_ids), rng.choice(user_ids)
+        kind = rng.random()
+        if kind < 0.6:
+            event = make_envelope("thread.like.updated", thread_id, actor_id, {"thread_id": thread_id, "like_count": rng.randint(0, 10_000)})
+        elif kind < 0.8:
+            event = make_envelope("thread.liked", thread_id, actor_id, {"owner_id": rng.choice(user_ids)})
+        else:
+            comment_id = str(uuid.uuid4())
+            event = make_envelope(
+                "comment.created",
+                thread_id,
+                actor_id,
+                {"id": comment_id, "content": "lorem ipsum " * rng.randint(1, 40), "author_id": actor_id, "parent_id": None, "like_count": 0},
+            )
+        event["traceparent"] = f"00-{uuid.uuid4().hex}-{uuid.uuid4().hex[:16]}-01"
+        events.append(event)
+    return events
+
+
+def _timed(fn, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return time.perf_counter() - started
+
+
+def bench(name: str, events: list[dict], rate: int, sockets: int) -> dict:
+    codec = get_codec(name)
+    encoded = [codec.encode(event) for event in events]
+    # Consumers read through decode_responses=True clients, so they see str.
+    received = [raw.decode("utf-8", "surrogateescape") for raw in encoded]
+
+    encode_s = _timed(codec.encode, events)
+    decode_s = _timed(codec.decode, received)
+    # Old realtime path: send_json encoded the dict again for every socket.
+    per_socket_s = _timed(lambda event: [json.dumps(event, separators=(",", ":")) for _ in range(sockets)], events)
+    # New path: decode once, forward the received text (or encode once for binary codecs).
+    forward_s = _timed(codec.to_text, events) if codec.binary else 0.0
+
+    count = len(events)
+    per_event_us = (encode_s + decode_s) / count * 1e6
+    return {
+        "codec": codec.name,
+        "bytes": sum(len(raw) for raw in encoded) / count,
+        "encode_us": encode_s / count * 1e6,
+        "decode_us": decode_s / count * 1e6,
+        "core_share": per_event_us * rate / 1e6,
+        "fanout_before_us": per_socket_s / count * 1e6,
+        "fanout_after_us": forward_s / count * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=int, default=50_000, help="target events per second")
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--sockets", type=int, default=20, help="sockets per room for the fan-out comparison")
+    parser.add_argument("--codecs", default="json,orjson,msgpack")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    events = sample_events(args.events, random.Random(args.seed))
+    print(f"{args.events} events, {args.rate}/s target, {args.sockets} sockets per room")
+    print(f"{'codec':<8} {'bytes':>7} {'enc µs':>8} {'dec µs':>8} {'core @rate':>11} {'fan-out µs before → after':>28}")
+    for name in args.codecs.split(","):
+        try:
+            row = bench(name.strip(), events, args.rate, args.sockets)
+        except ValueError as exc:
+            print(f"{name:<8} skipped: {exc}")
+            continue
+        print(
+            f"{row['codec']:<8} {row['bytes']:>7.0f} {row['encode_us']:>8.2f} {row['decode_us']:>8.2f} "
+            f"{row['core_share']:>10.0%} {row['fanout_before_us']:>16.2f} → {row['fanout_after_us']:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Measure requests/second for an endpoint under many concurrent clients.
+
+Each client keeps one HTTP/1.1 keep-alive connection open and sends GET
+requests back to back for the given duration. Run it once against a build
+with the sync route and once against the async one to compare, e.g.
+
+    python backend/scripts/benchmark_http_load.py \\
+        --url http://localhost:8001/threads/?size=10 --token "$TOKEN" --clients 500
+
+Only the standard library is used, so it runs anywhere the services do.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+class Client:
+    def __init__(self, host: str, port: int, request: bytes):
+        self.host = host
+        self.port = port
+        self.request = request
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def _connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def get(self) -> int:
+        if self.writer is None:
+            await self._connect()
+        self.writer.write(self.request)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed")
+        status = int(status_line.split()[1])
+        length, close = 0, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "connection" and value.strip().lower() == "close":
+                close = True
+        await self.reader.readexactly(length)
+        if close:
+            self.close()
+        return status
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def worker(client: Client, deadline: float, latencies: list[float], errors: list[str]) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            status = await client.get()
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError) as exc:
+            errors.append(type(exc).__name__)
+            client.close()
+            continue
+        if status >= 400:
+            errors.append(str(status))
+        else:
+            latencies.append((time.perf_counter() - started) * 1000)
+    client.close()
+
+
+async def run(args: argparse.Namespace) -> None:
+    url = urlsplit(args.url)
+    path = url.path or "/"
+    if url.query:
+        path = f"{path}?{url.query}"
+    headers = [f"GET {path} HTTP/1.1", f"Host: {url.netloc}", "Connection: keep-alive"]
+    if args.token:
+        headers.append(f"Authorization: Bearer {args.token}")
+    request = ("\r\n".join(headers) + "\r\n\r\n").encode()
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    deadline = time.perf_counter() + args.warmup
+    clients = [Client(url.hostname, url.port or 80, request) for _ in range(args.clients)]
+    await asyncio.gather(*(worker(client, deadline, [], []) for client in clients))
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(worker(client, deadline, latencies, errors) for client in clients))
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.clients} clients, {elapsed:.1f}s: {len(latencies) / elapsed:.1f} req/s, {len(errors)} errors")
+    if latencies:
+        latencies.sort()
+        for label, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            print(f"  {label} {latencies[min(len(latencies) - 1, int(len(latencies) * q))]:.1f} ms")
+        print(f"  mean {statistics.fmean(latencies):.1f} ms")
+    if errors:
+        print("  errors:", {error: errors.count(error) for error in set(errors)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8001/threads/?size=10")
+    parser.add_argument("--token", help="access token sent as a Bearer header")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds first")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Compare the ILIKE search path with the in-memory BM25 backend.
+
+Seeds a throwaway SQLite database with synthetic threads and comments,
+then times the same queries through ThreadRepository/CommentRepository
+with and without the memory backend installed.
+
+    python backend/scripts/benchmark_search.py --threads 20000 --comments 100000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-with-at-least-32-bytes")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.services.auth_service.app.models.user import User  # noqa: E402
+from backend.services.discussion_service.app.core import search_backend  # noqa: E402
+from backend.services.discussion_service.app.models.comment import Comment  # noqa: E402
+from backend.services.discussion_service.app.models.thread import Thread  # noqa: E402
+from backend.services.discussion_service.app.repositories.comment_repositories import CommentRepository  # noqa: E402
+from backend.services.discussion_service.app.repositories.thread_repositories import ThreadRepository  # noqa: E402
+from backend.shared.database.base import Base  # noqa: E402
+
+VOCABULARY = (
+    "python fastapi redis postgres websocket async cache queue index search "
+    "thread comment latency throughput kubernetes docker deploy schema query "
+    "react frontend backend monitoring tracing logging database migration "
+    "replica primary shard pool cursor pagination benchmark profile memory"
+).split()
+FILLER = [f"word{i}" for i in range(2000)]
+QUERIES = ["redis", "postgres replica", "websock*", '"async queue"', "python -docker", "word1234"]
+
+
+def _text(rng: random.Random, length: int) -> str:
+    words = rng.choices(VOCABULARY, k=length // 3) + rng.choices(FILLER, k=length - length // 3)
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def seed(db: Session, threads: int, comments: int, rng: random.Random) -> None:
+    user = User(username="bench", email="bench@example.com", hashed_password="x", full_name="Bench")
+    db.add(user)
+    db.flush()
+
+    thread_ids = [uuid.uuid4() for _ in range(threads)]
+    db.execute(
+        insert(Thread),
+        [
+            {"id": thread_id, "title": _text(rng, 6), "description": _text(rng, 60), "author_id": user.id}
+            for thread_id in thread_ids
+        ],
+    )
+
+    for start in range(0, comments, 10000):
+        db.execute(
+            insert(Comment),
+            [
+                {
+                    "content": _text(rng, 30),
+                    "thread_id": rng.choice(thread_ids),
+                    "author_id": user.id,
+                }
+                for _ in range(min(10000, comments - start))
+            ],
+        )
+    db.commit()
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(args: argparse.Namespace) -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    rng = random.Random(args.seed)
+
+    with Session(engine) as db:
+        started = time.perf_counter()
+        seed(db, args.threads, args.comments, rng)
+        print(f"Seeded {args.threads} threads / {args.comments} comments in {time.perf_counter() - started:.1f}s")
+
+        backend = search_backend.InMemorySearchBackend()
+        started = time.perf_counter()
+        backend.rebuild(db)
+        print(f"Built memory index in {time.perf_counter() - started:.1f}s\n")
+
+        thread_repo = ThreadRepository(db)
+        comment_repo = CommentRepository(db)
+
+        print(f"{'query':<20}{'kind':<10}{'ilike ms':>10}{'memory ms':>11}{'hits':>8}")
+        for query in QUERIES:
+            for kind, search, count in (
+                ("threads", thread_repo.search_threads, thread_repo.count_search_threads),
+                ("comments", comment_repo.search_comments, comment_repo.count_search_comments),
+            ):
+                def request():
+                    search(query, 0, args.size)
+                    return count(query)
+
+                search_backend.set_search_backend(None)
+                ilike_ms = _time(request, args.repeat)
+                search_backend.set_search_backend(backend)
+                memory_ms = _time(request, args.repeat)
+                hits = request()
+                search_backend.set_search_backend(None)
+                print(f"{query:<20}{kind:<10}{ilike_ms:>10.1f}{memory_ms:>11.1f}{hits:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=5000)
+    parser.add_argument("--comments", type=int, default=25000)
+    parser.add_argument("--size", type=int, default=20, help="page size per search request")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Run the discussion event outbox relay as its own process.
+
+Set OUTBOX_RELAY_ENABLED=false on the discussion service when this runs.
+Relays lock rows with SKIP LOCKED, so several can run side by side.
+
+    python backend/scripts/outbox_relay.py
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Allow running this script directly inside Docker/host shells.
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.services.discussion_service.app.core.outbox import start_outbox_relay  # noqa: E402
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | outbox_relay | %(levelname)s | %(message)s")
+    try:
+        asyncio.run(start_outbox_relay())
+    except KeyboardInterrupt:
+        pass
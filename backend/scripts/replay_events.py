@@ -0,0 +1,38 @@
+"""
+Replay a Redis event stream to a consumer group from a given entry ID.
+
+Moves the group's last-delivered ID back, so its consumers receive every
+entry after FROM_ID again. Handlers must tolerate duplicates.
+
+    python backend/scripts/replay_events.py 1718000000000-0
+    python backend/scripts/replay_events.py 0 --stream discussion_events --group notification_service
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import redis
+
+# Allow running this script directly inside Docker/host shells.
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.services.notification_service.app.core.redis_listener import NOTIFICATION_GROUP  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("from_id", help="entry ID to replay after (a millisecond timestamp works; 0 replays everything kept)")
+    parser.add_argument("--stream", default="discussion_events")
+    parser.add_argument("--group", default=NOTIFICATION_GROUP)
+    args = parser.parse_args()
+
+    client = redis.Redis(host=os.getenv("REDIS_HOST", "localhost"), port=int(os.getenv("REDIS_PORT", "6379")), decode_responses=True)
+    client.xgroup_setid(args.stream, args.group, args.from_id)
+    print(f"{args.group} on {args.stream} will redeliver entries after {args.from_id} ({client.xlen(args.stream)} kept)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,14 @@
+"""
+Seed the database.
+
+Without options this creates the small demo dataset (five users, a handful
+of threads). With --generate it loads a large synthetic dataset for load
+testing instead; see backend/scripts/synthetic_data.py.
+"""
 from __future__ import annotations
 
+import argparse
+import os
 from dataclasses import dataclass
 from typing import Iterable
 from pathlib import Path
@@ -14,13 +23,16 @@ from pwdlib import PasswordHash
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
+from backend.services.auth_service.app.core.config import settings
 from backend.shared.database.session import SessionLocal
 from backend.services.auth_service.app.core.seed import seed_roles
 from backend.services.auth_service.app.models.role import Role
 from backend.services.auth_service.app.models.user import User
+from backend.services.discussion_service.app.core.counters import reconcile_counters
 from backend.services.discussion_service.app.models.comment import Comment
 from backend.services.discussion_service.app.models.like import Like
 from backend.services.discussion_service.app.models.thread import Thread
+from backend.scripts.synthetic_data import GeneratorConfig, generate
 
 
 PASSWORD = "Password@123"
@@ -412,6 +424,9 @@ def seed() -> None:
                     if get_or_create_like(db, liker.id, comment_id=comment.id):
                         likes_created_count += 1
 
+        # Seeded rows bypass the services, so bring the denormalized counters in line.
+        reconcile_counters(db)
+
         print("Seed completed.")
         print(f"Users created: {user_created_count}")
         print(f"Role links added: {role_links_added}")
@@ -424,5 +439,52 @@ def seed() -> None:
         db.close()
 
 
+def generate_synthetic(args: argparse.Namespace) -> None:
+    config = GeneratorConfig(
+        users=args.users,
+        threads=args.threads,
+        comments=args.comments,
+        seed=args.seed,
+        workers=args.workers,
+        root_share=args.root_share,
+        reply_depth_decay=args.reply_depth_decay,
+        max_depth=args.max_depth,
+        likes_per_thread=args.likes_per_thread,
+        likes_per_comment=args.likes_per_comment,
+        activity_skew=args.activity_skew,
+    )
+    print(
+        f"Generating {config.users:,} users, {config.threads:,} threads, "
+        f"~{config.comments:,} comments with {config.workers} workers (seed {config.seed})"
+    )
+    # Hashing is deliberately slow; every synthetic user shares one hash.
+    totals = generate(args.database_url, config, password_hash.hash(PASSWORD))
+    for table, count in totals.items():
+        print(f"{table}: {count:,}")
+    print(f"Login as user<N> / {PASSWORD}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generate", action="store_true", help="load a synthetic dataset instead of the demo seed")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=5_000_000)
+    parser.add_argument("--comments", type=int, default=50_000_000, help="target total; per-thread counts are Pareto")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--root-share", type=float, default=0.35, help="share of comments that are top-level")
+    parser.add_argument("--reply-depth-decay", type=float, default=0.6, help="chance a reply goes one level deeper")
+    parser.add_argument("--max-depth", type=int, default=30)
+    parser.add_argument("--likes-per-thread", type=float, default=5.0)
+    parser.add_argument("--likes-per-comment", type=float, default=1.0)
+    parser.add_argument("--activity-skew", type=float, default=2.5, help="power-law exponent over users; 1 is uniform")
+    args = parser.parse_args()
+    if args.generate:
+        generate_synthetic(args)
+    else:
+        seed()
+
+
 if __name__ == "__main__":
-    seed()
+    main()
@@ -0,0 +1,325 @@
+"""
+Deterministic, high-volume synthetic data for load testing.
+
+Used by ``seed_demo_data.py --generate``. Users, threads, comments and likes
+are generated in fixed-size chunks, each from its own seeded RNG, so the same
+seed yields the same rows whatever the worker count. Workers stream every
+chunk into PostgreSQL with ``COPY`` (other databases fall back to batched
+INSERTs, which is only meant for small local runs).
+
+Shape of the data:
+
+* authorship and liking follow a power law over users (a few very active
+  accounts, a long tail of quiet ones);
+* comments per thread and likes per thread/comment are Pareto distributed;
+* a comment is top-level with probability ``root_share``, otherwise it
+  replies one level deeper than the previous step with probability
+  ``reply_depth_decay`` (a geometric depth distribution capped at
+  ``max_depth``).
+
+Denormalized counters and materialized comment paths are computed while
+generating, so no reconciliation pass is needed afterwards.
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import multiprocessing
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Sequence
+
+from sqlalchemy import Table, create_engine, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from backend.services.auth_service.app.core.seed import seed_roles
+from backend.services.auth_service.app.models.role import Role
+from backend.services.auth_service.app.models.user import User
+from backend.services.auth_service.app.models.user_role import UserRole
+from backend.services.discussion_service.app.core.schema import sync_schema
+from backend.services.discussion_service.app.models.comment import Comment, child_path
+from backend.services.discussion_service.app.models.like import Like
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.shared.database.base import Base
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+TIME_SPAN = timedelta(days=730)
+
+WORDS = (
+    "api cache latency index query replica shard queue event stream deploy "
+    "rollback metric trace alert schema migration cluster worker thread lock "
+    "timeout retry backoff throughput pool connection transaction commit "
+    "redis postgres kafka websocket frontend backend release feature flag "
+    "benchmark profile memory cpu disk network kernel container kubernetes"
+).split()
+
+USER_COLUMNS = (
+    "id", "username", "email", "hashed_password", "full_name",
+    "avatar_url", "bio", "is_active", "created_at", "updated_at",
+)
+USER_ROLE_COLUMNS = ("user_id", "role_id")
+THREAD_COLUMNS = (
+    "id", "title", "description", "image_url", "author_id", "created_at", "updated_at",
+    "is_deleted", "is_locked", "moderation_status", "like_count", "comment_count",
+)
+COMMENT_COLUMNS = (
+    "id", "content", "thread_id", "author_id", "parent_id", "created_at", "updated_at",
+    "is_deleted", "like_count", "path", "depth",
+)
+LIKE_COLUMNS = ("id", "user_id", "thread_id", "comment_id", "created_at")
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    users: int = 1_000_000
+    threads: int = 5_000_000
+    comments: int = 50_000_000
+    seed: int = 42
+    workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    # Comment tree shape.
+    root_share: float = 0.35
+    reply_depth_decay: float = 0.6
+    max_depth: int = 30
+    max_comments_per_thread: int = 20_000
+    # Engagement: Pareto shape for per-target counts, skew > 1 favours low user ids.
+    pareto_alpha: float = 1.3
+    activity_skew: float = 2.5
+    likes_per_thread: float = 5.0
+    likes_per_comment: float = 1.0
+    # Rows per unit of work; fixed so output does not depend on `workers`.
+    users_per_chunk: int = 20_000
+    threads_per_chunk: int = 1_000
+
+
+def stable_uuid(seed: int, *parts) -> uuid.UUID:
+    """A random-looking but reproducible UUID for the given seed and parts."""
+    key = ":".join(str(part) for part in (seed, *parts)).encode()
+    return uuid.UUID(bytes=hashlib.blake2b(key, digest_size=16).digest(), version=4)
+
+
+def user_id(config: GeneratorConfig, index: int) -> uuid.UUID:
+    return stable_uuid(config.seed, "user", index)
+
+
+def _rng(config: GeneratorConfig, kind: str, chunk: int) -> random.Random:
+    return random.Random(f"{config.seed}:{kind}:{chunk}")
+
+
+def _skewed_index(rng: random.Random, size: int, skew: float) -> int:
+    """Power-law pick from range(size): low indices are chosen far more often."""
+    return min(size - 1, int(size * rng.random() ** skew))
+
+
+def _pareto_count(rng: random.Random, mean: float, alpha: float, cap: int) -> int:
+    """Heavy-tailed non-negative count whose untruncated mean is `mean`."""
+    if mean <= 0:
+        return 0
+    scale = mean * (alpha - 1) / alpha
+    return min(cap, int(scale * rng.paretovariate(alpha)))
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+def _at(index: int, total: int) -> datetime:
+    return EPOCH + TIME_SPAN * (index / max(total, 1))
+
+
+def _chunks(total: int, size: int) -> range:
+    return range((total + size - 1) // size)
+
+
+def user_rows(config: GeneratorConfig, chunk: int, password_hash: str, member_role_id):
+    """Users and their member role links for one chunk."""
+    rng = _rng(config, "users", chunk)
+    users, links = [], []
+    start = chunk * config.users_per_chunk
+    for index in range(start, min(start + config.users_per_chunk, config.users)):
+        created_at = _at(index, config.users)
+        uid = user_id(config, index)
+        users.append((
+            uid, f"user{index}", f"user{index}@example.com", password_hash,
+            f"Load User {index}", None, _sentence(rng, 4, 12), True, created_at, created_at,
+        ))
+        links.append((uid, member_role_id))
+    return users, links
+
+
+def _likers(rng: random.Random, config: GeneratorConfig, count: int) -> set[int]:
+    count = min(count, config.users // 2)
+    likers: set[int] = set()
+    attempts = 0
+    while len(likers) < count and attempts < count * 4:
+        likers.add(_skewed_index(rng, config.users, config.activity_skew))
+        attempts += 1
+    return likers
+
+
+def thread_rows(config: GeneratorConfig, chunk: int):
+    """Threads with their comment trees and likes for one chunk, counters filled in."""
+    rng = _rng(config, "threads", chunk)
+    comments_per_thread = config.comments / max(config.threads, 1)
+    threads, comments, likes = [], [], []
+    start = chunk * config.threads_per_chunk
+
+    for index in range(start, min(start + config.threads_per_chunk, config.threads)):
+        thread_id = stable_uuid(config.seed, "thread", index)
+        created_at = _at(index, config.threads)
+        clock = created_at
+        # Per level: (id, path, like-counter slot) of the comments at that depth.
+        levels: list[list[tuple]] = []
+        thread_comments = []
+
+        for number in range(_pareto_count(rng, comments_per_thread, config.pareto_alpha, config.max_comments_per_thread)):
+            clock += timedelta(seconds=rng.expovariate(1 / 600))
+            comment_id = stable_uuid(config.seed, "comment", index, number)
+            parent = None
+            depth = 0
+            if levels and rng.random() >= config.root_share:
+                depth = 1
+                while depth < min(config.max_depth, len(levels)) and rng.random() < config.reply_depth_decay:
+                    depth += 1
+                parent = rng.choice(levels[depth - 1])
+            path = child_path(parent[1] if parent else None, comment_id)
+            row = [
+                comment_id, _sentence(rng, 8, 40), thread_id,
+                user_id(config, _skewed_index(rng, config.users, config.activity_skew)),
+                parent[0] if parent else None, clock, clock, False, 0, path, depth,
+            ]
+            if depth == len(levels):
+                levels.append([])
+            levels[depth].append((comment_id, path))
+            thread_comments.append(row)
+
+        for number, row in enumerate(thread_comments):
+            likers = _likers(rng, config, _pareto_count(rng, config.likes_per_comment, config.pareto_alpha, config.users))
+            row[8] = len(likers)
+            for liker in sorted(likers):
+                likes.append((
+                    stable_uuid(config.seed, "comment-like", index, number, liker),
+                    user_id(config, liker), None, row[0], row[5],
+                ))
+        comments.extend(tuple(row) for row in thread_comments)
+
+        thread_likers = _likers(rng, config, _pareto_count(rng, config.likes_per_thread, config.pareto_alpha, config.users))
+        for liker in sorted(thread_likers):
+            likes.append((
+                stable_uuid(config.seed, "thread-like", index, liker),
+                user_id(config, liker), thread_id, None, created_at,
+            ))
+
+        threads.append((
+            thread_id, _sentence(rng, 4, 10).capitalize(), _sentence(rng, 20, 80), None,
+            user_id(config, _skewed_index(rng, config.users, config.activity_skew)),
+            created_at, created_at, False, False, "approved", len(thread_likers), len(thread_comments),
+        ))
+
+    return threads, comments, likes
+
+
+def copy_rows(connection: Connection, table: Table, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+    """Stream rows with COPY on PostgreSQL; batched INSERTs elsewhere."""
+    rows = list(rows)
+    if not rows:
+        return 0
+    if connection.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        # CSV leaves None unquoted and empty, which COPY reads as NULL.
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+    else:
+        connection.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+    return len(rows)
+
+
+_worker_engine: Engine | None = None
+
+
+def _init_worker(database_url: str) -> None:
+    global _worker_engine
+    _worker_engine = create_engine(database_url, poolclass=NullPool)
+
+
+def _load_chunk(task: tuple) -> dict[str, int]:
+    kind, chunk, config, password_hash, member_role_id = task
+    with _worker_engine.begin() as connection:
+        if kind == "users":
+            users, links = user_rows(config, chunk, password_hash, member_role_id)
+            return {
+                "users": copy_rows(connection, User.__table__, USER_COLUMNS, users),
+                "user_roles": copy_rows(connection, UserRole.__table__, USER_ROLE_COLUMNS, links),
+            }
+        threads, comments, likes = thread_rows(config, chunk)
+        return {
+            "threads": copy_rows(connection, Thread.__table__, THREAD_COLUMNS, threads),
+            "comments": copy_rows(connection, Comment.__table__, COMMENT_COLUMNS, comments),
+            "likes": copy_rows(connection, Like.__table__, LIKE_COLUMNS, likes),
+        }
+
+
+def _run(tasks: list[tuple], database_url: str, workers: int, totals: dict[str, int], label: str) -> None:
+    started = time.perf_counter()
+    if workers <= 1:
+        _init_worker(database_url)
+        results = map(_load_chunk, tasks)
+    else:
+        pool = multiprocessing.get_context("spawn").Pool(workers, _init_worker, (database_url,))
+        results = pool.imap_unordered(_load_chunk, tasks)
+    try:
+        for done, counts in enumerate(results, start=1):
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+            if done % max(1, len(tasks) // 20) == 0 or done == len(tasks):
+                elapsed = time.perf_counter() - started
+                print(f"  {label}: {done}/{len(tasks)} chunks, {elapsed:.0f}s", flush=True)
+    finally:
+        if workers > 1:
+            pool.close()
+            pool.join()
+
+
+def generate(database_url: str, config: GeneratorConfig, password_hash: str) -> dict[str, int]:
+    """
+    Load a synthetic dataset into an empty database and return row counts.
+
+    Users load first so every later chunk can reference any user id.
+    """
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            sync_schema(connection)
+    with Session(engine) as db:
+        seed_roles(db)
+        member_role_id = db.scalar(select(Role.id).where(Role.name == "member"))
+    engine.dispose()
+
+    workers = config.workers if engine.dialect.name == "postgresql" else 1
+    totals: dict[str, int] = {}
+    user_tasks = [
+        ("users", chunk, config, password_hash, member_role_id)
+        for chunk in _chunks(config.users, config.users_per_chunk)
+    ]
+    thread_tasks = [
+        ("threads", chunk, config, password_hash, member_role_id)
+        for chunk in _chunks(config.threads, config.threads_per_chunk)
+    ]
+    _run(user_tasks, database_url, workers, totals, "users")
+    _run(thread_tasks, database_url, workers, totals, "threads")
+    return totals
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from backend.services.auth_service.app.core.security import require_roles
+from backend.shared.database.pool import pool_status
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/db-pool")
+def db_pool_stats(_current_user=Depends(require_roles(["admin"]))):
+    return pool_status()
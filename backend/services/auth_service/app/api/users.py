@@ -18,17 +18,20 @@ from backend.services.auth_service.app.schemas.user import (
     UserStatusUpdate,
     UserUpdate,
 )
-from backend.services.auth_service.app.core.security import get_current_user
+from backend.services.auth_service.app.core.security import get_current_user, get_current_user_async
 from backend.services.auth_service.app.core.security import require_roles
 from backend.services.auth_service.app.repositories.user_repository import UserRepository
 from backend.services.auth_service.app.services.user_service import UserService
+from backend.shared.database.counts import count_total, invalidate_counts
+from backend.shared.database.profiler import query_budget
 
 router = APIRouter(prefix="/users", tags=["Users"])
 AVATAR_UPLOAD_DIR = Path(__file__).resolve().parents[1] / "uploads" / "avatars"
 AVATAR_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 @router.get("/me", response_model=UserRead)
-def get_me(current_user = Depends(get_current_user)):
+@query_budget(3)
+async def get_me(current_user = Depends(get_current_user_async)):
     """
     Retrieve the currently authenticated user.
     """
@@ -48,7 +51,6 @@ def update_me(
         setattr(current_user, field, value)
 
     db.commit()
-    db.refresh(current_user)
     return current_user
 
 
@@ -84,6 +86,7 @@ def deactivate_my_account(
 
 
 @router.get("/mentions/suggest", response_model=MentionSuggestResponse)
+@query_budget(3)
 def suggest_mentions(
     q: str = Query(..., min_length=1, max_length=50),
     limit: int = Query(8, ge=1, le=20),
@@ -98,6 +101,7 @@ def suggest_mentions(
 
 
 @router.get("/search", response_model=UserSearchResponse)
+@query_budget(4)
 def search_users(
     q: str = Query(..., min_length=1, max_length=100),
     page: int = Query(1, ge=1),
@@ -168,7 +172,6 @@ def upload_me_avatar(
     base_url = str(request.base_url).rstrip("/")
     current_user.avatar_url = f"{base_url}/uploads/avatars/{filename}"
     db.commit()
-    db.refresh(current_user)
     return current_user
 
 
@@ -185,9 +188,16 @@ def list_users_admin(
     user_repo = UserRepository(db)
     skip = (page - 1) * size
     items = user_repo.list_users(skip=skip, limit=size, q=q, role=role)
-    total = user_repo.count_users(q=q, role=role)
+    counted = count_total(
+        "users.admin_list",
+        lambda: user_repo.count_users(q=q, role=role),
+        namespace="users",
+        params={"q": (q or "").strip().lower(), "role": (role or "").strip().lower()},
+        estimate=None if q or role else lambda: user_repo.estimate_users(),
+    )
     return {
-        "total": total,
+        "total": counted.total,
+        "total_is_estimate": counted.is_estimate,
         "page": page,
         "size": size,
         "items": items,
@@ -210,7 +220,6 @@ def update_user_status(
 
     user.is_active = status_data.is_active
     db.commit()
-    db.refresh(user)
 
     state = "activated" if user.is_active else "deactivated"
     return {
@@ -250,6 +259,7 @@ def promote_user(
 
     user.roles.append(role)
     db.commit()
+    invalidate_counts("users")
 
     return {"message": f"User promoted to {role_name}"}
 
@@ -284,5 +294,6 @@ def demote_user(
 
     user.roles.remove(role)
     db.commit()
+    invalidate_counts("users")
 
     return {"message": f"User demoted from {role_name}"}
@@ -6,6 +6,27 @@ class Settings(BaseSettings):
     service_name: str = "auth_service"
     debug: bool = True
     database_url: str
+    # Async routes (backend.shared.database.async_session); derived from
+    # database_url with the asyncpg/aiosqlite driver when unset.
+    async_database_url: str | None = None
+    # Read replicas for GET requests (backend.shared.database.routing), as a
+    # JSON list. Users are pinned to the primary for REPLICA_PIN_SECONDS
+    # after they write so they read their own changes.
+    database_replica_urls: list[str] = []
+    replica_pin_seconds: int = 5
+    # Connection pool per process (backend.shared.database.pool). Set these per
+    # service; DB_POOL_PROFILE=pgbouncer targets PgBouncer in transaction mode.
+    db_pool_profile: str = "default"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Per-request SQL profiling (backend.shared.database.profiler): a
+    # Server-Timing header, plus warnings for routes over their query
+    # budget and statements repeated this many times in one request.
+    sql_profiler_enabled: bool = True
+    sql_repeat_threshold: int = 5
     secret_key: str
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
@@ -13,6 +34,11 @@ class Settings(BaseSettings):
     password_reset_otp_expire_minutes: int = 10
     password_reset_otp_length: int = 6
     password_reset_otp_max_attempts: int = 5
+    # Totals for paginated endpoints (see backend.shared.database.counts).
+    # COUNT_MODES maps an endpoint name to exact/cached/estimate, as JSON.
+    count_modes: dict[str, str] = {}
+    count_cache_ttl_seconds: int = 60
+    count_estimate_exact_below: int = 10000
     smtp_host: str = Field(
         default="",
         validation_alias=AliasChoices("DOCKER_SMTP_HOST", "SMTP_HOST"),
@@ -2,12 +2,16 @@ import jwt
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
+from uuid import UUID
 
 from backend.services.auth_service.app.core.config import settings
+from backend.shared.database.async_session import get_async_db
+from backend.shared.database.routing import bind_user, bind_user_async
 from backend.shared.database.session import get_db
-from backend.services.auth_service.app.repositories.user_repository import UserRepository
+from backend.services.auth_service.app.repositories.user_repository import AsyncUserRepository, UserRepository
 
 ALGORITHM = "HS256"
 
@@ -51,10 +55,8 @@ def create_password_reset_token(data: dict, expires_delta: timedelta) -> str:
 def decode_token(token: str) -> dict:
     return jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
 
-def get_current_user(
-        credentials: HTTPAuthorizationCredentials = Depends(security),
-        db: Session = Depends(get_db)
-):
+def _access_token_subject(credentials: HTTPAuthorizationCredentials) -> UUID:
+    """Validate a bearer access token and return its user id."""
     token = credentials.credentials
     try:
         payload = jwt.decode(
@@ -71,22 +73,23 @@ def get_current_user(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token",
             )
-        
+        # Bind a UUID, not the raw claim: drivers without a native uuid type reject strings.
+        user_id = UUID(user_id)
+
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token expired",
         )
     
-    except jwt.InvalidTokenError:
+    except (jwt.InvalidTokenError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id)
+    return user_id
 
+def _require_active_user(user):
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -101,6 +104,25 @@ def get_current_user(
 
     return user
 
+def get_current_user(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        db: Session = Depends(get_db)
+):
+    user_id = _access_token_subject(credentials)
+    bind_user(db, user_id)
+    user_repo = UserRepository(db)
+    return _require_active_user(user_repo.get_by_id(user_id))
+
+async def get_current_user_async(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        db: AsyncSession = Depends(get_async_db)
+):
+    """get_current_user for async routes; loads roles eagerly."""
+    user_id = _access_token_subject(credentials)
+    await bind_user_async(db, user_id)
+    user_repo = AsyncUserRepository(db)
+    return _require_active_user(await user_repo.get_by_id(user_id))
+
 def create_new_access_token_from_refresh(refresh_token: str):
     try:
         payload = jwt.decode(
@@ -7,17 +7,24 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from backend.services.auth_service.app.api.diagnostics import router as diagnostics_router
 from backend.services.auth_service.app.api.health import router as health_router
 from backend.services.auth_service.app.core.config import settings
 from backend.shared.logging.logger import setup_logging
+from backend.shared.database.async_session import dispose_async_engine
 from backend.shared.database.engine import engine
 from backend.services.auth_service.app.api.auth import router as auth_router
 from backend.shared.database.base import Base
 from backend.services.auth_service.app.api.users import router as users_router
 from backend.shared.database.session import SessionLocal
+from backend.shared.database.profiler import SQLProfilerMiddleware
+from backend.shared.metrics.http import MetricsMiddleware, router as metrics_router
+from backend.shared.tracing.http import TracingMiddleware
+from backend.shared.tracing.tracer import setup_tracing
 from backend.services.auth_service.app.core.seed import seed_roles
 
 setup_logging(settings.service_name, debug=settings.debug)
+setup_tracing(settings.service_name)
 
 
 logger = logging.getLogger(__name__)
@@ -51,6 +58,7 @@ async def lifespan(_app: FastAPI):
     yield
 
     logger.info("Auth service shutting down...")
+    await dispose_async_engine()
 
 app = FastAPI(
     title="Auth Service",
@@ -63,6 +71,9 @@ uploads_dir = Path(__file__).resolve().parent / "uploads"
 uploads_dir.mkdir(parents=True, exist_ok=True)
 app.mount("/uploads", StaticFiles(directory=str(uploads_dir)), name="uploads")
 
+app.add_middleware(SQLProfilerMiddleware)
+app.add_middleware(MetricsMiddleware, service="auth")
+app.add_middleware(TracingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=get_cors_origins(),
@@ -71,6 +82,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(metrics_router)
 app.include_router(health_router)
 app.include_router(auth_router)
 app.include_router(users_router)
+app.include_router(diagnostics_router)
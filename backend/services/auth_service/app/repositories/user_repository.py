@@ -1,8 +1,10 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import select, func, or_
 
 from backend.services.auth_service.app.models.user import User
 from backend.services.auth_service.app.models.role import Role
+from backend.shared.database.counts import estimate_row_count
 
 
 class UserRepository:
@@ -15,8 +17,7 @@ class UserRepository:
 
     def create(self, user: User) -> User:
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
 
     def get_by_id(self, user_id) -> User | None:
@@ -87,6 +88,10 @@ class UserRepository:
 
         return self.db.scalar(query)
 
+    def estimate_users(self) -> int | None:
+        """Planner estimate of all users (PostgreSQL only)."""
+        return estimate_row_count(self.db, select(User.id))
+
     def search_public_users(self, *, skip: int, limit: int, q: str | None = None) -> list[User]:
         query = select(User).where(User.is_active.is_(True))
 
@@ -117,3 +122,17 @@ class UserRepository:
             )
 
         return self.db.scalar(query)
+
+
+class AsyncUserRepository:
+    """
+    Async user lookups for routes on the async session.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, user_id) -> User | None:
+        # Role checks read user.roles, which cannot lazy-load on an AsyncSession.
+        query = select(User).options(selectinload(User.roles)).where(User.id == user_id)
+        return await self.db.scalar(query)
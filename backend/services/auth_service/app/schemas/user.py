@@ -62,6 +62,7 @@ class UserListResponse(BaseModel):
     page: int
     size: int
     items: List[UserRead]
+    total_is_estimate: bool = False
 
 
 class ForgotPasswordRequest(BaseModel):
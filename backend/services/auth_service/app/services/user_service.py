@@ -17,6 +17,9 @@ from backend.services.auth_service.app.models.user import User
 from backend.services.auth_service.app.repositories.user_repository import UserRepository
 from backend.services.auth_service.app.schemas.user import UserCreate
 from backend.services.auth_service.app.services.email_service import send_password_reset_otp_email
+from backend.shared.database.counts import invalidate_counts
+from backend.shared.database.routing import pin_primary
+from backend.shared.database.unit_of_work import unit_of_work
 
 
 password_hash = PasswordHash.recommended()
@@ -70,7 +73,12 @@ class UserService:
 
         new_user.roles.append(member_role)
 
-        return self.user_repo.create(new_user)
+        with unit_of_work(self.db):
+            created = self.user_repo.create(new_user)
+        invalidate_counts("users")
+        # Registration has no token to bind the session to, so pin explicitly.
+        pin_primary(created.id)
+        return created
 
     def authenticate_user(self, email: str, password: str):
         """Authenticate an active user by email/username and password."""
@@ -176,7 +184,6 @@ class UserService:
         otp_record.used_at = now
         user.hashed_password = self._hash_password(new_password)
         self.db.commit()
-        self.db.refresh(user)
 
     def change_password(self, user, current_password: str, new_password: str) -> None:
         """Change a user's password after validating the current password."""
@@ -188,5 +195,4 @@ class UserService:
 
         user.hashed_password = self._hash_password(new_password)
         self.db.commit()
-        self.db.refresh(user)
 
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
@@ -155,7 +156,7 @@ def test_auth_reset_password_errors(monkeypatch):
 
 def test_users_me_and_promote_paths(monkeypatch):
     current_user = SimpleNamespace(id=uuid4(), roles=[SimpleNamespace(name="admin")])
-    assert users_api.get_me(current_user=current_user) is current_user
+    assert asyncio.run(users_api.get_me(current_user=current_user)) is current_user
 
     role_obj = SimpleNamespace(name="moderator")
 
@@ -221,7 +222,7 @@ def test_users_update_me_partial_fields():
     assert user.avatar_url == "http://old.avatar"
     assert user.bio == "old bio"
     assert db.committed == 1
-    assert db.refreshed == 1
+    assert db.refreshed == 0
 
 
 def test_users_update_me_empty_payload_keeps_values():
@@ -254,7 +255,7 @@ def test_users_update_me_empty_payload_keeps_values():
     assert user.avatar_url is None
     assert user.bio == "current bio"
     assert db.committed == 1
-    assert db.refreshed == 1
+    assert db.refreshed == 0
 
 
 def test_users_update_me_allows_nullable_fields():
@@ -477,7 +478,7 @@ def test_users_update_status_endpoint(monkeypatch):
     )
     assert out["is_active"] is False
     assert db.committed == 1
-    assert db.refreshed == 1
+    assert db.refreshed == 0
 
 
 def test_users_update_status_not_found(monkeypatch):
@@ -522,18 +523,15 @@ def test_user_repository_list_and_count_users():
 
 
 def test_user_repository_methods():
-    calls = {"add": 0, "commit": 0, "refresh": 0, "scalar": 0}
+    calls = {"add": 0, "flush": 0, "scalar": 0}
     sentinel = object()
 
     class FakeDB:
         def add(self, _user):
             calls["add"] += 1
 
-        def commit(self):
-            calls["commit"] += 1
-
-        def refresh(self, _user):
-            calls["refresh"] += 1
+        def flush(self):
+            calls["flush"] += 1
 
         def scalar(self, _query):
             calls["scalar"] += 1
@@ -553,7 +551,7 @@ def test_user_repository_methods():
     assert repo.get_by_id(uuid4()) is sentinel
     assert repo.get_by_email("a@a.com") is sentinel
     assert repo.get_by_username("a") is sentinel
-    assert calls == {"add": 1, "commit": 1, "refresh": 1, "scalar": 3}
+    assert calls == {"add": 1, "flush": 1, "scalar": 3}
 
 
 def test_user_service_create_auth_and_login(monkeypatch):
@@ -693,7 +691,7 @@ def test_user_service_password_reset_paths(monkeypatch):
     assert otp_record.used_at is not None
     assert user.hashed_password == "new-hash"
     assert service.db.commits == 1
-    assert service.db.refreshed == 1
+    assert service.db.refreshed == 0
 
     service.user_repo = SimpleNamespace(get_by_email=lambda _e: None)
     assert service.request_password_reset("missing@example.com") is None
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+
+from backend.services.auth_service.app.core.config import settings  # noqa: E402
+from backend.shared.database import pool  # noqa: E402
+
+
+def test_pool_options_follow_profile(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 7)
+    options = pool.pool_options("postgresql+psycopg2://forum@db/forumdb")
+    assert options["poolclass"] is pool.InstrumentedQueuePool
+    assert options["pool_size"] == 7 and options["pool_pre_ping"] is True
+    assert pool.pool_options("postgresql+asyncpg://forum@db/forumdb", is_async=True)["poolclass"] is (
+        pool.InstrumentedAsyncQueuePool
+    )
+    assert pool.pool_options("sqlite+pysqlite:///:memory:") == {}
+
+    monkeypatch.setattr(settings, "db_pool_profile", "pgbouncer")
+    assert pool.pool_options("postgresql+psycopg2://forum@db/forumdb") == {"poolclass": pool.InstrumentedNullPool}
+    connect_args = pool.pool_options("postgresql+asyncpg://forum@db/forumdb", is_async=True)["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+
+    monkeypatch.setattr(settings, "db_pool_profile", "bogus")
+    with pytest.raises(ValueError):
+        pool.pool_options("postgresql+psycopg2://forum@db/forumdb")
+
+
+def test_instrumented_pool_reports_occupancy_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'pool.db'}",
+        poolclass=pool.InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics = pool.instrument_engine(engine, "test")
+    try:
+        held = engine.connect()
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+        status = pool.pool_status()["test"]
+        assert status["pool_class"] == "InstrumentedQueuePool"
+        assert status["in_use"] == 1 and status["checked_out"] == 1
+        assert status["timeouts"] == 1
+        assert status["checkout_ms"]["samples"] == 2
+        assert status["checkout_ms"]["max"] >= 50
+
+        held.close()
+        engine.dispose()
+        with engine.connect():
+            pass
+        snapshot = metrics.snapshot()
+        assert snapshot["in_use"] == 0 and snapshot["peak_in_use"] == 1
+        assert snapshot["checkouts"] == 2 and snapshot["connects"] == 2
+    finally:
+        pool.forget_engine("test")
+        engine.dispose()
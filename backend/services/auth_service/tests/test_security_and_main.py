@@ -81,6 +81,29 @@ def test_get_current_user_expired_and_invalid_token(monkeypatch):
         security.get_current_user(credentials=SimpleNamespace(credentials="x"), db=object())
     assert e2.value.detail == "Invalid token"
 
+    monkeypatch.setattr(security.jwt, "decode", lambda *_args, **_kwargs: {"sub": "u1", "type": "access"})
+    with pytest.raises(HTTPException) as e3:
+        security.get_current_user(credentials=SimpleNamespace(credentials="x"), db=object())
+    assert e3.value.detail == "Invalid token"
+
+
+def test_get_current_user_looks_up_a_uuid(monkeypatch):
+    uid = uuid4()
+    seen = []
+    monkeypatch.setattr(security.jwt, "decode", lambda *_args, **_kwargs: {"sub": str(uid), "type": "access"})
+
+    class Repo:
+        def __init__(self, _db):
+            pass
+
+        def get_by_id(self, user_id):
+            seen.append(user_id)
+            return SimpleNamespace(id=user_id, roles=[])
+
+    monkeypatch.setattr(security, "UserRepository", Repo)
+    security.get_current_user(credentials=SimpleNamespace(credentials="x"), db=object())
+    assert seen == [uid]
+
 
 def test_require_roles_allows_and_denies():
     dep = security.require_roles(["admin"])
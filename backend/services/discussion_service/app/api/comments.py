@@ -1,14 +1,17 @@
+from typing import Literal
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from backend.shared.database.session import get_db
+from backend.shared.database.profiler import query_budget
 from backend.services.auth_service.app.core.security import get_current_user
 from backend.services.discussion_service.app.services.comment_service import CommentService
 from backend.services.discussion_service.app.schemas.comment import (
     CommentCreate,
     CommentRead,
     CommentSearchResponse,
+    CommentTreePage,
     CommentUpdate,
 )
 
@@ -33,6 +36,7 @@ def create_comment(
 
 
 @router.get("/thread/{thread_id}", response_model=list[CommentRead])
+@query_budget(4)
 def get_thread_comments(
     thread_id: UUID,
     db: Session = Depends(get_db),
@@ -42,16 +46,63 @@ def get_thread_comments(
     return service.get_thread_comments(thread_id, current_user)
 
 
+@router.get("/thread/{thread_id}/tree", response_model=CommentTreePage)
+@query_budget(10)
+def get_thread_comment_page(
+    thread_id: UUID,
+    cursor: str | None = None,
+    size: int | None = Query(None, ge=1, le=100),
+    depth: int | None = Query(None, ge=0, le=5),
+    breadth: int | None = Query(None, ge=1, le=20),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    service = CommentService(db)
+    return service.get_thread_comment_page(
+        thread_id,
+        current_user,
+        cursor=cursor,
+        size=size,
+        depth=depth,
+        breadth=breadth,
+    )
+
+
+@router.get("/{comment_id}/replies", response_model=CommentTreePage)
+@query_budget(10)
+def get_comment_replies(
+    comment_id: UUID,
+    cursor: str | None = None,
+    size: int | None = Query(None, ge=1, le=100),
+    depth: int | None = Query(None, ge=0, le=5),
+    breadth: int | None = Query(None, ge=1, le=20),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    service = CommentService(db)
+    return service.get_comment_replies(
+        comment_id,
+        current_user,
+        cursor=cursor,
+        size=size,
+        depth=depth,
+        breadth=breadth,
+    )
+
+
 @router.get("/search", response_model=CommentSearchResponse)
+@query_budget(6)
 def search_comments(
     q: str = Query(..., min_length=1),
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=50),
+    cursor: str | None = None,
+    sort: Literal["relevance", "recent"] = "relevance",
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     service = CommentService(db)
-    return service.search_comments(q, page, size, current_user)
+    return service.search_comments(q, page, size, current_user, cursor=cursor, sort=sort)
 
 
 @router.patch("/{comment_id}", response_model=CommentRead)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+
+from backend.services.auth_service.app.core.security import require_roles
+from backend.services.discussion_service.app.core.config import settings
+from backend.services.discussion_service.app.core.thread_cache import thread_cache
+from backend.shared.database.pool import pool_status
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/cache")
+def cache_stats(_current_user=Depends(require_roles(["admin"]))):
+    return {
+        "thread_detail": {
+            "enabled": settings.thread_cache_enabled,
+            "ttl_seconds": settings.thread_cache_ttl_seconds,
+            **thread_cache.stats.snapshot(),
+        },
+    }
+
+
+@router.get("/db-pool")
+def db_pool_stats(_current_user=Depends(require_roles(["admin"]))):
+    return pool_status()
@@ -1,3 +1,4 @@
+from typing import Literal
 from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
@@ -28,28 +29,29 @@ def moderation_threads(
     q: str | None = Query(None),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    sort: Literal["relevance", "recent"] = "relevance",
     db: Session = Depends(get_db),
     current_user=Depends(require_roles(["admin", "moderator"])),
 ):
     service = ThreadService(db)
     status_value = status.strip().lower() if isinstance(status, str) and status.strip() else None
     if q and q.strip():
-        if status_value is None:
-            return service.search_threads(q, page, size, current_user)
         return service.search_threads(
             q,
             page,
             size,
             current_user,
             moderation_status=status_value,
+            cursor=cursor,
+            sort=sort,
         )
-    if status_value is None:
-        return service.list_threads(page, size, current_user)
     return service.list_threads(
         page,
         size,
         current_user,
         moderation_status=status_value,
+        cursor=cursor,
     )
 
 
@@ -58,13 +60,15 @@ def moderation_comments(
     q: str | None = Query(None),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    sort: Literal["relevance", "recent"] = "relevance",
     db: Session = Depends(get_db),
     current_user=Depends(require_roles(["admin", "moderator"])),
 ):
     service = CommentService(db)
     if q and q.strip():
-        return service.search_comments(q, page, size, current_user)
-    return service.list_comments(page, size, current_user)
+        return service.search_comments(q, page, size, current_user, cursor=cursor, sort=sort)
+    return service.list_comments(page, size, current_user, cursor=cursor)
 
 
 @router.get("/reports", response_model=ThreadReportListResponse)
@@ -73,11 +77,12 @@ def moderation_reports(
     q: str | None = Query(None),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user=Depends(require_roles(["admin", "moderator"])),
 ):
     service = ReportService(db)
-    return service.list_reports(status_filter=status, q=q, page=page, size=size)
+    return service.list_reports(status_filter=status, q=q, page=page, size=size, cursor=cursor)
 
 
 @router.patch("/reports/{report_id}/status")
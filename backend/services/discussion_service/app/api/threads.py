@@ -1,10 +1,14 @@
 from pathlib import Path
+from typing import Literal
 from uuid import UUID, uuid4
 from fastapi import APIRouter, Depends, Query, UploadFile, File, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from backend.shared.database.async_session import get_async_db
 from backend.shared.database.session import get_db
-from backend.services.discussion_service.app.services.thread_service import ThreadService
+from backend.shared.database.profiler import query_budget
+from backend.services.discussion_service.app.services.thread_service import AsyncThreadService, ThreadService
 from backend.services.discussion_service.app.services.activity_service import ActivityService
 from backend.services.discussion_service.app.services.report_service import ReportService
 from backend.services.discussion_service.app.schemas.thread import (
@@ -15,7 +19,7 @@ from backend.services.discussion_service.app.schemas.thread import (
 )
 from backend.services.discussion_service.app.schemas.activity import UserActivityListResponse
 from backend.services.discussion_service.app.schemas.report import ThreadReportCreate
-from backend.services.auth_service.app.core.security import get_current_user
+from backend.services.auth_service.app.core.security import get_current_user, get_current_user_async
 
 
 router = APIRouter(prefix="/threads", tags=["Threads"])
@@ -65,37 +69,44 @@ def upload_thread_image(
     return {"image_url": image_url}
  
 @router.get("/", response_model=ThreadListResponse)
-def list_threads(
+@query_budget(6)
+async def list_threads(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async),
 ):
-    service = ThreadService(db)
-    return service.list_threads(page, size, current_user)
+    service = AsyncThreadService(db)
+    return await service.list_threads(page, size, current_user, cursor=cursor)
 
 
 @router.get("/search", response_model=ThreadListResponse)
+@query_budget(6)
 def search_threads(
     q: str = Query(..., min_length=1),
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=50),
+    cursor: str | None = None,
+    sort: Literal["relevance", "recent"] = "relevance",
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     service = ThreadService(db)
-    return service.search_threads(q, page, size, current_user)
+    return service.search_threads(q, page, size, current_user, cursor=cursor, sort=sort)
 
 
 @router.get("/me", response_model=ThreadListResponse)
+@query_budget(6)
 def my_threads(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=50),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     service = ThreadService(db)
-    return service.list_my_threads(page, size, current_user)
+    return service.list_my_threads(page, size, current_user, cursor=cursor)
 
 
 @router.get("/me/activity", response_model=UserActivityListResponse)
@@ -117,13 +128,14 @@ def my_activity(
     )
 
 @router.get("/{thread_id}", response_model=ThreadRead)
+@query_budget(5)
 def get_thread(
     thread_id: UUID,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     service = ThreadService(db)
-    return service.get_thread(thread_id, current_user)
+    return service.get_thread_detail(thread_id, current_user)
 
 @router.patch("/{thread_id}", response_model=ThreadRead)
 def update_thread(
@@ -0,0 +1,68 @@
+from typing import Iterable, Iterator
+
+from sqlalchemy import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+
+
+def set_replies(comment, replies: list) -> None:
+    """
+    Attach a replies list without touching the ORM relationship history.
+
+    Assigning `comment.replies` on a mapped Comment loads the old collection
+    and de-parents its members, which costs a query per comment and would
+    delete-orphan the children on the next flush. Fakes get a plain setattr.
+    """
+    if inspect(comment, raiseerr=False) is not None:
+        set_committed_value(comment, "replies", replies)
+    else:
+        comment.replies = replies
+
+
+def iter_tree(roots: Iterable) -> Iterator:
+    """Yield every node of a comment forest depth-first, without recursion."""
+    stack = list(reversed(list(roots)))
+    while stack:
+        comment = stack.pop()
+        yield comment
+        stack.extend(reversed(getattr(comment, "replies", None) or []))
+
+
+def build_comment_tree(comments: list, max_depth: int | None = None) -> list:
+    """
+    Nest a flat, oldest-first list of a thread's comments under their parents.
+
+    Comments whose parent is missing from the list are kept as roots. A
+    comment `max_depth` levels below its root takes all of its descendants as
+    a flat, oldest-first reply list, so very long reply chains cannot
+    overflow the serializer; each reply's parent_id still names its real
+    parent.
+    """
+    children: dict = {comment.id: [] for comment in comments}
+    roots = []
+    for comment in comments:
+        siblings = children.get(comment.parent_id) if comment.parent_id else None
+        if siblings is None:
+            roots.append(comment)
+        else:
+            siblings.append(comment)
+
+    position = {comment.id: index for index, comment in enumerate(comments)}
+    queue = [(root, 0) for root in roots]
+    while queue:
+        comment, depth = queue.pop()
+        replies = children[comment.id]
+        if max_depth is None or depth < max_depth:
+            set_replies(comment, replies)
+            queue.extend((reply, depth + 1) for reply in replies)
+            continue
+
+        descendants = []
+        pending = list(replies)
+        while pending:
+            reply = pending.pop()
+            descendants.append(reply)
+            pending.extend(children[reply.id])
+            set_replies(reply, [])
+        descendants.sort(key=lambda reply: position[reply.id])
+        set_replies(comment, descendants)
+    return roots
@@ -0,0 +1,48 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    counter_reconcile_enabled: bool = True
+    counter_reconcile_interval_seconds: int = 300
+    counter_reconcile_batch_size: int = 500
+    # "database" (PostgreSQL full-text, ILIKE elsewhere) or "memory".
+    # The memory index lives in one process and only learns about writes
+    # that process commits, so it is for single-worker, single-replica
+    # deployments; it is refused when WEB_CONCURRENCY (the uvicorn worker
+    # count) is above 1. Run several replicas with "database".
+    search_backend: str = "database"
+    web_concurrency: int = 1
+    search_index_compact_ratio: float = 0.25
+    thread_cache_enabled: bool = True
+    thread_cache_ttl_seconds: int = 300
+    # Rebuild lock lifetime, and how long other readers wait on a rebuild.
+    thread_cache_lock_ms: int = 3000
+    thread_cache_wait_ms: int = 200
+    # Deeper replies are flattened onto their ancestor at this depth.
+    comment_tree_max_depth: int = 64
+    # Paginated trees: top-level page size and how much of each reply
+    # subtree is inlined before clients must load more.
+    comment_page_size: int = 20
+    comment_reply_depth: int = 2
+    comment_reply_breadth: int = 3
+    # Background event publisher (core.events): events wait in a bounded
+    # queue and are flushed to Redis in pipelines of up to EVENT_BATCH_SIZE.
+    event_queue_size: int = 10000
+    event_batch_size: int = 200
+    event_publish_retries: int = 3
+    event_shutdown_timeout_seconds: float = 5.0
+    # Transactional outbox (core.outbox). Turn the in-process relay off when
+    # a dedicated `backend/scripts/outbox_relay.py` process runs instead.
+    outbox_relay_enabled: bool = True
+    outbox_batch_size: int = 500
+    outbox_poll_interval_seconds: float = 1.0
+    outbox_retention_hours: int = 24
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+settings = Settings()
@@ -0,0 +1,20 @@
+from backend.shared.database.counts import invalidate_counts
+
+# Events that change which rows the paginated totals cover.
+EVENT_NAMESPACES = {
+    "thread.created": ("threads",),
+    "thread.deleted": ("threads",),
+    "comment.created": ("comments",),
+    "comment.deleted": ("comments",),
+}
+
+
+def invalidate_counts_for_event(message: dict) -> None:
+    """Drop cached totals affected by a published discussion event."""
+    namespaces = list(EVENT_NAMESPACES.get(message.get("event"), ()))
+    actor_id = message.get("actor_id")
+    if actor_id:
+        # Every event an actor publishes can add to their activity feed.
+        namespaces.append(f"activity:{actor_id}")
+    if namespaces:
+        invalidate_counts(*namespaces)
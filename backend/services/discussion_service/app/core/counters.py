@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.orm import Session
+
+from backend.services.discussion_service.app.core.config import settings
+from backend.services.discussion_service.app.models.comment import Comment
+from backend.services.discussion_service.app.models.like import Like
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.shared.database.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _thread_like_total():
+    return (
+        select(func.count(Like.id))
+        .where(Like.thread_id == Thread.id)
+        .scalar_subquery()
+    )
+
+
+def _thread_comment_total():
+    return (
+        select(func.count(Comment.id))
+        .where(
+            Comment.thread_id == Thread.id,
+            Comment.is_deleted == False,
+        )
+        .scalar_subquery()
+    )
+
+
+def _comment_like_total():
+    return (
+        select(func.count(Like.id))
+        .where(Like.comment_id == Comment.id)
+        .scalar_subquery()
+    )
+
+
+def reconcile_thread_counters_batch(
+    db: Session,
+    *,
+    after_id: UUID | None,
+    batch_size: int,
+) -> tuple[int, UUID | None]:
+    """
+    Repair like/comment counters for the next batch of threads (keyed by id).
+
+    Returns the number of repaired rows and the last id scanned, or None
+    when there are no threads left.
+    """
+    query = select(Thread.id).order_by(Thread.id).limit(batch_size)
+    if after_id is not None:
+        query = query.where(Thread.id > after_id)
+    thread_ids = list(db.scalars(query))
+    if not thread_ids:
+        return 0, None
+
+    like_total = _thread_like_total()
+    comment_total = _thread_comment_total()
+    result = db.execute(
+        update(Thread)
+        .where(
+            Thread.id.in_(thread_ids),
+            or_(
+                Thread.like_count != like_total,
+                Thread.comment_count != comment_total,
+            ),
+        )
+        .values(like_count=like_total, comment_count=comment_total)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount or 0, thread_ids[-1]
+
+
+def reconcile_comment_like_counts_batch(
+    db: Session,
+    *,
+    after_id: UUID | None,
+    batch_size: int,
+) -> tuple[int, UUID | None]:
+    """Repair like counters for the next batch of comments (keyed by id)."""
+    query = select(Comment.id).order_by(Comment.id).limit(batch_size)
+    if after_id is not None:
+        query = query.where(Comment.id > after_id)
+    comment_ids = list(db.scalars(query))
+    if not comment_ids:
+        return 0, None
+
+    like_total = _comment_like_total()
+    result = db.execute(
+        update(Comment)
+        .where(
+            Comment.id.in_(comment_ids),
+            Comment.like_count != like_total,
+        )
+        .values(like_count=like_total)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount or 0, comment_ids[-1]
+
+
+def reconcile_counters(db: Session, batch_size: int | None = None) -> dict[str, int]:
+    """Run one full reconciliation pass over threads and comments."""
+    batch_size = batch_size or settings.counter_reconcile_batch_size
+    repaired = {"threads": 0, "comments": 0}
+
+    for key, reconcile_batch in (
+        ("threads", reconcile_thread_counters_batch),
+        ("comments", reconcile_comment_like_counts_batch),
+    ):
+        after_id = None
+        while True:
+            fixed, after_id = reconcile_batch(db, after_id=after_id, batch_size=batch_size)
+            repaired[key] += fixed
+            if after_id is None:
+                break
+
+    return repaired
+
+
+def _run_reconcile_pass() -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        return reconcile_counters(db)
+    finally:
+        db.close()
+
+
+async def start_counter_reconciler():
+    """Periodically repair drift in the denormalized engagement counters."""
+    while True:
+        try:
+            repaired = await asyncio.to_thread(_run_reconcile_pass)
+            if repaired["threads"] or repaired["comments"]:
+                logger.info(
+                    "Counter reconciler repaired %s threads and %s comments",
+                    repaired["threads"],
+                    repaired["comments"],
+                )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Counter reconciler failed: %s", exc)
+
+        await asyncio.sleep(settings.counter_reconcile_interval_seconds)
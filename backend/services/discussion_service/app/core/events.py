@@ -1,9 +1,39 @@
+import atexit
 import redis
-import json
-from datetime import datetime, timezone
-import uuid
+import logging
+import queue
+import threading
+import time
+from typing import Callable
 import os
 
+from sqlalchemy.orm import Session
+
+from backend.services.discussion_service.app.core.config import settings
+from backend.services.discussion_service.app.models.event_outbox import EventOutbox
+from backend.shared.database.unit_of_work import on_commit, unit_of_work
+from backend.shared.events.codec import event_codec
+from backend.shared.events.envelope import make_envelope
+from backend.shared.events.streams import queue_publish
+from backend.shared.metrics.registry import REGISTRY, Counter, Histogram
+from backend.shared.tracing.tracer import inject, start_span
+
+logger = logging.getLogger(__name__)
+
+# In-process subscribers (e.g. the memory search index) that see every
+# published event without a Redis round trip.
+_local_listeners: list[Callable[[dict], None]] = []
+
+
+def add_local_listener(listener: Callable[[dict], None]) -> None:
+    if listener not in _local_listeners:
+        _local_listeners.append(listener)
+
+
+def remove_local_listener(listener: Callable[[dict], None]) -> None:
+    if listener in _local_listeners:
+        _local_listeners.remove(listener)
+
 
 def get_redis_port() -> int:
     try:
@@ -19,20 +49,212 @@ redis_client = redis.Redis(
 )
 
 
+PUBLISHED = Counter("event_publisher_published_total", "Events flushed to Redis.", ("channel",))
+DROPPED = Counter(
+    "event_publisher_dropped_total",
+    "Events dropped because the queue was full or Redis kept failing.",
+    ("reason",),
+)
+BATCH_SIZE = Histogram(
+    "event_publisher_batch_size",
+    "Events per Redis pipeline.",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+FLUSH_DURATION = Histogram("event_publisher_flush_duration_seconds", "Time to flush one pipeline to Redis.")
+
+
+class EventPublisher:
+    """
+    Publish events to Redis from a background thread.
+
+    publish() only appends to a bounded queue, so a request never waits on
+    Redis and a Redis stall cannot fail it. One worker thread drains
+    whatever is queued into a single pipeline, so bursts (a comment with
+    many mentions) cost one round trip and events keep their order. When
+    the queue is full, new events are dropped and counted; Pub/Sub gives
+    no delivery guarantee to begin with.
+
+    send() is the one Redis write path for events: the worker uses it for
+    queued events and the outbox relay calls it directly for committed
+    outbox rows, so both share the pipelining, retries and metrics.
+    """
+
+    def __init__(self, maxsize: int, batch_size: int, retries: int):
+        self.batch_size = batch_size
+        self.retries = retries
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._last_drop_warning = 0.0
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def publish(self, channel: str, data: bytes) -> bool:
+        """Queue one message; False when it was dropped."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((channel, data))
+        except queue.Full:
+            self._dropped("queue_full", 1)
+            return False
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until everything queued so far has been sent (or dropped)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self, timeout: float) -> bool:
+        """Flush what is queued, then stop the worker; later publishes restart it."""
+        flushed = self.flush(timeout)
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._closed = True
+                self._queue.put(None)
+        if thread is not None:
+            thread.join(timeout)
+        self._closed = False
+        return flushed
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="event-publisher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            try:
+                self._send(batch)
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def send(self, batch: list[tuple[str, bytes | str]]) -> None:
+        """Write `batch` to Redis in one pipeline now, retrying; raises once retries run out."""
+        for attempt in range(self.retries + 1):
+            started = time.perf_counter()
+            try:
+                # Looked up per flush so tests and benchmarks can swap the client.
+                pipe = redis_client.pipeline(transaction=False)
+                for channel, data in batch:
+                    queue_publish(pipe, channel, data)
+                pipe.execute()
+            except Exception:  # pylint: disable=broad-exception-caught
+                if attempt == self.retries:
+                    raise
+                time.sleep(0.05 * 2 ** attempt)
+                continue
+            FLUSH_DURATION.observe(time.perf_counter() - started)
+            BATCH_SIZE.observe(len(batch))
+            for channel, _ in batch:
+                PUBLISHED.inc(channel=channel)
+            return
+
+    def _send(self, batch: list[tuple[str, bytes]]) -> None:
+        try:
+            self.send(batch)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Dropping %d events after %d attempts: %s", len(batch), self.retries + 1, exc)
+            self._dropped("redis_error", len(batch))
+
+    def _dropped(self, reason: str, count: int) -> None:
+        DROPPED.inc(count, reason=reason)
+        now = time.monotonic()
+        if now - self._last_drop_warning >= 10:
+            self._last_drop_warning = now
+            logger.warning("Event publisher dropped %d events (%s); queue depth %d", count, reason, self.depth())
+
+
+event_publisher = EventPublisher(
+    maxsize=settings.event_queue_size,
+    batch_size=settings.event_batch_size,
+    retries=settings.event_publish_retries,
+)
+
+
+def _publisher_families() -> list:
+    return [
+        (
+            "event_publisher_queue_depth",
+            "gauge",
+            "Events waiting to be flushed to Redis.",
+            [({}, event_publisher.depth())],
+        )
+    ]
+
+
+REGISTRY.add_collector(_publisher_families)
+# Scripts that publish events exit without a lifespan; send what is queued first.
+atexit.register(event_publisher.close, settings.event_shutdown_timeout_seconds)
+
+
+def _notify_local_listeners(message: dict) -> None:
+    for listener in list(_local_listeners):
+        try:
+            listener(message)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Local event listener failed for %s: %s", message["event"], exc)
+
+
 def publish_event(
     channel: str,
     event: str,
     thread_id: str,
     actor_id: str,
     payload: dict,
+    db: Session | None = None,
 ):
-    message = {
-        "event_id": str(uuid.uuid4()),
-        "event": event,
-        "thread_id": thread_id,
-        "actor_id": actor_id,
-        "payload": payload,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
-
-    redis_client.publish(channel, json.dumps(message))
+    """
+    Publish a domain event to Redis and the in-process listeners.
+
+    With `db`, the event is written to the outbox in the caller's
+    unit_of_work (or its own when there is none) and core.outbox relays it
+    once committed; local listeners also wait for the commit. Without
+    `db` it goes straight to the background publisher, best effort.
+    """
+    # The producer span's traceparent rides in the event so listeners continue the trace.
+    with start_span("publish_event", kind="producer", channel=channel, event=event):
+        message = inject(make_envelope(event, thread_id, actor_id, payload))
+
+        if db is not None and hasattr(db, "add"):
+            with unit_of_work(db):
+                db.add(
+                    EventOutbox(
+                        event_id=message["event_id"],
+                        channel=channel,
+                        event=event,
+                        payload=event_codec.to_text(message),
+                    )
+                )
+                on_commit(db, lambda: _notify_local_listeners(message))
+            return
+
+        _notify_local_listeners(message)
+        event_publisher.publish(channel, event_codec.encode(message))
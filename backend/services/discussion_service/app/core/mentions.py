@@ -52,4 +52,5 @@ def publish_mention_events_for_usernames(
                 "source_id": str(source_id),
                 "preview": preview[:200],
             },
+            db=db,
         )
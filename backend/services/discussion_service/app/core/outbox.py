@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from backend.services.discussion_service.app.core import events
+from backend.services.discussion_service.app.core.config import settings
+from backend.services.discussion_service.app.models.event_outbox import EventOutbox
+from backend.shared.database.session import SessionLocal
+from backend.shared.database.unit_of_work import unit_of_work
+from backend.shared.events.codec import stored_to_wire
+from backend.shared.metrics.registry import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+RELAYED = Counter("outbox_relayed_total", "Outbox events published to Redis.", ("channel",))
+RELAY_FAILURES = Counter("outbox_relay_failures_total", "Relay passes that failed and left their rows pending.")
+RELAY_LAG = Histogram("outbox_relay_lag_seconds", "Time from writing an outbox row to publishing it.")
+
+PURGE_INTERVAL_SECONDS = 3600
+
+_loop: asyncio.AbstractEventLoop | None = None
+_wakeup: asyncio.Event | None = None
+
+
+def relay_outbox_batch(db: Session, batch_size: int | None = None) -> int:
+    """
+    Publish the oldest undelivered events and mark them delivered.
+
+    Rows are locked with FOR UPDATE SKIP LOCKED, so several relays can
+    share the table, and stay locked until the batch is published; if
+    Redis still fails after the publisher's retries, the transaction
+    rolls back and the rows are retried on the next pass.
+    """
+    batch_size = batch_size or settings.outbox_batch_size
+    with unit_of_work(db):
+        rows = list(
+            db.scalars(
+                select(EventOutbox)
+                .where(EventOutbox.delivered_at.is_(None))
+                .order_by(EventOutbox.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        )
+        if not rows:
+            return 0
+
+        # Same pipeline, retries and publish metrics as the background publisher.
+        events.event_publisher.send([(row.channel, stored_to_wire(row.payload)) for row in rows])
+
+        now = datetime.now(timezone.utc)
+        db.execute(
+            update(EventOutbox)
+            .where(EventOutbox.id.in_([row.id for row in rows]))
+            .values(delivered_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    for row in rows:
+        RELAYED.inc(channel=row.channel)
+        created_at = row.created_at if row.created_at.tzinfo else row.created_at.replace(tzinfo=timezone.utc)
+        RELAY_LAG.observe(max(0.0, (now - created_at).total_seconds()))
+    return len(rows)
+
+
+def purge_delivered(db: Session, older_than: timedelta) -> int:
+    """Delete rows delivered before `older_than` ago."""
+    cutoff = datetime.now(timezone.utc) - older_than
+    with unit_of_work(db):
+        result = db.execute(delete(EventOutbox).where(EventOutbox.delivered_at < cutoff))
+    return result.rowcount or 0
+
+
+def _run_relay_pass() -> int:
+    db = SessionLocal()
+    try:
+        total = 0
+        while True:
+            relayed = relay_outbox_batch(db)
+            total += relayed
+            if relayed < settings.outbox_batch_size:
+                return total
+    finally:
+        db.close()
+
+
+def _run_purge() -> int:
+    db = SessionLocal()
+    try:
+        return purge_delivered(db, timedelta(hours=settings.outbox_retention_hours))
+    finally:
+        db.close()
+
+
+def wake_outbox_relay(_message: dict | None = None) -> None:
+    """Local event listener: relay as soon as an outbox row commits instead of at the next poll."""
+    loop, wakeup = _loop, _wakeup
+    if loop is not None and wakeup is not None:
+        loop.call_soon_threadsafe(wakeup.set)
+
+
+async def start_outbox_relay():
+    """Relay committed outbox events to Redis until cancelled."""
+    global _loop, _wakeup
+    _loop, _wakeup = asyncio.get_running_loop(), asyncio.Event()
+    events.add_local_listener(wake_outbox_relay)
+    last_purge = time.monotonic()
+    try:
+        while True:
+            _wakeup.clear()
+            try:
+                await asyncio.to_thread(_run_relay_pass)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                RELAY_FAILURES.inc()
+                logger.error("Outbox relay failed, retrying: %s", exc)
+                # Commits keep waking the relay; do not hammer a Redis that is down.
+                await asyncio.sleep(settings.outbox_poll_interval_seconds)
+
+            if time.monotonic() - last_purge >= PURGE_INTERVAL_SECONDS:
+                last_purge = time.monotonic()
+                try:
+                    purged = await asyncio.to_thread(_run_purge)
+                    if purged:
+                        logger.info("Outbox relay purged %s delivered events", purged)
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    logger.error("Outbox purge failed: %s", exc)
+
+            try:
+                await asyncio.wait_for(_wakeup.wait(), settings.outbox_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        events.remove_local_listener(wake_outbox_relay)
+        _loop = _wakeup = None
+
+
+async def drain_outbox() -> int:
+    """Relay whatever is pending once more, for shutdown."""
+    try:
+        return await asyncio.to_thread(_run_relay_pass)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.error("Outbox drain on shutdown failed; the next relay will pick it up: %s", exc)
+        return 0
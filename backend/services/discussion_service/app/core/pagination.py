@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+# Continuation token meaning "from the first item", for lists nothing was loaded from yet.
+START_CURSOR = "start"
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Encode a (created_at, id) keyset position as an opaque URL-safe token."""
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(item_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a token produced by encode_cursor, rejecting anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), UUID(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def next_cursor(items: list, size: int) -> str | None:
+    """Return the cursor for the page after `items`, or None on the last page."""
+    if len(items) < size or not items:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -2,6 +2,8 @@ import redis
 import json
 import os
 
+from backend.shared.metrics.pubsub import timed_publish
+
 
 def get_redis_port() -> int:
     try:
@@ -16,11 +18,12 @@ redis_client = redis.Redis(
 )
 
 def publish_thread_event(thread_id: str, event_type: str, data: dict):
-    redis_client.publish(
-        "thread_updates",
-        json.dumps({
-            "thread_id": thread_id,
-            "type": event_type,
-            "data": data
-        })
-    )
+    with timed_publish("discussion", "thread_updates"):
+        redis_client.publish(
+            "thread_updates",
+            json.dumps({
+                "thread_id": thread_id,
+                "type": event_type,
+                "data": data
+            })
+        )
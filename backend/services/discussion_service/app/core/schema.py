@@ -0,0 +1,155 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Lightweight schema sync for local/dev where migrations are not set up.
+COLUMN_STATEMENTS = [
+    "ALTER TABLE threads ADD COLUMN IF NOT EXISTS image_url VARCHAR(500)",
+    (
+        "ALTER TABLE threads ADD COLUMN IF NOT EXISTS moderation_status "
+        "VARCHAR(30) NOT NULL DEFAULT 'pending'"
+    ),
+    "UPDATE threads SET moderation_status = 'pending' WHERE moderation_status IS NULL",
+    # Denormalized engagement counters, repaired by core.counters when they drift.
+    "ALTER TABLE threads ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE threads ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE comments ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0",
+    # Materialized comment paths (see models.comment); backfilled below.
+    "ALTER TABLE comments ADD COLUMN IF NOT EXISTS path VARCHAR",
+    "ALTER TABLE comments ADD COLUMN IF NOT EXISTS depth INTEGER NOT NULL DEFAULT 0",
+    # Full-text search vectors, kept current by PostgreSQL on every write.
+    (
+        "ALTER TABLE threads ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+        ") STORED"
+    ),
+    (
+        "ALTER TABLE comments ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED"
+    ),
+]
+
+# Rebuild paths for the whole forest when any comment is missing one (rows
+# written before the column existed). Segment width matches
+# models.comment.PATH_SEGMENT_LENGTH.
+COMMENT_PATH_BACKFILL = """
+WITH RECURSIVE tree AS (
+    SELECT
+        c.id,
+        LEFT(REPLACE(c.id::text, '-', ''), 12)::VARCHAR AS path,
+        0 AS depth
+    FROM comments c
+    WHERE c.parent_id IS NULL
+      AND EXISTS (SELECT 1 FROM comments missing WHERE missing.path IS NULL)
+
+    UNION ALL
+
+    SELECT
+        c.id,
+        (tree.path || LEFT(REPLACE(c.id::text, '-', ''), 12))::VARCHAR,
+        tree.depth + 1
+    FROM comments c
+    JOIN tree ON c.parent_id = tree.id
+)
+UPDATE comments
+SET path = tree.path, depth = tree.depth
+FROM tree
+WHERE comments.id = tree.id
+  AND comments.path IS DISTINCT FROM tree.path
+"""
+
+# create_all only builds indexes for new tables; keep existing ones in step.
+INDEX_STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_threads_created_at_id ON threads (created_at, id)",
+    (
+        "CREATE INDEX IF NOT EXISTS ix_threads_author_created_at_id "
+        "ON threads (author_id, created_at, id)"
+    ),
+    "CREATE INDEX IF NOT EXISTS ix_comments_created_at_id ON comments (created_at, id)",
+    (
+        "CREATE INDEX IF NOT EXISTS ix_comments_thread_created_at_id "
+        "ON comments (thread_id, created_at, id)"
+    ),
+    (
+        "CREATE INDEX IF NOT EXISTS ix_comments_parent_created_at_id "
+        "ON comments (parent_id, created_at, id)"
+    ),
+    (
+        "CREATE INDEX IF NOT EXISTS ix_thread_reports_status_created_at_id "
+        "ON thread_reports (status, created_at, id)"
+    ),
+    (
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_comments_thread_path "
+        "ON comments (thread_id, path text_pattern_ops)"
+    ),
+    "CREATE INDEX IF NOT EXISTS ix_threads_search_vector ON threads USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_comments_search_vector ON comments USING GIN (search_vector)",
+]
+
+USER_ACTIVITY_VIEW = """
+CREATE OR REPLACE VIEW user_activity_view AS
+SELECT
+    t.author_id AS user_id,
+    'thread.created'::VARCHAR AS activity_type,
+    t.id AS thread_id,
+    NULL::uuid AS comment_id,
+    t.title AS title,
+    LEFT(t.description, 200) AS preview,
+    t.created_at AS created_at
+FROM threads t
+WHERE t.is_deleted = FALSE
+
+UNION ALL
+
+SELECT
+    c.author_id AS user_id,
+    CASE
+        WHEN c.parent_id IS NULL THEN 'comment.created'
+        ELSE 'reply.created'
+    END::VARCHAR AS activity_type,
+    c.thread_id AS thread_id,
+    c.id AS comment_id,
+    t.title AS title,
+    LEFT(c.content, 200) AS preview,
+    c.created_at AS created_at
+FROM comments c
+JOIN threads t ON t.id = c.thread_id
+WHERE c.is_deleted = FALSE
+  AND t.is_deleted = FALSE
+
+UNION ALL
+
+SELECT
+    l.user_id AS user_id,
+    CASE
+        WHEN l.thread_id IS NOT NULL THEN 'thread.liked'
+        ELSE 'comment.liked'
+    END::VARCHAR AS activity_type,
+    COALESCE(l.thread_id, c.thread_id) AS thread_id,
+    l.comment_id AS comment_id,
+    t.title AS title,
+    CASE
+        WHEN l.thread_id IS NOT NULL THEN 'Liked a thread'
+        ELSE CONCAT('Liked comment: ', LEFT(c.content, 120))
+    END AS preview,
+    l.created_at AS created_at
+FROM likes l
+LEFT JOIN comments c ON c.id = l.comment_id
+JOIN threads t ON t.id = COALESCE(l.thread_id, c.thread_id)
+WHERE t.is_deleted = FALSE
+  AND (
+    l.thread_id IS NOT NULL OR
+    (c.id IS NOT NULL AND c.is_deleted = FALSE)
+  )
+"""
+
+
+def sync_schema(connection: Connection) -> None:
+    """Apply additive schema changes that create_all does not cover."""
+    for statement in COLUMN_STATEMENTS:
+        connection.execute(text(statement))
+    connection.execute(text(COMMENT_PATH_BACKFILL))
+    for statement in INDEX_STATEMENTS:
+        connection.execute(text(statement))
+    connection.execute(text(USER_ACTIVITY_VIEW))
@@ -0,0 +1,106 @@
+import html
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+
+# Text search configuration used for both the stored vectors and the queries.
+SEARCH_CONFIG = "english"
+
+# ts_headline wraps matches in these control characters so the snippet can be
+# HTML-escaped before the markers are turned into <mark> tags.
+_SNIPPET_START = "\x02"
+_SNIPPET_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f"StartSel={_SNIPPET_START}, StopSel={_SNIPPET_STOP}, "
+    "MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=\" ... \""
+)
+
+_TOKEN_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r"\w+")
+
+
+def is_full_text_enabled(db: Session) -> bool:
+    """Full-text search needs PostgreSQL; other dialects fall back to ILIKE."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+@dataclass(frozen=True)
+class SearchTerm:
+    """One parsed unit of search input: a word, a phrase or a prefix."""
+
+    words: tuple[str, ...]
+    prefix: bool = False
+    negated: bool = False
+
+
+def parse_search_terms(keyword: str) -> list[SearchTerm]:
+    """
+    Split user search input into terms.
+
+    Bare words are AND-ed, "quoted text" becomes a phrase, a trailing *
+    makes a prefix match and a leading - excludes the term. Punctuation is
+    dropped, so every term is made of plain word characters.
+    """
+    terms = []
+    for negated_phrase, phrase, token in _TOKEN_RE.findall(keyword):
+        if token:
+            words = _WORD_RE.findall(token)
+            term = SearchTerm(
+                tuple(words),
+                prefix=token.endswith("*"),
+                negated=token.startswith("-"),
+            )
+        else:
+            words = _WORD_RE.findall(phrase)
+            term = SearchTerm(tuple(words), negated=bool(negated_phrase))
+        if words:
+            terms.append(term)
+    return terms
+
+
+def _tsquery_term(term: SearchTerm) -> str:
+    words = list(term.words)
+    if term.prefix:
+        words[-1] = f"{words[-1]}:*"
+    if len(words) == 1:
+        return words[0]
+    return "(" + " <-> ".join(words) + ")"
+
+
+def build_tsquery(keyword: str) -> str | None:
+    """
+    Translate user search input into to_tsquery syntax. Returns None when
+    the input has no searchable (non-excluded) terms.
+    """
+    terms = parse_search_terms(keyword)
+    include = [_tsquery_term(term) for term in terms if not term.negated]
+    exclude = [f"!{_tsquery_term(term)}" for term in terms if term.negated]
+    if not include:
+        return None
+    return " & ".join(include + exclude)
+
+
+def tsquery(query_text: str):
+    return func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query_text)
+
+
+def headline(document, query):
+    return func.ts_headline(
+        literal_column(f"'{SEARCH_CONFIG}'::regconfig"),
+        document,
+        query,
+        HEADLINE_OPTIONS,
+    )
+
+
+def render_snippet(raw: str | None) -> str | None:
+    """Escape a ts_headline fragment and highlight the matched terms."""
+    if raw is None:
+        return None
+    return (
+        html.escape(raw)
+        .replace(_SNIPPET_START, "<mark>")
+        .replace(_SNIPPET_STOP, "</mark>")
+    )
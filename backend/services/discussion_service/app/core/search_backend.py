@@ -0,0 +1,495 @@
+import bisect
+from abc import ABC, abstractmethod
+import html
+import logging
+import math
+import re
+import threading
+from array import array
+from collections import defaultdict
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.services.discussion_service.app.core.config import settings
+from backend.services.discussion_service.app.core.events import add_local_listener, remove_local_listener
+from backend.services.discussion_service.app.core.search import SearchTerm, parse_search_terms
+from backend.services.discussion_service.app.models.comment import Comment
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.shared.database.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+
+# Thread titles count this many times towards term frequency.
+TITLE_WEIGHT = 2
+
+
+def _uuid(value) -> UUID | None:
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _WORD_RE.findall(text.lower()) if text else []
+
+
+class SearchBackend(ABC):
+    """
+    Interface for search engines that sit behind the thread and comment
+    repositories. Implementations rank documents; the repositories still
+    load rows (and apply visibility filters) from the database.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def rebuild(self, db: Session) -> None:
+        """Build the index from the database."""
+
+    @abstractmethod
+    def apply_event(self, message: dict) -> None:
+        """Update the index from one published discussion event."""
+
+    @abstractmethod
+    def search(self, kind: str, keyword: str) -> list[tuple[UUID, float]]:
+        """Return (id, score) pairs for `kind` ("thread"/"comment"), best first."""
+
+
+class BM25Index:
+    """
+    Inverted index with BM25 scoring.
+
+    Postings are parallel array('I') columns of internal doc numbers and term
+    frequencies. Documents are only ever appended, so postings stay sorted;
+    updates and deletes tombstone the old doc number and the index compacts
+    itself once tombstones pass settings.search_index_compact_ratio.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._keys: list[UUID | None] = []
+        self._doc_lengths = array("I")
+        self._created = array("d")
+        self._doc_by_key: dict[UUID, int] = {}
+        self._total_length = 0
+        self._tombstones = 0
+        self._vocabulary: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._doc_by_key)
+
+    def __contains__(self, key: UUID) -> bool:
+        return key in self._doc_by_key
+
+    def add(self, key: UUID, term_freqs: dict[str, int], created_at: float = 0.0) -> None:
+        self.remove(key)
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._doc_by_key[key] = doc
+        length = sum(term_freqs.values())
+        self._doc_lengths.append(length)
+        self._created.append(created_at)
+        self._total_length += length
+
+        for term, freq in term_freqs.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = (array("I"), array("I"))
+                self._postings[term] = postings
+                self._vocabulary = None
+            postings[0].append(doc)
+            postings[1].append(freq)
+
+    def remove(self, key: UUID) -> None:
+        doc = self._doc_by_key.pop(key, None)
+        if doc is None:
+            return
+        self._keys[doc] = None
+        self._total_length -= self._doc_lengths[doc]
+        self._tombstones += 1
+        if self._tombstones > len(self._keys) * settings.search_index_compact_ratio:
+            self.compact()
+
+    def created_at(self, key: UUID) -> float:
+        return self._created[self._doc_by_key[key]]
+
+    def compact(self) -> None:
+        """Drop tombstoned documents and renumber the survivors."""
+        remap = {}
+        keys, lengths, created = [], array("I"), array("d")
+        for doc, key in enumerate(self._keys):
+            if key is None:
+                continue
+            remap[doc] = len(keys)
+            keys.append(key)
+            lengths.append(self._doc_lengths[doc])
+            created.append(self._created[doc])
+
+        postings = {}
+        for term, (docs, freqs) in self._postings.items():
+            new_docs, new_freqs = array("I"), array("I")
+            for doc, freq in zip(docs, freqs):
+                new_doc = remap.get(doc)
+                if new_doc is not None:
+                    new_docs.append(new_doc)
+                    new_freqs.append(freq)
+            if new_docs:
+                postings[term] = (new_docs, new_freqs)
+
+        self._keys = keys
+        self._doc_lengths = lengths
+        self._created = created
+        self._doc_by_key = {key: doc for doc, key in enumerate(keys)}
+        self._postings = postings
+        self._tombstones = 0
+        self._vocabulary = None
+
+    def _expand(self, prefix: str) -> list[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        terms = []
+        for term in self._vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _score_word(self, term: str) -> dict[int, float]:
+        postings = self._postings.get(term)
+        live = len(self._doc_by_key)
+        if postings is None or not live:
+            return {}
+        docs, freqs = postings
+        idf = math.log(1 + (live - len(docs) + 0.5) / (len(docs) + 0.5))
+        avg_length = self._total_length / live or 1
+        scores = {}
+        for doc, freq in zip(docs, freqs):
+            if self._keys[doc] is None:
+                continue
+            norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc] / avg_length)
+            scores[doc] = idf * freq * (self.k1 + 1) / (freq + norm)
+        return scores
+
+    def _score_term(self, term: SearchTerm) -> dict[int, float]:
+        """
+        Score one parsed term. Phrase words must all occur in the document;
+        positions are not stored, so word order is not enforced.
+        """
+        combined: dict[int, float] | None = None
+        for index, word in enumerate(word.lower() for word in term.words):
+            if term.prefix and index == len(term.words) - 1:
+                scores: dict[int, float] = defaultdict(float)
+                for expanded in self._expand(word):
+                    for doc, score in self._score_word(expanded).items():
+                        scores[doc] = max(scores[doc], score)
+            else:
+                scores = self._score_word(word)
+
+            if combined is None:
+                combined = dict(scores)
+            else:
+                combined = {
+                    doc: combined[doc] + score
+                    for doc, score in scores.items()
+                    if doc in combined
+                }
+            if not combined:
+                return {}
+        return combined or {}
+
+    def search(self, terms: list[SearchTerm]) -> list[tuple[UUID, float]]:
+        include = [term for term in terms if not term.negated]
+        if not include:
+            return []
+
+        results: dict[int, float] | None = None
+        for term in include:
+            scores = self._score_term(term)
+            if results is None:
+                results = scores
+            else:
+                results = {doc: results[doc] + score for doc, score in scores.items() if doc in results}
+            if not results:
+                return []
+
+        for term in terms:
+            if term.negated:
+                for doc in self._score_term(SearchTerm(term.words, prefix=term.prefix)):
+                    results.pop(doc, None)
+
+        ranked = sorted(
+            results.items(),
+            key=lambda item: (-item[1], -self._created[item[0]], item[0]),
+        )
+        return [(self._keys[doc], score) for doc, score in ranked]
+
+
+def _term_freqs(*fields: tuple[str | None, int]) -> dict[str, int]:
+    freqs: dict[str, int] = defaultdict(int)
+    for text, weight in fields:
+        for token in tokenize(text):
+            freqs[token] += weight
+    return freqs
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+class InMemorySearchBackend(SearchBackend):
+    """
+    Process-local BM25 search for single-node and SQLite deployments.
+
+    Built from the database at startup and kept current by the events that
+    publish_event emits for thread and comment writes.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = {"thread": BM25Index(), "comment": BM25Index()}
+        self._pending: list[dict] | None = None
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> None:
+        """Index every live thread and comment; events seen meanwhile are replayed."""
+        with self._lock:
+            self._pending = []
+        try:
+            threads, comments = self._build(db, batch_size)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._indexes = {"thread": threads, "comment": comments}
+            for message in pending:
+                self._apply(message)
+
+        logger.info(
+            "Search index built with %s threads and %s comments",
+            len(threads),
+            len(comments),
+        )
+
+    @staticmethod
+    def _build(db: Session, batch_size: int) -> tuple[BM25Index, BM25Index]:
+        threads, comments = BM25Index(), BM25Index()
+        rows = db.execute(
+            select(Thread.id, Thread.title, Thread.description, Thread.created_at)
+            .where(Thread.is_deleted == False)
+            .execution_options(yield_per=batch_size)
+        )
+        for thread_id, title, description, created_at in rows:
+            threads.add(
+                thread_id,
+                _term_freqs((title, TITLE_WEIGHT), (description, 1)),
+                _timestamp(created_at),
+            )
+
+        rows = db.execute(
+            select(Comment.id, Comment.content, Comment.created_at)
+            .where(Comment.is_deleted == False)
+            .execution_options(yield_per=batch_size)
+        )
+        for comment_id, content, created_at in rows:
+            comments.add(comment_id, _term_freqs((content, 1)), _timestamp(created_at))
+        return threads, comments
+
+    def apply_event(self, message: dict) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(message)
+            self._apply(message)
+
+    def _apply(self, message: dict) -> None:
+        event = message.get("event")
+        payload = message.get("payload") or {}
+        key = _uuid(payload.get("id"))
+        if key is None:
+            logger.warning("Ignoring %s event without a valid id", event)
+            return
+
+        threads = self._indexes["thread"]
+        comments = self._indexes["comment"]
+
+        if event in ("thread.created", "thread.updated"):
+            created_at = (
+                threads.created_at(key)
+                if key in threads
+                else _timestamp(message.get("timestamp"))
+            )
+            threads.add(
+                key,
+                _term_freqs((payload.get("title"), TITLE_WEIGHT), (payload.get("description"), 1)),
+                created_at,
+            )
+        elif event == "thread.deleted":
+            threads.remove(key)
+        elif event in ("comment.created", "comment.updated"):
+            created_at = (
+                comments.created_at(key)
+                if key in comments
+                else _timestamp(message.get("timestamp"))
+            )
+            comments.add(key, _term_freqs((payload.get("content"), 1)), created_at)
+        elif event == "comment.deleted":
+            comments.remove(key)
+            for removed_id in payload.get("removed_ids") or ():
+                removed = _uuid(removed_id)
+                if removed is None:
+                    logger.warning("Ignoring invalid removed comment id %r", removed_id)
+                    continue
+                comments.remove(removed)
+
+    def search(self, kind: str, keyword: str) -> list[tuple[UUID, float]]:
+        terms = parse_search_terms(keyword)
+        with self._lock:
+            return self._indexes[kind].search(terms)
+
+    def document_count(self, kind: str) -> int:
+        return len(self._indexes[kind])
+
+
+def highlight(text: str | None, keyword: str, max_words: int = 35) -> str | None:
+    """Build an escaped snippet around the first match, wrapping hits in <mark>."""
+    if not text:
+        return None
+    terms = [term for term in parse_search_terms(keyword) if not term.negated]
+    exact = {
+        word.lower()
+        for term in terms
+        for word in (term.words[:-1] if term.prefix else term.words)
+    }
+    prefixes = tuple(term.words[-1].lower() for term in terms if term.prefix)
+
+    def is_hit(word: str) -> bool:
+        lowered = word.lower()
+        return lowered in exact or bool(prefixes and lowered.startswith(prefixes))
+
+    # re.split keeps the captured words at the odd indexes.
+    pieces = re.split(r"(\w+)", text)
+    words = list(range(1, len(pieces), 2))
+    if not words:
+        return html.escape(text)
+    first = next((position for position, index in enumerate(words) if is_hit(pieces[index])), 0)
+    start = max(0, first - max_words // 3)
+    window = words[start:start + max_words]
+
+    out = []
+    for index in range(window[0], window[-1] + 1):
+        piece = html.escape(pieces[index])
+        out.append(f"<mark>{piece}</mark>" if index % 2 and is_hit(pieces[index]) else piece)
+    snippet = "".join(out)
+    if start > 0:
+        snippet = "... " + snippet
+    if start + max_words < len(words):
+        snippet += " ..."
+    return snippet
+
+
+def filter_ranked_ids(
+    db: Session,
+    model,
+    ranked_ids: list[UUID],
+    filters: list,
+    stop_after: int | None = None,
+    chunk_size: int = 500,
+) -> list[UUID]:
+    """
+    Keep the ranked ids whose rows still pass `filters`, preserving order.
+    Checks in chunks and stops early once `stop_after` ids are collected.
+    """
+    kept = []
+    for offset in range(0, len(ranked_ids), chunk_size):
+        chunk = ranked_ids[offset:offset + chunk_size]
+        allowed = set(db.scalars(select(model.id).where(model.id.in_(chunk), *filters)))
+        kept.extend(item_id for item_id in chunk if item_id in allowed)
+        if stop_after is not None and len(kept) >= stop_after:
+            break
+    return kept
+
+
+SEARCH_BACKENDS = {
+    InMemorySearchBackend.name: InMemorySearchBackend,
+}
+
+_backend: SearchBackend | None = None
+
+
+def get_search_backend() -> SearchBackend | None:
+    """Return the configured in-process backend, or None to search in the database."""
+    return _backend
+
+
+def set_search_backend(backend: SearchBackend | None) -> None:
+    global _backend
+    _backend = backend
+
+
+def configure_search_backend() -> SearchBackend | None:
+    """
+    Instantiate settings.search_backend unless it is the database default.
+
+    The memory index only sees writes committed by its own process, so it
+    is refused when WEB_CONCURRENCY says more than one worker is serving.
+    """
+    backend_cls = SEARCH_BACKENDS.get(settings.search_backend)
+    if backend_cls is None:
+        if settings.search_backend != "database":
+            logger.warning("Unknown search backend %r, using database search", settings.search_backend)
+        set_search_backend(None)
+        return None
+    if settings.web_concurrency > 1:
+        logger.error(
+            "search_backend=%s needs a single worker (WEB_CONCURRENCY=%d); using database search",
+            settings.search_backend,
+            settings.web_concurrency,
+        )
+        set_search_backend(None)
+        return None
+    backend = backend_cls()
+    set_search_backend(backend)
+    return backend
+
+
+def start_search_backend() -> SearchBackend | None:
+    """
+    Configure the search backend, subscribe it to local events and build
+    its index. Falls back to database search if the build fails.
+    """
+    backend = configure_search_backend()
+    if backend is None:
+        return None
+
+    add_local_listener(backend.apply_event)
+    db = SessionLocal()
+    try:
+        backend.rebuild(db)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.error("Search index build failed, using database search: %s", exc)
+        remove_local_listener(backend.apply_event)
+        set_search_backend(None)
+        return None
+    finally:
+        db.close()
+    return backend
@@ -0,0 +1,160 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Callable
+from uuid import UUID
+
+import redis
+
+from backend.services.discussion_service.app.core.config import settings
+from backend.services.discussion_service.app.core.events import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Events that change the shared (viewer-independent) part of a thread detail.
+INVALIDATING_EVENTS = {
+    "thread.updated",
+    "thread.deleted",
+    "thread.like.updated",
+    "comment.created",
+    "comment.deleted",
+}
+
+# Store the rebuilt detail only while the rebuilder still holds its lock.
+# invalidate() deletes the lock, so a rebuild that read the database before
+# a concurrent write cannot cache its stale result after the invalidation.
+_SET_IF_LOCKED = """
+if redis.call('get', KEYS[2]) == ARGV[1] then
+    redis.call('set', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class CacheStats:
+    """Thread-safe counters for cache diagnostics."""
+
+    FIELDS = ("hits", "misses", "rebuilds", "lock_waits", "coalesced", "invalidations", "stale_rebuilds", "errors")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            self._values[field] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            values = dict(self._values)
+        lookups = values["hits"] + values["misses"]
+        values["hit_ratio"] = round(values["hits"] / lookups, 4) if lookups else None
+        return values
+
+
+class ThreadDetailCache:
+    """
+    Read-through Redis cache for thread details.
+
+    Only one caller rebuilds a cold key: it takes a short NX lock while the
+    others poll the key briefly and fall back to the database if the
+    rebuild is slow. An invalidation during a rebuild drops the lock, and
+    the rebuild's result is then returned but not cached. Any Redis error
+    degrades to building from the database.
+    """
+
+    def __init__(self, client: redis.Redis | None = None):
+        self.client = client or redis_client
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(thread_id: UUID | str) -> str:
+        return f"thread:detail:{thread_id}"
+
+    def get_or_build(self, thread_id: UUID, build: Callable[[], dict]) -> dict:
+        if not settings.thread_cache_enabled:
+            return build()
+
+        key = self.key(thread_id)
+        try:
+            cached = self.client.get(key)
+        except redis.RedisError as exc:
+            self._record_error(exc)
+            return build()
+        if cached:
+            self.stats.incr("hits")
+            return json.loads(cached)
+
+        self.stats.incr("misses")
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.client.set(lock_key, token, nx=True, px=settings.thread_cache_lock_ms)
+        except redis.RedisError as exc:
+            self._record_error(exc)
+            return build()
+
+        if not acquired:
+            self.stats.incr("lock_waits")
+            return self._wait_for_rebuild(key) or build()
+
+        try:
+            data = build()
+            self.stats.incr("rebuilds")
+            try:
+                stored = self.client.eval(
+                    _SET_IF_LOCKED, 2, key, lock_key, token, json.dumps(data), settings.thread_cache_ttl_seconds
+                )
+                if not stored:
+                    self.stats.incr("stale_rebuilds")
+            except redis.RedisError as exc:
+                self._record_error(exc)
+            return data
+        finally:
+            self._release(lock_key, token)
+
+    def _wait_for_rebuild(self, key: str) -> dict | None:
+        deadline = time.monotonic() + settings.thread_cache_wait_ms / 1000
+        while time.monotonic() < deadline:
+            time.sleep(0.02)
+            try:
+                cached = self.client.get(key)
+            except redis.RedisError as exc:
+                self._record_error(exc)
+                return None
+            if cached:
+                self.stats.incr("coalesced")
+                return json.loads(cached)
+        return None
+
+    def _release(self, lock_key: str, token: str) -> None:
+        try:
+            if self.client.get(lock_key) == token:
+                self.client.delete(lock_key)
+        except redis.RedisError as exc:
+            self._record_error(exc)
+
+    def _record_error(self, exc: Exception) -> None:
+        self.stats.incr("errors")
+        logger.warning("Thread cache unavailable: %s", exc)
+
+    def invalidate(self, thread_id: UUID | str) -> None:
+        key = self.key(thread_id)
+        try:
+            # Dropping the lock too stops an in-flight rebuild from caching
+            # what it read before this change committed.
+            self.client.delete(key, f"{key}:lock")
+            self.stats.incr("invalidations")
+        except redis.RedisError as exc:
+            self._record_error(exc)
+
+    def handle_event(self, message: dict) -> None:
+        """publish_event listener: drop the cached detail a thread event touches."""
+        if message.get("event") in INVALIDATING_EVENTS and message.get("thread_id"):
+            self.invalidate(message["thread_id"])
+
+
+thread_cache = ThreadDetailCache()
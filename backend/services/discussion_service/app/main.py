@@ -3,17 +3,31 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from pathlib import Path
+import asyncio
 import os
-from sqlalchemy import text
 
+from backend.shared.database.async_session import dispose_async_engine
 from backend.shared.database.engine import engine
 from backend.shared.database.base import Base
 from backend.shared.logging.logger import setup_logging
+from backend.shared.database.profiler import SQLProfilerMiddleware
+from backend.shared.metrics.http import MetricsMiddleware, router as metrics_router
+from backend.shared.tracing.http import TracingMiddleware
+from backend.shared.tracing.tracer import setup_tracing
+from backend.services.discussion_service.app.core.schema import sync_schema
+from backend.services.discussion_service.app.core.config import settings
+from backend.services.discussion_service.app.core.counters import start_counter_reconciler
+from backend.services.discussion_service.app.core.search_backend import start_search_backend
+from backend.services.discussion_service.app.core.count_invalidation import invalidate_counts_for_event
+from backend.services.discussion_service.app.core.events import add_local_listener, event_publisher
+from backend.services.discussion_service.app.core.outbox import drain_outbox, start_outbox_relay
+from backend.services.discussion_service.app.core.thread_cache import thread_cache
 from backend.services.discussion_service.app.api.health import router as health_router
 from backend.services.discussion_service.app.api.threads import router as threads_router
 from backend.services.discussion_service.app.api import router as comments_router
 from backend.services.discussion_service.app.api.likes import router as likes_router
 from backend.services.discussion_service.app.api.moderation import router as moderation_router
+from backend.services.discussion_service.app.api.diagnostics import router as diagnostics_router
 
 
 def get_cors_origins() -> list[str]:
@@ -31,94 +45,42 @@ async def lifespan(app: FastAPI):
             print("Discussion service DB connection successful.")
 
         Base.metadata.create_all(bind=engine)
-        # Lightweight schema sync for local/dev where migrations are not set up.
         with engine.begin() as connection:
-            connection.execute(
-                text("ALTER TABLE threads ADD COLUMN IF NOT EXISTS image_url VARCHAR(500)")
-            )
-            connection.execute(
-                text(
-                    "ALTER TABLE threads ADD COLUMN IF NOT EXISTS moderation_status "
-                    "VARCHAR(30) NOT NULL DEFAULT 'pending'"
-                )
-            )
-            connection.execute(
-                text(
-                    "UPDATE threads SET moderation_status = 'pending' "
-                    "WHERE moderation_status IS NULL"
-                )
-            )
-            connection.execute(
-                text(
-                    """
-                    CREATE OR REPLACE VIEW user_activity_view AS
-                    SELECT
-                        t.author_id AS user_id,
-                        'thread.created'::VARCHAR AS activity_type,
-                        t.id AS thread_id,
-                        NULL::uuid AS comment_id,
-                        t.title AS title,
-                        LEFT(t.description, 200) AS preview,
-                        t.created_at AS created_at
-                    FROM threads t
-                    WHERE t.is_deleted = FALSE
-
-                    UNION ALL
-
-                    SELECT
-                        c.author_id AS user_id,
-                        CASE
-                            WHEN c.parent_id IS NULL THEN 'comment.created'
-                            ELSE 'reply.created'
-                        END::VARCHAR AS activity_type,
-                        c.thread_id AS thread_id,
-                        c.id AS comment_id,
-                        t.title AS title,
-                        LEFT(c.content, 200) AS preview,
-                        c.created_at AS created_at
-                    FROM comments c
-                    JOIN threads t ON t.id = c.thread_id
-                    WHERE c.is_deleted = FALSE
-                      AND t.is_deleted = FALSE
-
-                    UNION ALL
-
-                    SELECT
-                        l.user_id AS user_id,
-                        CASE
-                            WHEN l.thread_id IS NOT NULL THEN 'thread.liked'
-                            ELSE 'comment.liked'
-                        END::VARCHAR AS activity_type,
-                        COALESCE(l.thread_id, c.thread_id) AS thread_id,
-                        l.comment_id AS comment_id,
-                        t.title AS title,
-                        CASE
-                            WHEN l.thread_id IS NOT NULL THEN 'Liked a thread'
-                            ELSE CONCAT('Liked comment: ', LEFT(c.content, 120))
-                        END AS preview,
-                        l.created_at AS created_at
-                    FROM likes l
-                    LEFT JOIN comments c ON c.id = l.comment_id
-                    JOIN threads t ON t.id = COALESCE(l.thread_id, c.thread_id)
-                    WHERE t.is_deleted = FALSE
-                      AND (
-                        l.thread_id IS NOT NULL OR
-                        (c.id IS NOT NULL AND c.is_deleted = FALSE)
-                      )
-                    """
-                )
-            )
+            sync_schema(connection)
         print("Discussion tables checked/created.")
 
     except Exception as e:
         print("Startup error in discussion service:", e)
 
+    add_local_listener(invalidate_counts_for_event)
+    add_local_listener(thread_cache.handle_event)
+    search_backend = await asyncio.to_thread(start_search_backend)
+    if search_backend is not None:
+        print(f"Search backend '{search_backend.name}' ready.")
+
+    reconciler_task = None
+    if settings.counter_reconcile_enabled:
+        reconciler_task = asyncio.create_task(start_counter_reconciler())
+
+    relay_task = None
+    if settings.outbox_relay_enabled:
+        relay_task = asyncio.create_task(start_outbox_relay())
+
     yield
 
     print("Discussion service shutting down...")
+    if reconciler_task:
+        reconciler_task.cancel()
+    if relay_task:
+        relay_task.cancel()
+        await drain_outbox()
+    if not await asyncio.to_thread(event_publisher.close, settings.event_shutdown_timeout_seconds):
+        print(f"Event publisher shut down with {event_publisher.depth()} events unsent.")
+    await dispose_async_engine()
 
 
 setup_logging("discussion_service")
+setup_tracing("discussion_service")
 
 app = FastAPI(
     title="Discussion Service",
@@ -131,6 +93,9 @@ uploads_dir = Path(__file__).resolve().parent / "uploads"
 uploads_dir.mkdir(parents=True, exist_ok=True)
 app.mount("/uploads", StaticFiles(directory=str(uploads_dir)), name="uploads")
 
+app.add_middleware(SQLProfilerMiddleware)
+app.add_middleware(MetricsMiddleware, service="discussion")
+app.add_middleware(TracingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=get_cors_origins(),
@@ -139,8 +104,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(metrics_router)
 app.include_router(health_router)
 app.include_router(threads_router)
 app.include_router(comments_router)
 app.include_router(likes_router)
 app.include_router(moderation_router)
+app.include_router(diagnostics_router)
@@ -1,3 +1,4 @@
 from .thread import Thread
 from .comment import Comment
-from .like import Like
\ No newline at end of file
+from .like import Like
+from .event_outbox import EventOutbox
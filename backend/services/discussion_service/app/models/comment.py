@@ -1,12 +1,29 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Text, Boolean, DateTime, ForeignKey, Integer, Index, String, event, select
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
 from backend.shared.database.base import Base
 
+# Each comment contributes this many hex characters of its id to the
+# materialized path, so a comment's descendants are exactly the rows whose
+# path starts with its own.
+PATH_SEGMENT_LENGTH = 12
+# Deepest allowed reply; keeps a path well inside PostgreSQL's btree
+# entry limit (~2.7 kB) for the ix_comments_thread_path index.
+MAX_COMMENT_DEPTH = 200
+
+
+def path_segment(comment_id: uuid.UUID) -> str:
+    return comment_id.hex[:PATH_SEGMENT_LENGTH]
+
+
+def child_path(parent_path: str | None, comment_id: uuid.UUID) -> str:
+    return (parent_path or "") + path_segment(comment_id)
+
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -58,6 +75,27 @@ class Comment(Base):
         nullable=False,
     )
 
+    like_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
+    # Materialized path (ancestor id prefixes, root first) and nesting depth.
+    # Filled on insert; see the before_insert listener below.
+    path: Mapped[str | None] = mapped_column(
+        String,
+        nullable=True,
+    )
+
+    depth: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
     # Relationships
 
     thread = relationship("Thread", back_populates="comments")
@@ -73,3 +111,39 @@ class Comment(Base):
         back_populates="parent",
         cascade="all, delete-orphan",
     )
+
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC.
+        Index("ix_comments_created_at_id", "created_at", "id"),
+        # Whole-thread reads: WHERE thread_id = ? ORDER BY created_at, id.
+        Index("ix_comments_thread_created_at_id", "thread_id", "created_at", "id"),
+        # Reply pages and per-parent reply counts.
+        Index("ix_comments_parent_created_at_id", "parent_id", "created_at", "id"),
+        # Subtree range scans: WHERE thread_id = ? AND path LIKE 'prefix%'.
+        Index(
+            "ix_comments_thread_path",
+            "thread_id",
+            "path",
+            unique=True,
+            postgresql_ops={"path": "text_pattern_ops"},
+        ),
+    )
+
+
+@event.listens_for(Comment, "before_insert")
+def _assign_comment_path(_mapper, connection, target: Comment) -> None:
+    """Derive path and depth from the parent for inserts that did not set them."""
+    if target.path is not None:
+        return
+    if target.id is None:
+        target.id = uuid.uuid4()
+    parent_path = None
+    if target.parent_id is not None:
+        parent_path = connection.scalar(
+            select(Comment.path).where(Comment.id == target.parent_id)
+        )
+        if parent_path is None:
+            # Parent predates paths; the schema sync backfill fills both.
+            return
+    target.path = child_path(parent_path, target.id)
+    target.depth = len(target.path) // PATH_SEGMENT_LENGTH - 1
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.shared.database.base import Base
+
+
+class EventOutbox(Base):
+    """
+    Events written in the same transaction as the change they describe.
+
+    core.outbox relays undelivered rows to Redis in id order and stamps
+    `delivered_at`, so an event survives a Redis outage or a crash between
+    commit and publish (delivery is at least once).
+    """
+
+    __tablename__ = "event_outbox"
+
+    # SQLite only autoincrements INTEGER primary keys.
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    channel: Mapped[str] = mapped_column(String(100), nullable=False)
+    event: Mapped[str] = mapped_column(String(100), nullable=False)
+    # The serialized message, published verbatim.
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    delivered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The relay only scans the undelivered tail.
+        Index(
+            "ix_event_outbox_pending",
+            "id",
+            postgresql_where=delivered_at.is_(None),
+            sqlite_where=delivered_at.is_(None),
+        ),
+    )
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -73,7 +73,27 @@ class Thread(Base):
         index=True,
     )
 
+    like_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
+    comment_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
     comments = relationship(
         "Comment",
         back_populates="thread",
     )
+
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC.
+        Index("ix_threads_created_at_id", "created_at", "id"),
+        Index("ix_threads_author_created_at_id", "author_id", "created_at", "id"),
+    )
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -58,4 +58,5 @@ class ThreadReport(Base):
 
     __table_args__ = (
         UniqueConstraint("thread_id", "reporter_id", name="uq_thread_report_per_user"),
+        Index("ix_thread_reports_status_created_at_id", "status", "created_at", "id"),
     )
@@ -1,9 +1,26 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import delete, select, func, update, tuple_, false, literal_column
 from typing import List
 from uuid import UUID
+from datetime import datetime
 
-from backend.services.discussion_service.app.models.comment import Comment
+from backend.services.discussion_service.app.core.search import (
+    build_tsquery,
+    headline,
+    is_full_text_enabled,
+    render_snippet,
+    tsquery,
+)
+from backend.services.discussion_service.app.core.search_backend import (
+    filter_ranked_ids,
+    get_search_backend,
+    highlight,
+)
+from backend.services.discussion_service.app.models.comment import PATH_SEGMENT_LENGTH, Comment
+from backend.shared.database.counts import estimate_row_count
+
+# Generated tsvector column maintained by PostgreSQL (see core.schema).
+_search_vector = literal_column("comments.search_vector")
 
 
 class CommentRepository:
@@ -11,10 +28,21 @@ class CommentRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    @staticmethod
+    def _page(query, skip: int, limit: int, before: tuple[datetime, UUID] | None):
+        """Order newest first and apply either a keyset cursor or an offset."""
+        if before is not None:
+            query = query.where(tuple_(Comment.created_at, Comment.id) < tuple_(*before))
+            skip = 0
+        return (
+            query.order_by(Comment.created_at.desc(), Comment.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+
     def create(self, comment: Comment) -> Comment:
         self.db.add(comment)
-        self.db.commit()
-        self.db.refresh(comment)
+        self.db.flush()
         return comment
 
     def get_by_id(self, comment_id: UUID) -> Comment | None:
@@ -22,62 +50,241 @@ class CommentRepository:
         return self.db.scalar(query)
 
     def get_thread_comments(self, thread_id: UUID) -> List[Comment]:
-        query = select(Comment).where(
-            Comment.thread_id == thread_id
+        query = (
+            select(Comment)
+            .where(Comment.thread_id == thread_id)
+            .order_by(Comment.created_at, Comment.id)
         )
         return list(self.db.scalars(query))
 
-    def list_comments(self, skip: int, limit: int) -> List[Comment]:
+    def list_child_comments(
+        self,
+        thread_id: UUID,
+        parent_id: UUID | None,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> List[Comment]:
+        """Oldest-first page of a thread's top-level comments, or of one comment's replies."""
+        parent_match = Comment.parent_id.is_(None) if parent_id is None else Comment.parent_id == parent_id
+        query = select(Comment).where(Comment.thread_id == thread_id, parent_match)
+        if after is not None:
+            query = query.where(tuple_(Comment.created_at, Comment.id) > tuple_(*after))
+        query = query.order_by(Comment.created_at, Comment.id).limit(limit)
+        return list(self.db.scalars(query))
+
+    def list_first_replies(self, parent_ids: List[UUID], per_parent: int) -> List[tuple[Comment, int]]:
+        """
+        The oldest `per_parent` replies of each parent in one query, paired
+        with the parent's total reply count.
+        """
+        if not parent_ids:
+            return []
+        ordering = (Comment.created_at, Comment.id)
+        ranked = (
+            select(
+                Comment.id,
+                func.row_number().over(partition_by=Comment.parent_id, order_by=ordering).label("position"),
+                func.count().over(partition_by=Comment.parent_id).label("sibling_count"),
+            )
+            .where(Comment.parent_id.in_(parent_ids))
+            .subquery()
+        )
         query = (
-            select(Comment)
-            .where(Comment.is_deleted == False)
-            .order_by(Comment.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+            select(Comment, ranked.c.sibling_count)
+            .join(ranked, ranked.c.id == Comment.id)
+            .where(ranked.c.position <= per_parent)
+            .order_by(*ordering)
         )
-        return list(self.db.scalars(query))
+        return [(comment, int(total)) for comment, total in self.db.execute(query).all()]
+
+    def count_replies(self, parent_ids: List[UUID]) -> dict[UUID, int]:
+        if not parent_ids:
+            return {}
+        query = (
+            select(Comment.parent_id, func.count())
+            .where(Comment.parent_id.in_(parent_ids))
+            .group_by(Comment.parent_id)
+        )
+        return {parent_id: int(total) for parent_id, total in self.db.execute(query).all()}
+
+    def list_comments(
+        self,
+        skip: int,
+        limit: int,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> List[Comment]:
+        query = select(Comment).where(Comment.is_deleted == False)
+        return list(self.db.scalars(self._page(query, skip, limit, before)))
 
     def count_comments(self) -> int:
         query = select(func.count()).select_from(Comment).where(Comment.is_deleted == False)
         return self.db.scalar(query)
 
-    def search_comments(self, keyword: str, skip: int, limit: int) -> List[Comment]:
-        pattern = f"%{keyword.strip()}%"
-        query = (
-            select(Comment)
-            .where(
-                Comment.is_deleted == False,
-                Comment.content.ilike(pattern),
-            )
-            .order_by(Comment.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-        )
-        return list(self.db.scalars(query))
+    def estimate_comments(self) -> int | None:
+        """Planner estimate of visible comments (PostgreSQL only)."""
+        return estimate_row_count(self.db, select(Comment.id).where(Comment.is_deleted == False))
+
+    def _search_terms(self, keyword: str):
+        """
+        Return the match clause for a keyword and, on PostgreSQL, its tsquery.
+        Other dialects fall back to a case-insensitive substring match.
+        """
+        if not is_full_text_enabled(self.db):
+            return Comment.content.ilike(f"%{keyword.strip()}%"), None
+
+        query_text = build_tsquery(keyword)
+        if query_text is None:
+            return false(), None
+        query = tsquery(query_text)
+        return _search_vector.op("@@")(query), query
+
+    def ranks_search(self) -> bool:
+        """Whether search_comments can order by relevance here, rather than newest first."""
+        return get_search_backend() is not None or is_full_text_enabled(self.db)
+
+    def search_comments(
+        self,
+        keyword: str,
+        skip: int,
+        limit: int,
+        before: tuple[datetime, UUID] | None = None,
+        ranked: bool = True,
+    ) -> List[Comment]:
+        """
+        Search comments by keyword. With full-text search and no cursor the
+        results are ordered by relevance, otherwise newest first.
+        """
+        backend = get_search_backend()
+        if backend is not None:
+            return self._search_with_backend(backend, keyword, skip, limit, before, ranked)
+
+        match, query = self._search_terms(keyword)
+        statement = select(Comment).where(Comment.is_deleted == False, match)
+
+        if query is None or before is not None or not ranked:
+            comments = list(self.db.scalars(self._page(statement, skip, limit, before)))
+        else:
+            rank = func.ts_rank_cd(_search_vector, query)
+            rows = self.db.execute(
+                statement.add_columns(rank)
+                .order_by(rank.desc(), Comment.created_at.desc(), Comment.id.desc())
+                .offset(skip)
+                .limit(limit)
+            ).all()
+            comments = []
+            for comment, score in rows:
+                comment.search_rank = score
+                comments.append(comment)
+
+        if query is not None:
+            self._attach_snippets(comments, query)
+        return comments
+
+    def _search_with_backend(self, backend, keyword, skip, limit, before, ranked):
+        """Rank with the in-process backend and load the page from the database."""
+        hits = backend.search("comment", keyword)
+        if not hits:
+            return []
+
+        scores = dict(hits)
+        filters = [Comment.is_deleted == False]
+        if before is not None or not ranked:
+            statement = select(Comment).where(Comment.id.in_(list(scores)), *filters)
+            comments = list(self.db.scalars(self._page(statement, skip, limit, before)))
+        else:
+            ranked_ids = [comment_id for comment_id, _ in hits]
+            page_ids = filter_ranked_ids(
+                self.db,
+                Comment,
+                ranked_ids,
+                filters,
+                stop_after=skip + limit,
+            )[skip:skip + limit]
+            by_id = {
+                comment.id: comment
+                for comment in self.db.scalars(select(Comment).where(Comment.id.in_(page_ids)))
+            }
+            comments = [by_id[comment_id] for comment_id in page_ids if comment_id in by_id]
+            for comment in comments:
+                comment.search_rank = scores[comment.id]
+
+        for comment in comments:
+            comment.search_snippet = highlight(comment.content, keyword)
+        return comments
+
+    def _attach_snippets(self, comments: List[Comment], query) -> None:
+        """Highlight matches in the content, only for the returned page."""
+        if not comments:
+            return
+        rows = self.db.execute(
+            select(Comment.id, headline(Comment.content, query))
+            .where(Comment.id.in_([comment.id for comment in comments]))
+        ).all()
+        snippets = {comment_id: snippet for comment_id, snippet in rows}
+        for comment in comments:
+            comment.search_snippet = render_snippet(snippets.get(comment.id))
 
     def count_search_comments(self, keyword: str) -> int:
-        pattern = f"%{keyword.strip()}%"
+        backend = get_search_backend()
+        if backend is not None:
+            # Deletes reach the index as events, so the hit count is the total.
+            return len(backend.search("comment", keyword))
+
+        match, _ = self._search_terms(keyword)
         query = select(func.count()).select_from(Comment).where(
             Comment.is_deleted == False,
-            Comment.content.ilike(pattern),
+            match,
         )
         return self.db.scalar(query)
 
     def update(self, comment: Comment) -> Comment:
-        self.db.commit()
-        self.db.refresh(comment)
+        self.db.flush()
         return comment
 
+    def adjust_like_count(self, comment_id: UUID, delta: int) -> int:
+        """Atomically shift a comment's like counter without committing."""
+        query = (
+            update(Comment)
+            .where(Comment.id == comment_id)
+            .values(like_count=Comment.like_count + delta)
+            .returning(Comment.like_count)
+            .execution_options(synchronize_session="fetch")
+        )
+        return self.db.scalar(query) or 0
+
+    def get_ancestors(self, comment: Comment) -> List[Comment]:
+        """A comment's ancestors, nearest first, looked up by their path prefixes."""
+        if not comment.path or not comment.depth:
+            return []
+        prefixes = [
+            comment.path[:PATH_SEGMENT_LENGTH * level]
+            for level in range(1, comment.depth + 1)
+        ]
+        query = (
+            select(Comment)
+            .where(Comment.thread_id == comment.thread_id, Comment.path.in_(prefixes))
+            .order_by(Comment.depth.desc())
+        )
+        return list(self.db.scalars(query))
+
+    def count_descendants(self, comment: Comment) -> int:
+        """Size of the conversation below a comment, as one range scan on its path prefix."""
+        query = select(func.count()).select_from(Comment).where(
+            Comment.thread_id == comment.thread_id,
+            Comment.path.like(f"{comment.path}%"),
+            Comment.depth > comment.depth,
+        )
+        return self.db.scalar(query) or 0
+
     def has_children(self, comment_id: UUID) -> bool:
         query = select(func.count()).select_from(Comment).where(Comment.parent_id == comment_id)
         return (self.db.scalar(query) or 0) > 0
 
     def soft_delete(self, comment: Comment):
         comment.is_deleted = True
-        self.db.commit()
-        self.db.refresh(comment)
+        self.db.flush()
         return comment
 
-    def hard_delete(self, comment: Comment):
-        self.db.delete(comment)
-        self.db.commit()
+    def delete_many(self, comment_ids: List[UUID]) -> None:
+        """Delete comments in one statement without committing; likes cascade in the database."""
+        self.db.execute(delete(Comment).where(Comment.id.in_(comment_ids)))
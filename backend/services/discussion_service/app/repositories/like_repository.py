@@ -1,7 +1,10 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select
+from typing import Iterable
 from uuid import UUID
 
+from backend.services.discussion_service.app.models.comment import Comment
 from backend.services.discussion_service.app.models.like import Like
 
 class LikeRepository:
@@ -11,13 +14,12 @@ class LikeRepository:
 
     def create(self, like: Like) -> Like:
         self.db.add(like)
-        self.db.commit()
-        self.db.refresh(like)
+        self.db.flush()
         return like
 
     def delete(self, like: Like):
         self.db.delete(like)
-        self.db.commit()
+        self.db.flush()
     
     def get_thread_like(self, user_id: UUID, thread_id: UUID):
         query = select(Like).where(
@@ -33,14 +35,6 @@ class LikeRepository:
         )
         return self.db.scalar(query)
     
-    def count_thread_likes(self, thread_id: UUID) -> int:
-        query = select(func.count()).where(Like.thread_id == thread_id)
-        return self.db.scalar(query)
-    
-    def count_comment_likes(self, comment_id: UUID) -> int:
-        query = select(func.count()).where(Like.comment_id == comment_id)
-        return self.db.scalar(query)
-    
     def is_thread_liked_by_user(self, thread_id: UUID, user_id: UUID) -> bool:
         query = select(Like).where(
             Like.thread_id == thread_id,
@@ -53,4 +47,48 @@ class LikeRepository:
             Like.comment_id == comment_id,
             Like.user_id == user_id
         )
-        return self.db.scalar(query) is not None
\ No newline at end of file
+        return self.db.scalar(query) is not None
+
+    @staticmethod
+    def _liked_thread_ids_query(thread_ids: list[UUID], user_id: UUID):
+        return select(Like.thread_id).where(
+            Like.user_id == user_id,
+            Like.thread_id.in_(thread_ids),
+        )
+
+    def get_liked_thread_ids(self, thread_ids: Iterable[UUID], user_id: UUID) -> set[UUID]:
+        thread_ids = list(thread_ids)
+        if not thread_ids:
+            return set()
+        return set(self.db.scalars(self._liked_thread_ids_query(thread_ids, user_id)))
+
+    def get_liked_comment_ids(self, comment_ids: Iterable[UUID], user_id: UUID) -> set[UUID]:
+        comment_ids = list(comment_ids)
+        if not comment_ids:
+            return set()
+        query = select(Like.comment_id).where(
+            Like.user_id == user_id,
+            Like.comment_id.in_(comment_ids),
+        )
+        return set(self.db.scalars(query))
+
+    def get_liked_comment_ids_in_thread(self, thread_id: UUID, user_id: UUID) -> set[UUID]:
+        """Ids of every comment in a thread the user has liked, in one query."""
+        query = (
+            select(Like.comment_id)
+            .join(Comment, Comment.id == Like.comment_id)
+            .where(Like.user_id == user_id, Comment.thread_id == thread_id)
+        )
+        return set(self.db.scalars(query))
+
+
+class AsyncLikeRepository:
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_liked_thread_ids(self, thread_ids: Iterable[UUID], user_id: UUID) -> set[UUID]:
+        thread_ids = list(thread_ids)
+        if not thread_ids:
+            return set()
+        return set(await self.db.scalars(LikeRepository._liked_thread_ids_query(thread_ids, user_id)))
@@ -1,6 +1,7 @@
 from uuid import UUID
+from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, tuple_
 
 from backend.services.discussion_service.app.models.thread import Thread
 from backend.services.discussion_service.app.models.thread_report import ThreadReport
@@ -20,8 +21,7 @@ class ReportRepository:
 
     def create(self, report: ThreadReport) -> ThreadReport:
         self.db.add(report)
-        self.db.commit()
-        self.db.refresh(report)
+        self.db.flush()
         return report
 
     def get_by_id(self, report_id: UUID) -> ThreadReport | None:
@@ -29,11 +29,18 @@ class ReportRepository:
         return self.db.scalar(query)
 
     def update(self, report: ThreadReport) -> ThreadReport:
-        self.db.commit()
-        self.db.refresh(report)
+        self.db.flush()
         return report
 
-    def list_reports(self, *, status: str, q: str | None, skip: int, limit: int):
+    def list_reports(
+        self,
+        *,
+        status: str,
+        q: str | None,
+        skip: int,
+        limit: int,
+        before: tuple[datetime, UUID] | None = None,
+    ):
         query = (
             select(
                 ThreadReport,
@@ -61,8 +68,14 @@ class ReportRepository:
                 )
             )
 
+        if before is not None:
+            query = query.where(
+                tuple_(ThreadReport.created_at, ThreadReport.id) < tuple_(*before)
+            )
+            skip = 0
+
         query = (
-            query.order_by(ThreadReport.created_at.desc())
+            query.order_by(ThreadReport.created_at.desc(), ThreadReport.id.desc())
             .offset(skip)
             .limit(limit)
         )
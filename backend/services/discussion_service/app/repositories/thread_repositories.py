@@ -1,9 +1,28 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, update, tuple_, false, literal_column
 from typing import List
 from uuid import UUID
+from datetime import datetime
 
+from backend.services.discussion_service.app.core.search import (
+    build_tsquery,
+    headline,
+    is_full_text_enabled,
+    render_snippet,
+    tsquery,
+)
+from backend.services.discussion_service.app.core.search_backend import (
+    filter_ranked_ids,
+    get_search_backend,
+    highlight,
+)
 from backend.services.discussion_service.app.models.thread import Thread
+from backend.shared.database.counts import estimate_row_count, estimate_row_count_async
+
+# Generated tsvector column maintained by PostgreSQL (see core.schema).
+_search_vector = literal_column("threads.search_vector")
+_VISIBLE_THREAD_IDS = select(Thread.id).where(Thread.is_deleted == False)
 
 class ThreadRepository:
     """
@@ -13,10 +32,21 @@ class ThreadRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    @staticmethod
+    def _page(query, skip: int, limit: int, before: tuple[datetime, UUID] | None):
+        """Order newest first and apply either a keyset cursor or an offset."""
+        if before is not None:
+            query = query.where(tuple_(Thread.created_at, Thread.id) < tuple_(*before))
+            skip = 0
+        return (
+            query.order_by(Thread.created_at.desc(), Thread.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+
     def create(self, thread: Thread) -> Thread:
         self.db.add(thread)
-        self.db.commit()
-        self.db.refresh(thread)
+        self.db.flush()
         return thread
     
     def get_by_id(self, thread_id: UUID) -> Thread | None:
@@ -26,25 +56,59 @@ class ThreadRepository:
         )
         return self.db.scalar(query)
     
-    def list_threads(self, skip: int, limit: int, moderation_status: str | None = None) -> List[Thread]:
+    @staticmethod
+    def _list_query(skip: int, limit: int, moderation_status: str | None, before):
         filters = [Thread.is_deleted == False]
         if moderation_status:
             filters.append(Thread.moderation_status == moderation_status)
-        query = (
-            select(Thread)
-            .where(*filters)
-            .order_by(Thread.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-        )
-        return list(self.db.scalars(query))
-    
-    def count_threads(self, moderation_status: str | None = None) -> int:
+        return ThreadRepository._page(select(Thread).where(*filters), skip, limit, before)
+
+    @staticmethod
+    def _count_query(moderation_status: str | None):
         filters = [Thread.is_deleted == False]
         if moderation_status:
             filters.append(Thread.moderation_status == moderation_status)
-        query = select(func.count()).select_from(Thread).where(*filters)
-        return self.db.scalar(query)
+        return select(func.count()).select_from(Thread).where(*filters)
+
+    def list_threads(
+        self,
+        skip: int,
+        limit: int,
+        moderation_status: str | None = None,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> List[Thread]:
+        query = self._list_query(skip, limit, moderation_status, before)
+        return list(self.db.scalars(query))
+    
+    def count_threads(self, moderation_status: str | None = None) -> int:
+        return self.db.scalar(self._count_query(moderation_status))
+
+    def _search_terms(self, keyword: str):
+        """
+        Return the match clause for a keyword and, on PostgreSQL, its tsquery.
+        Other dialects fall back to a case-insensitive substring match.
+        """
+        if not is_full_text_enabled(self.db):
+            pattern = f"%{keyword.strip()}%"
+            match = or_(
+                Thread.title.ilike(pattern),
+                Thread.description.ilike(pattern),
+            )
+            return match, None
+
+        query_text = build_tsquery(keyword)
+        if query_text is None:
+            return false(), None
+        query = tsquery(query_text)
+        return _search_vector.op("@@")(query), query
+
+    def estimate_threads(self) -> int | None:
+        """Planner estimate of visible threads (PostgreSQL only)."""
+        return estimate_row_count(self.db, _VISIBLE_THREAD_IDS)
+
+    def ranks_search(self) -> bool:
+        """Whether search_threads can order by relevance here, rather than newest first."""
+        return get_search_backend() is not None or is_full_text_enabled(self.db)
 
     def search_threads(
         self,
@@ -52,52 +116,113 @@ class ThreadRepository:
         skip: int,
         limit: int,
         moderation_status: str | None = None,
+        before: tuple[datetime, UUID] | None = None,
+        ranked: bool = True,
     ) -> List[Thread]:
-        pattern = f"%{keyword.strip()}%"
+        """
+        Search threads by keyword. With full-text search and no cursor the
+        results are ordered by relevance, otherwise newest first.
+        """
         filters = [Thread.is_deleted == False]
         if moderation_status:
             filters.append(Thread.moderation_status == moderation_status)
-        query = (
-            select(Thread)
-            .where(
-                *filters,
-                or_(
-                    Thread.title.ilike(pattern),
-                    Thread.description.ilike(pattern),
-                ),
-            )
-            .order_by(Thread.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-        )
-        return list(self.db.scalars(query))
+        backend = get_search_backend()
+        if backend is not None:
+            return self._search_with_backend(backend, keyword, filters, skip, limit, before, ranked)
+
+        match, query = self._search_terms(keyword)
+        statement = select(Thread).where(*filters, match)
+
+        if query is None or before is not None or not ranked:
+            threads = list(self.db.scalars(self._page(statement, skip, limit, before)))
+        else:
+            rank = func.ts_rank_cd(_search_vector, query)
+            rows = self.db.execute(
+                statement.add_columns(rank)
+                .order_by(rank.desc(), Thread.created_at.desc(), Thread.id.desc())
+                .offset(skip)
+                .limit(limit)
+            ).all()
+            threads = []
+            for thread, score in rows:
+                thread.search_rank = score
+                threads.append(thread)
+
+        if query is not None:
+            self._attach_snippets(threads, query)
+        return threads
+
+    def _search_with_backend(self, backend, keyword, filters, skip, limit, before, ranked):
+        """Rank with the in-process backend and load the page from the database."""
+        hits = backend.search("thread", keyword)
+        if not hits:
+            return []
+
+        scores = dict(hits)
+        if before is not None or not ranked:
+            statement = select(Thread).where(Thread.id.in_(list(scores)), *filters)
+            threads = list(self.db.scalars(self._page(statement, skip, limit, before)))
+        else:
+            ranked_ids = [thread_id for thread_id, _ in hits]
+            page_ids = filter_ranked_ids(
+                self.db,
+                Thread,
+                ranked_ids,
+                filters,
+                stop_after=skip + limit,
+            )[skip:skip + limit]
+            by_id = {
+                thread.id: thread
+                for thread in self.db.scalars(select(Thread).where(Thread.id.in_(page_ids)))
+            }
+            threads = [by_id[thread_id] for thread_id in page_ids if thread_id in by_id]
+            for thread in threads:
+                thread.search_rank = scores[thread.id]
+
+        for thread in threads:
+            thread.search_snippet = highlight(thread.description, keyword)
+        return threads
+
+    def _attach_snippets(self, threads: List[Thread], query) -> None:
+        """Highlight matches in the description, only for the returned page."""
+        if not threads:
+            return
+        rows = self.db.execute(
+            select(Thread.id, headline(Thread.description, query))
+            .where(Thread.id.in_([thread.id for thread in threads]))
+        ).all()
+        snippets = {thread_id: snippet for thread_id, snippet in rows}
+        for thread in threads:
+            thread.search_snippet = render_snippet(snippets.get(thread.id))
 
     def count_search_threads(self, keyword: str, moderation_status: str | None = None) -> int:
-        pattern = f"%{keyword.strip()}%"
         filters = [Thread.is_deleted == False]
         if moderation_status:
             filters.append(Thread.moderation_status == moderation_status)
-        query = select(func.count()).select_from(Thread).where(
-            *filters,
-            or_(
-                Thread.title.ilike(pattern),
-                Thread.description.ilike(pattern),
-            ),
-        )
+        backend = get_search_backend()
+        if backend is not None:
+            ranked_ids = [thread_id for thread_id, _ in backend.search("thread", keyword)]
+            if not moderation_status:
+                # Deletes reach the index as events, so only extra filters need the database.
+                return len(ranked_ids)
+            return len(filter_ranked_ids(self.db, Thread, ranked_ids, filters))
+
+        match, _ = self._search_terms(keyword)
+        query = select(func.count()).select_from(Thread).where(*filters, match)
         return self.db.scalar(query)
 
-    def list_threads_by_author(self, author_id: UUID, skip: int, limit: int) -> List[Thread]:
-        query = (
-            select(Thread)
-            .where(
-                Thread.is_deleted == False,
-                Thread.author_id == author_id,
-            )
-            .order_by(Thread.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+    def list_threads_by_author(
+        self,
+        author_id: UUID,
+        skip: int,
+        limit: int,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> List[Thread]:
+        query = select(Thread).where(
+            Thread.is_deleted == False,
+            Thread.author_id == author_id,
         )
-        return list(self.db.scalars(query))
+        return list(self.db.scalars(self._page(query, skip, limit, before)))
 
     def count_threads_by_author(self, author_id: UUID) -> int:
         query = select(func.count()).select_from(Thread).where(
@@ -107,10 +232,58 @@ class ThreadRepository:
         return self.db.scalar(query)
     
     def update(self, thread: Thread) -> Thread:
-        self.db.commit()
-        self.db.refresh(thread)
+        self.db.flush()
         return thread
     
+    def adjust_counters(
+        self,
+        thread_id: UUID,
+        *,
+        like_delta: int = 0,
+        comment_delta: int = 0,
+    ) -> tuple[int, int] | None:
+        """
+        Atomically shift the denormalized counters and return the new values.
+        Does not commit, so the change lands in the caller's transaction.
+        """
+        query = (
+            update(Thread)
+            .where(Thread.id == thread_id)
+            .values(
+                like_count=Thread.like_count + like_delta,
+                comment_count=Thread.comment_count + comment_delta,
+            )
+            .returning(Thread.like_count, Thread.comment_count)
+            .execution_options(synchronize_session="fetch")
+        )
+        row = self.db.execute(query).first()
+        return (row[0], row[1]) if row else None
+
     def soft_delete(self, thread: Thread) -> None:
         thread.is_deleted = True
-        self.db.commit()
\ No newline at end of file
+        self.db.flush()
+
+
+class AsyncThreadRepository:
+    """
+    Thread reads on an AsyncSession, sharing ThreadRepository's queries.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_threads(
+        self,
+        skip: int,
+        limit: int,
+        moderation_status: str | None = None,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> List[Thread]:
+        query = ThreadRepository._list_query(skip, limit, moderation_status, before)
+        return list(await self.db.scalars(query))
+
+    async def count_threads(self, moderation_status: str | None = None) -> int:
+        return await self.db.scalar(ThreadRepository._count_query(moderation_status))
+
+    async def estimate_threads(self) -> int | None:
+        return await estimate_row_count_async(self.db, _VISIBLE_THREAD_IDS)
@@ -17,3 +17,4 @@ class UserActivityListResponse(BaseModel):
     page: int
     size: int
     items: list[UserActivityRead]
+    total_is_estimate: bool = False
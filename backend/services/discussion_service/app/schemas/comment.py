@@ -30,6 +30,12 @@ class CommentRead(BaseModel):
     updated_at: datetime
     like_count: int = 0
     is_liked_by_current_user: bool = False
+    search_rank: float | None = None
+    search_snippet: str | None = None
+    # Set on paginated trees: total direct replies, and the cursor for
+    # GET /comments/{id}/replies when only some of them are inlined.
+    reply_count: int | None = None
+    replies_cursor: str | None = None
     replies: List["CommentRead"] = Field(default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
@@ -43,3 +49,13 @@ class CommentSearchResponse(BaseModel):
     page: int
     size: int
     items: List[CommentRead]
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
+
+
+class CommentTreePage(BaseModel):
+    items: List[CommentRead]
+    parent_id: UUID | None = None
+    # Replies endpoint only: size of the whole conversation under parent_id.
+    descendant_count: int | None = None
+    next_cursor: str | None = None
@@ -25,6 +25,8 @@ class ThreadReportListResponse(BaseModel):
     page: int
     size: int
     items: list[ThreadReportRead]
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
 
 
 class ThreadReportStatusUpdate(BaseModel):
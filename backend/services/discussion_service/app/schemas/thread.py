@@ -31,6 +31,8 @@ class ThreadRead(ThreadBase):
     like_count: int
     comment_count: int = 0
     is_liked_by_current_user: bool
+    search_rank: float | None = None
+    search_snippet: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -38,4 +40,6 @@ class ThreadListResponse(BaseModel):
     total: int
     page: int
     size: int
-    items: List[ThreadRead]
\ No newline at end of file
+    items: List[ThreadRead]
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
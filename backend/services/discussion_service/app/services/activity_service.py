@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from backend.services.discussion_service.app.repositories.activity_repository import (
     ActivityRepository,
 )
+from backend.shared.database.counts import count_total
 
 
 class ActivityService:
@@ -46,13 +47,19 @@ class ActivityService:
             skip=skip,
             limit=size,
         )
-        total = self.repo.count_user_activity(
-            user_id=user_id,
-            range_key=normalized,
-            type_key=normalized_type,
+        counted = count_total(
+            "activity.list",
+            lambda: self.repo.count_user_activity(
+                user_id=user_id,
+                range_key=normalized,
+                type_key=normalized_type,
+            ),
+            namespace=f"activity:{user_id}",
+            params={"range": normalized, "type": normalized_type},
         )
         return {
-            "total": total,
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
             "page": page,
             "size": size,
             "items": items,
@@ -1,14 +1,20 @@
 from sqlalchemy.orm import Session
-from uuid import UUID
+from uuid import UUID, uuid4
 from fastapi import HTTPException, status
 from sqlalchemy import select
 
-from backend.services.discussion_service.app.models.comment import Comment
+from backend.services.discussion_service.app.models.comment import MAX_COMMENT_DEPTH, Comment, child_path
 from backend.services.discussion_service.app.repositories.comment_repositories import CommentRepository
+from backend.services.discussion_service.app.repositories.thread_repositories import ThreadRepository
 from backend.services.discussion_service.app.services.thread_service import ThreadService
 from backend.services.discussion_service.app.repositories.like_repository import LikeRepository
 from backend.services.auth_service.app.models.user import User
+from backend.services.discussion_service.app.core.comment_tree import build_comment_tree, iter_tree, set_replies
+from backend.services.discussion_service.app.core.config import settings
 from backend.services.discussion_service.app.core.events import publish_event
+from backend.services.discussion_service.app.core.pagination import START_CURSOR, decode_cursor, encode_cursor, next_cursor
+from backend.shared.database.counts import count_total
+from backend.shared.database.unit_of_work import unit_of_work
 from backend.services.discussion_service.app.core.mentions import (
     extract_mentioned_usernames,
     publish_mention_events_for_usernames,
@@ -22,42 +28,36 @@ class CommentService:
         self.db = db
         self.repo = CommentRepository(db)
         self.thread_service = ThreadService(db)
-
-    def _attach_author_data_recursive(self, comment: Comment, users_by_id: dict) -> None:
-        """Recursively attach author metadata to a comment and its replies."""
-        author_id = getattr(comment, "author_id", None)
-        user = users_by_id.get(author_id)
-        if user:
-            comment.author_username = user.username
-            comment.author_name = user.full_name
-            comment.author_avatar = user.avatar_url
-        for reply in getattr(comment, "replies", []):
-            self._attach_author_data_recursive(reply, users_by_id)
+        self.thread_repo = ThreadRepository(db)
 
     def _attach_author_data_for_tree(self, root_comments: list[Comment]) -> None:
-        """Load and attach author metadata for an entire comment tree."""
+        """Load and attach author metadata for an entire comment tree in one query."""
         if not root_comments or not hasattr(self.db, "scalars"):
             return
 
-        author_ids: set[UUID] = set()
-
-        def collect_ids(comment: Comment) -> None:
-            """Collect author ids from a comment subtree."""
-            if hasattr(comment, "author_id"):
-                author_ids.add(comment.author_id)
-            for reply in getattr(comment, "replies", []):
-                collect_ids(reply)
-
-        for root in root_comments:
-            collect_ids(root)
-
+        comments = list(iter_tree(root_comments))
+        author_ids = {comment.author_id for comment in comments if hasattr(comment, "author_id")}
         if not author_ids:
             return
         users = list(self.db.scalars(select(User).where(User.id.in_(author_ids))))
         users_by_id = {user.id: user for user in users}
 
-        for root in root_comments:
-            self._attach_author_data_recursive(root, users_by_id)
+        for comment in comments:
+            user = users_by_id.get(getattr(comment, "author_id", None))
+            if user:
+                comment.author_username = user.username
+                comment.author_name = user.full_name
+                comment.author_avatar = user.avatar_url
+
+    def _set_liked_flags(self, comments: list[Comment], current_user) -> None:
+        """Mark the comments the viewer liked, with one query for the whole page."""
+        liked_ids = (
+            LikeRepository(self.db).get_liked_comment_ids([comment.id for comment in comments], current_user.id)
+            if comments and current_user
+            else set()
+        )
+        for comment in comments:
+            comment.is_liked_by_current_user = comment.id in liked_ids
 
     def create_comment(self, thread_id: UUID, content: str, author_id: UUID, parent_id: UUID | None):
         """Create a comment or reply, enrich it, and publish related events."""
@@ -78,163 +78,285 @@ class CommentService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid parent comment"
                 )
+            if getattr(parent, "depth", 0) >= MAX_COMMENT_DEPTH:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Reply nesting limit reached"
+                )
 
         comment = Comment(
+            id=uuid4(),
             content=content.strip(),
             thread_id=thread_id,
             author_id=author_id,
             parent_id=parent_id,
         )
+        parent_path = getattr(parent, "path", None)
+        if parent is None or isinstance(parent_path, str):
+            # The parent is already loaded, so skip the insert hook's lookup.
+            comment.path = child_path(parent_path, comment.id)
+            comment.depth = parent.depth + 1 if parent is not None else 0
 
-        created_comment = self.repo.create(comment)
+        # The thread's comment counter and the outbox events commit with the new row.
+        with unit_of_work(self.db):
+            self.thread_repo.adjust_counters(thread_id, comment_delta=1)
+            created_comment = self.repo.create(comment)
 
-        created_comment.like_count = 0
-        created_comment.is_liked_by_current_user = False
-        if hasattr(self.db, "scalar") and hasattr(created_comment, "author_id"):
-            user = self.db.scalar(select(User).where(User.id == created_comment.author_id))
-            if user:
-                created_comment.author_username = user.username
-                created_comment.author_name = user.full_name
-                created_comment.author_avatar = user.avatar_url
-
-        publish_event(
-            channel="thread_updates",
-            thread_id=str(thread_id),
-            actor_id=str(author_id),
-            event="comment.created",
-            payload={
-                "id": str(created_comment.id),
-                "content": created_comment.content,
-                "author_id": str(created_comment.author_id),
-                "parent_id": str(created_comment.parent_id) if created_comment.parent_id else None,
-                "like_count": 0
-            }
-        )
-
-        # Notify thread owner when someone adds a top-level comment.
-        if not parent and thread.author_id != author_id:
             publish_event(
-                channel="discussion_events",
+                channel="thread_updates",
                 thread_id=str(thread_id),
                 actor_id=str(author_id),
-                event="thread.commented",
+                event="comment.created",
                 payload={
-                    "owner_id": str(thread.author_id),
-                    "comment_id": str(created_comment.id),
-                    "preview": created_comment.content[:200],
+                    "id": str(created_comment.id),
+                    "content": created_comment.content,
+                    "author_id": str(created_comment.author_id),
+                    "parent_id": str(created_comment.parent_id) if created_comment.parent_id else None,
+                    "like_count": 0
                 },
+                db=self.db,
             )
 
-        if parent and parent.author_id != author_id:
-            publish_event(
-                channel="discussion_events",
-                thread_id=str(thread_id),
-                actor_id=str(author_id),
-                event="comment.replied",
-                payload={
-                    "receiver_id": str(parent.author_id),
-                    "comment_id": str(created_comment.id),
-                    "parent_id": str(parent.id),
-                    "preview": created_comment.content[:200],
-                },
-            )
+            # Notify thread owner when someone adds a top-level comment.
+            if not parent and thread.author_id != author_id:
+                publish_event(
+                    channel="discussion_events",
+                    thread_id=str(thread_id),
+                    actor_id=str(author_id),
+                    event="thread.commented",
+                    payload={
+                        "owner_id": str(thread.author_id),
+                        "comment_id": str(created_comment.id),
+                        "preview": created_comment.content[:200],
+                    },
+                    db=self.db,
+                )
 
-        publish_mention_events_for_usernames(
-            self.db,
-            usernames=extract_mentioned_usernames(created_comment.content),
-            actor_id=author_id,
-            thread_id=thread_id,
-            source_type="comment",
-            source_id=created_comment.id,
-            preview=created_comment.content,
-        )
+            if parent and parent.author_id != author_id:
+                publish_event(
+                    channel="discussion_events",
+                    thread_id=str(thread_id),
+                    actor_id=str(author_id),
+                    event="comment.replied",
+                    payload={
+                        "receiver_id": str(parent.author_id),
+                        "comment_id": str(created_comment.id),
+                        "parent_id": str(parent.id),
+                        "preview": created_comment.content[:200],
+                    },
+                    db=self.db,
+                )
+
+            publish_mention_events_for_usernames(
+                self.db,
+                usernames=extract_mentioned_usernames(created_comment.content),
+                actor_id=author_id,
+                thread_id=thread_id,
+                source_type="comment",
+                source_id=created_comment.id,
+                preview=created_comment.content,
+            )
 
+        created_comment.is_liked_by_current_user = False
+        if hasattr(self.db, "scalar") and hasattr(created_comment, "author_id"):
+            user = self.db.scalar(select(User).where(User.id == created_comment.author_id))
+            if user:
+                created_comment.author_username = user.username
+                created_comment.author_name = user.full_name
+                created_comment.author_avatar = user.avatar_url
 
         return created_comment
     
-    def _attach_like_data_recursive(self, comment, like_repo, current_user):
-        """Recursively attach like metadata for a comment tree node."""
-        comment.like_count = like_repo.count_comment_likes(comment.id)
-        comment.is_liked_by_current_user = like_repo.is_comment_liked_by_user(
-            comment.id,
-            current_user.id
-        )
-
-        for reply in comment.replies:
-            self._attach_like_data_recursive(reply, like_repo, current_user)
-
-
     def get_thread_comments(self, thread_id: UUID, current_user):
-        """Return comments for a thread as a nested tree with metadata."""
-        comments = self.repo.get_thread_comments(thread_id)
-        like_repo = LikeRepository(self.db)
+        """
+        Return comments for a thread as a nested tree with metadata.
 
+        The query count is fixed regardless of thread size: the comments,
+        the viewer's liked ids and the authors. Like counts come from the
+        denormalized comments.like_count column.
+        """
+        comments = self.repo.get_thread_comments(thread_id)
+        liked_ids = (
+            LikeRepository(self.db).get_liked_comment_ids_in_thread(thread_id, current_user.id)
+            if comments and current_user
+            else set()
+        )
         for comment in comments:
-            comment.replies = []
+            comment.is_liked_by_current_user = comment.id in liked_ids
 
-        
-        comment_map = {comment.id: comment for comment in comments}
-        tree = []
+        tree = build_comment_tree(comments, max_depth=settings.comment_tree_max_depth)
+        self._attach_author_data_for_tree(tree)
+        return tree
 
-        for comment in comments:
-            if comment.parent_id:
-                parent = comment_map.get(comment.parent_id)
-                if parent:
-                    parent.replies.append(comment)
+    def _expand_replies(self, comments: list[Comment], depth: int, breadth: int) -> None:
+        """
+        Inline up to `breadth` replies per comment for `depth` levels, one
+        query per level. Every node gets reply_count, and replies_cursor
+        when some of its replies were left out: the position after the last
+        inlined reply, or START_CURSOR when depth ran out before any were.
+        """
+        level = comments
+        for current_depth in range(depth + 1):
+            if not level:
+                return
+            parent_ids = [comment.id for comment in level]
+            replies_by_parent: dict[UUID, list[Comment]] = {}
+            if current_depth < depth:
+                counts = {}
+                for reply, sibling_count in self.repo.list_first_replies(parent_ids, breadth):
+                    replies_by_parent.setdefault(reply.parent_id, []).append(reply)
+                    counts[reply.parent_id] = sibling_count
             else:
-                tree.append(comment)
-
-        
-        for root_comment in tree:
-            self._attach_like_data_recursive(root_comment, like_repo, current_user)
-        self._attach_author_data_for_tree(tree)
+                counts = self.repo.count_replies(parent_ids)
+
+            next_level = []
+            for comment in level:
+                replies = replies_by_parent.get(comment.id, [])
+                set_replies(comment, replies)
+                comment.reply_count = counts.get(comment.id, 0)
+                if comment.reply_count <= len(replies):
+                    comment.replies_cursor = None
+                elif replies:
+                    comment.replies_cursor = encode_cursor(replies[-1].created_at, replies[-1].id)
+                else:
+                    comment.replies_cursor = START_CURSOR
+                next_level.extend(replies)
+            level = next_level
+
+    def _comment_page(
+        self,
+        thread_id: UUID,
+        parent_id: UUID | None,
+        current_user,
+        cursor: str | None,
+        size: int | None,
+        depth: int | None,
+        breadth: int | None,
+    ) -> dict:
+        size = size or settings.comment_page_size
+        depth = settings.comment_reply_depth if depth is None else depth
+        breadth = breadth or settings.comment_reply_breadth
+        after = decode_cursor(cursor) if cursor and cursor != START_CURSOR else None
+
+        comments = self.repo.list_child_comments(thread_id, parent_id, size, after=after)
+        self._expand_replies(comments, depth, breadth)
+
+        nodes = list(iter_tree(comments))
+        liked_ids = (
+            LikeRepository(self.db).get_liked_comment_ids([node.id for node in nodes], current_user.id)
+            if nodes and current_user
+            else set()
+        )
+        for node in nodes:
+            node.is_liked_by_current_user = node.id in liked_ids
+        self._attach_author_data_for_tree(comments)
 
-        return tree
+        return {
+            "items": comments,
+            "parent_id": parent_id,
+            "next_cursor": next_cursor(comments, size),
+        }
 
-    def search_comments(self, keyword: str, page: int, size: int, current_user):
-        """Search comments by keyword and return paginated enriched results."""
+    def get_thread_comment_page(
+        self,
+        thread_id: UUID,
+        current_user,
+        cursor: str | None = None,
+        size: int | None = None,
+        depth: int | None = None,
+        breadth: int | None = None,
+    ) -> dict:
+        """
+        Return one oldest-first page of a thread's top-level comments with
+        the first replies of each inlined up to `depth` levels and `breadth`
+        replies per comment.
+        """
+        return self._comment_page(thread_id, None, current_user, cursor, size, depth, breadth)
+
+    def get_comment_replies(
+        self,
+        parent_id: UUID,
+        current_user,
+        cursor: str | None = None,
+        size: int | None = None,
+        depth: int | None = None,
+        breadth: int | None = None,
+    ) -> dict:
+        """Return a page of a comment's replies, expanded like get_thread_comment_page."""
+        parent = self.repo.get_by_id(parent_id)
+        if not parent:
+            raise HTTPException(status_code=404, detail="Comment not found")
+        page = self._comment_page(parent.thread_id, parent.id, current_user, cursor, size, depth, breadth)
+        if parent.path:
+            page["descendant_count"] = self.repo.count_descendants(parent)
+        return page
+
+    def search_comments(
+        self,
+        keyword: str,
+        page: int,
+        size: int,
+        current_user,
+        cursor: str | None = None,
+        sort: str = "relevance",
+    ):
+        """
+        Search comments by keyword and return paginated enriched results.
+
+        Relevance-ordered pages are reached by page number; a cursor (or
+        sort="recent") switches to newest-first keyset pagination.
+        """
         skip = (page - 1) * size
-        comments = self.repo.search_comments(keyword, skip, size)
-        total = self.repo.count_search_comments(keyword)
-        like_repo = LikeRepository(self.db)
-
+        page_filters = {}
+        if cursor:
+            page_filters["before"] = decode_cursor(cursor)
+        elif sort == "recent":
+            page_filters["ranked"] = False
+        ranked = sort == "relevance" and not cursor and self.repo.ranks_search()
+        comments = self.repo.search_comments(keyword, skip, size, **page_filters)
+        counted = count_total(
+            "comments.search",
+            lambda: self.repo.count_search_comments(keyword),
+            namespace="comments",
+            params={"q": keyword.strip().lower()},
+        )
         for comment in comments:
-            comment.replies = []
-            comment.like_count = like_repo.count_comment_likes(comment.id)
-            comment.is_liked_by_current_user = like_repo.is_comment_liked_by_user(
-                comment.id,
-                current_user.id,
-            ) if current_user else False
+            set_replies(comment, [])
+        self._set_liked_flags(comments, current_user)
         self._attach_author_data_for_tree(comments)
 
         return {
-            "total": total,
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
             "page": page,
             "size": size,
             "items": comments,
+            "next_cursor": None if ranked else next_cursor(comments, size),
         }
 
-    def list_comments(self, page: int, size: int, current_user):
+    def list_comments(self, page: int, size: int, current_user, cursor: str | None = None):
         """Return paginated comments with author and like metadata."""
         skip = (page - 1) * size
-        comments = self.repo.list_comments(skip, size)
-        total = self.repo.count_comments()
-        like_repo = LikeRepository(self.db)
-
+        page_filters = {"before": decode_cursor(cursor)} if cursor else {}
+        comments = self.repo.list_comments(skip, size, **page_filters)
+        counted = count_total(
+            "comments.list",
+            self.repo.count_comments,
+            namespace="comments",
+            estimate=lambda: self.repo.estimate_comments(),
+        )
         for comment in comments:
-            comment.replies = []
-            comment.like_count = like_repo.count_comment_likes(comment.id)
-            comment.is_liked_by_current_user = like_repo.is_comment_liked_by_user(
-                comment.id,
-                current_user.id,
-            ) if current_user else False
+            set_replies(comment, [])
+        self._set_liked_flags(comments, current_user)
         self._attach_author_data_for_tree(comments)
 
         return {
-            "total": total,
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
             "page": page,
             "size": size,
             "items": comments,
+            "next_cursor": next_cursor(comments, size),
         }
 
 
@@ -256,12 +378,37 @@ class CommentService:
 
         previous_mentions = extract_mentioned_usernames(comment.content)
         comment.content = content.strip()
-        updated_comment = self.repo.update(comment)
-        updated_comment.like_count = 0
+        with unit_of_work(self.db):
+            updated_comment = self.repo.update(comment)
+
+            publish_event(
+                channel="thread_updates",
+                thread_id=str(comment.thread_id),
+                actor_id=str(current_user.id),
+                event="comment.updated",
+                payload={
+                    "id": str(comment.id),
+                    "content": comment.content
+                },
+                db=self.db,
+            )
+
+            updated_mentions = extract_mentioned_usernames(updated_comment.content)
+            newly_added_mentions = updated_mentions - previous_mentions
+
+            publish_mention_events_for_usernames(
+                self.db,
+                usernames=newly_added_mentions,
+                actor_id=current_user.id,
+                thread_id=comment.thread_id,
+                source_type="comment",
+                source_id=comment.id,
+                preview=updated_comment.content,
+            )
+
         updated_comment.is_liked_by_current_user = False
         if hasattr(self.db, "scalar"):
             like_repo = LikeRepository(self.db)
-            updated_comment.like_count = like_repo.count_comment_likes(updated_comment.id)
             updated_comment.is_liked_by_current_user = like_repo.is_comment_liked_by_user(
                 updated_comment.id,
                 current_user.id,
@@ -269,29 +416,6 @@ class CommentService:
         if getattr(updated_comment, "replies", None) is None:
             updated_comment.replies = []
 
-        publish_event(
-            channel="thread_updates",
-            thread_id=str(comment.thread_id),
-            actor_id=str(current_user.id),
-            event="comment.updated",
-            payload={
-                "id": str(comment.id),
-                "content": comment.content
-            }
-        )
-
-        updated_mentions = extract_mentioned_usernames(updated_comment.content)
-        newly_added_mentions = updated_mentions - previous_mentions
-
-        publish_mention_events_for_usernames(
-            self.db,
-            usernames=newly_added_mentions,
-            actor_id=current_user.id,
-            thread_id=comment.thread_id,
-            source_type="comment",
-            source_id=comment.id,
-            preview=updated_comment.content,
-        )
         if hasattr(self.db, "scalar") and hasattr(updated_comment, "author_id"):
             user = self.db.scalar(select(User).where(User.id == updated_comment.author_id))
             if user:
@@ -301,6 +425,37 @@ class CommentService:
 
         return updated_comment
 
+    def _walk_ancestors(self, parent_id: UUID | None):
+        """Yield ancestors one lookup at a time, for rows without a path."""
+        while parent_id:
+            parent = self.repo.get_by_id(parent_id)
+            if not parent:
+                return
+            yield parent
+            parent_id = parent.parent_id
+
+    def _prunable_ancestors(self, comment: Comment) -> list[Comment]:
+        """
+        Placeholder ancestors left without replies once the leaf `comment` is
+        removed, nearest first. With a materialized path the whole chain and
+        its reply counts take two queries.
+        """
+        if comment.path:
+            ancestors = self.repo.get_ancestors(comment)
+            reply_counts = self.repo.count_replies([ancestor.id for ancestor in ancestors])
+        else:
+            ancestors = self._walk_ancestors(comment.parent_id)
+            reply_counts = None
+
+        prunable = []
+        for ancestor in ancestors:
+            counts = reply_counts if reply_counts is not None else self.repo.count_replies([ancestor.id])
+            # The only remaining reply is the one being removed below it.
+            if not ancestor.is_deleted or counts.get(ancestor.id, 0) > 1:
+                break
+            prunable.append(ancestor)
+        return prunable
+
     def delete_comment(self, comment_id: UUID, current_user):
         """Delete or anonymize a comment depending on reply children and permissions."""
         comment = self.repo.get_by_id(comment_id)
@@ -327,42 +482,39 @@ class CommentService:
                 return self.repo.has_children(target_comment.id)
             return bool(getattr(target_comment, "replies", []))
 
-        # If comment has replies, keep it in tree but anonymize content.
-        if has_children(comment):
-            comment.is_deleted = True
-            comment.content = self.DELETED_PLACEHOLDER
-            deleted_comment = self.repo.update(comment)
-        else:
-            # Leaf comments should disappear from UI.
-            if hasattr(self.repo, "hard_delete"):
-                parent_id = comment.parent_id
-                self.repo.hard_delete(comment)
+        removed_ids = []
+        with unit_of_work(self.db):
+            # Placeholders were already taken off the thread's comment counter.
+            if not comment.is_deleted:
+                self.thread_repo.adjust_counters(comment.thread_id, comment_delta=-1)
+
+            # If comment has replies, keep it in tree but anonymize content.
+            if has_children(comment):
+                comment.is_deleted = True
+                comment.content = self.DELETED_PLACEHOLDER
+                deleted_comment = self.repo.update(comment)
+            elif hasattr(self.repo, "delete_many"):
+                # Leaf comments disappear from the UI, together with any placeholder
+                # ancestors they leave childless, in the same transaction as the
+                # counter update.
+                removed = [comment, *self._prunable_ancestors(comment)]
+                removed_ids = [str(item.id) for item in removed]
+                self.repo.delete_many([item.id for item in removed])
                 deleted_comment = comment
-
-                # Cleanup chain: if parent is already soft-deleted and now has no children,
-                # remove it as well so only meaningful placeholders remain.
-                while parent_id:
-                    parent = self.repo.get_by_id(parent_id)
-                    if not parent:
-                        break
-                    next_parent_id = parent.parent_id
-                    if parent.is_deleted and not has_children(parent):
-                        self.repo.hard_delete(parent)
-                    else:
-                        break
-                    parent_id = next_parent_id
             else:
-                # Backward compatibility for tests/mocks that do not implement hard_delete.
+                # Backward compatibility for tests/mocks that do not implement delete_many.
                 deleted_comment = self.repo.soft_delete(comment)
 
-        publish_event(
-            channel="thread_updates",
-            thread_id=str(comment.thread_id),
-            actor_id=str(current_user.id),
-            event="comment.deleted",
-            payload={
-                "id": str(comment.id)
-            }
-        )
+            publish_event(
+                channel="thread_updates",
+                thread_id=str(comment.thread_id),
+                actor_id=str(current_user.id),
+                event="comment.deleted",
+                payload={
+                    "id": str(comment.id),
+                    "removed_ids": removed_ids,
+                },
+                db=self.db,
+            )
 
         return deleted_comment
@@ -8,8 +8,11 @@ from backend.services.discussion_service.app.models.like import Like
 from backend.services.discussion_service.app.repositories.like_repository import LikeRepository
 from backend.services.discussion_service.app.services.thread_service import ThreadService
 from backend.services.discussion_service.app.repositories.comment_repositories import CommentRepository
+from backend.services.discussion_service.app.repositories.thread_repositories import ThreadRepository
 from backend.services.discussion_service.app.core.events import publish_event
 from backend.services.auth_service.app.models.user import User
+from backend.shared.database.unit_of_work import unit_of_work
+from backend.shared.tracing.tracer import traced
 
 class LikeService:
 
@@ -19,6 +22,7 @@ class LikeService:
         self.repo = LikeRepository(db)
         self.thread_service = ThreadService(db)
         self.comment_repo = CommentRepository(db)
+        self.thread_repo = ThreadRepository(db)
 
     def list_thread_likers(self, thread_id: UUID):
         """List users who liked a thread in reverse chronological order."""
@@ -46,6 +50,7 @@ class LikeService:
             ]
         }
 
+    @traced("LikeService.toggle_thread_like")
     def toggle_thread_like(self, thread_id: UUID, user_id: UUID):
         """Add or remove the current user's like on a thread and publish events."""
 
@@ -53,19 +58,22 @@ class LikeService:
         existing = self.repo.get_thread_like(user_id, thread_id)
 
         if existing:
-            self.repo.delete(existing)
-            count = self.repo.count_thread_likes(thread_id)
-
-            publish_event(
-                channel="thread_updates",
-                thread_id=str(thread_id),
-                actor_id=str(user_id),
-                event="thread.like.updated",
-                payload={
-                    "thread_id": str(thread_id),
-                    "like_count": count
-                }
-            )
+            # Counter update rides on the delete's commit.
+            with unit_of_work(self.db):
+                count, _ = self.thread_repo.adjust_counters(thread_id, like_delta=-1)
+                self.repo.delete(existing)
+
+                publish_event(
+                    channel="thread_updates",
+                    thread_id=str(thread_id),
+                    actor_id=str(user_id),
+                    event="thread.like.updated",
+                    payload={
+                        "thread_id": str(thread_id),
+                        "like_count": count
+                    },
+                    db=self.db,
+                )
 
             return {
                 "liked": False,
@@ -75,30 +83,32 @@ class LikeService:
         
         try:
             like = Like(user_id=user_id, thread_id=thread_id)
-            self.repo.create(like)
-            count = self.repo.count_thread_likes(thread_id)
-
-            publish_event(
-                channel="thread_updates",
-                thread_id=str(thread_id),
-                actor_id=str(user_id),
-                event="thread.like.updated",
-                payload={
-                    "thread_id": str(thread_id),
-                    "like_count": count
-                }
-            )
-
-            publish_event(
-                channel="discussion_events",
-                event="thread.liked",
-                thread_id=str(thread_id),
-                actor_id=str(user_id),
-                payload={
-                    "owner_id": str(thread.author_id)
-                }
-            )
-
+            with unit_of_work(self.db):
+                count, _ = self.thread_repo.adjust_counters(thread_id, like_delta=1)
+                self.repo.create(like)
+
+                publish_event(
+                    channel="thread_updates",
+                    thread_id=str(thread_id),
+                    actor_id=str(user_id),
+                    event="thread.like.updated",
+                    payload={
+                        "thread_id": str(thread_id),
+                        "like_count": count
+                    },
+                    db=self.db,
+                )
+
+                publish_event(
+                    channel="discussion_events",
+                    event="thread.liked",
+                    thread_id=str(thread_id),
+                    actor_id=str(user_id),
+                    payload={
+                        "owner_id": str(thread.author_id)
+                    },
+                    db=self.db,
+                )
 
             return {
                 "liked": True,
@@ -106,11 +116,13 @@ class LikeService:
                 }
         
         except IntegrityError:
+            # unit_of_work rolled back the counter increment with the duplicate like.
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Already liked",
             )
         
+    @traced("LikeService.toggle_comment_like")
     def toggle_comment_like(self, comment_id: UUID, user_id: UUID):
         """Add or remove the current user's like on a comment and publish events."""
         comment = self.comment_repo.get_by_id(comment_id)
@@ -120,19 +132,21 @@ class LikeService:
         existing = self.repo.get_comment_like(user_id, comment_id)
 
         if existing:
-            self.repo.delete(existing)
-            count = self.repo.count_comment_likes(comment_id)
-
-            publish_event(
-                channel="thread_updates",
-                thread_id=str(comment.thread_id),
-                actor_id=str(user_id),
-                event="comment.like.updated",
-                payload={
-                    "comment_id": str(comment_id),
-                    "like_count": count
-                }
-            )
+            with unit_of_work(self.db):
+                count = self.comment_repo.adjust_like_count(comment_id, -1)
+                self.repo.delete(existing)
+
+                publish_event(
+                    channel="thread_updates",
+                    thread_id=str(comment.thread_id),
+                    actor_id=str(user_id),
+                    event="comment.like.updated",
+                    payload={
+                        "comment_id": str(comment_id),
+                        "like_count": count
+                    },
+                    db=self.db,
+                )
 
             return {
                 "liked": False,
@@ -142,30 +156,33 @@ class LikeService:
 
         try:
             like = Like(user_id=user_id, comment_id=comment_id)
-            self.repo.create(like)
-            count = self.repo.count_comment_likes(comment_id)
-
-            publish_event(
-                channel="thread_updates",
-                thread_id=str(comment.thread_id),
-                actor_id=str(user_id),
-                event="comment.like.updated",
-                payload={
-                    "comment_id": str(comment_id),
-                    "like_count": count
-                }
-            )
-
-            publish_event(
-                channel="discussion_events",
-                event="comment.liked",
-                thread_id=str(comment.thread_id),
-                actor_id=str(user_id),
-                payload={
-                    "owner_id": str(comment.author_id),
-                    "comment_id": str(comment_id),
-                },
-            )
+            with unit_of_work(self.db):
+                count = self.comment_repo.adjust_like_count(comment_id, 1)
+                self.repo.create(like)
+
+                publish_event(
+                    channel="thread_updates",
+                    thread_id=str(comment.thread_id),
+                    actor_id=str(user_id),
+                    event="comment.like.updated",
+                    payload={
+                        "comment_id": str(comment_id),
+                        "like_count": count
+                    },
+                    db=self.db,
+                )
+
+                publish_event(
+                    channel="discussion_events",
+                    event="comment.liked",
+                    thread_id=str(comment.thread_id),
+                    actor_id=str(user_id),
+                    payload={
+                        "owner_id": str(comment.author_id),
+                        "comment_id": str(comment_id),
+                    },
+                    db=self.db,
+                )
 
             return {
                 "liked": True,
@@ -173,6 +190,7 @@ class LikeService:
                 }
         
         except IntegrityError:
+            # unit_of_work rolled back the counter increment with the duplicate like.
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Already liked",
@@ -2,9 +2,12 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from backend.services.discussion_service.app.core.pagination import decode_cursor, next_cursor
 from backend.services.discussion_service.app.models.thread_report import ThreadReport
 from backend.services.discussion_service.app.repositories.report_repository import ReportRepository
 from backend.services.discussion_service.app.services.thread_service import ThreadService
+from backend.shared.database.counts import count_total, invalidate_counts
+from backend.shared.database.unit_of_work import unit_of_work
 
 
 class ReportService:
@@ -38,12 +41,23 @@ class ReportService:
             reason=(reason or "").strip() or None,
             status="reported",
         )
-        created = self.repo.create(report)
-        # Reported threads should surface in moderation "Reported".
-        self.thread_service.update_moderation_status(thread_id, "reported")
+        # The report and the thread's moderation status commit together.
+        with unit_of_work(self.db):
+            created = self.repo.create(report)
+            # Reported threads should surface in moderation "Reported".
+            self.thread_service.update_moderation_status(thread_id, "reported")
+        invalidate_counts("reports")
         return created
 
-    def list_reports(self, *, status_filter: str, q: str | None, page: int, size: int):
+    def list_reports(
+        self,
+        *,
+        status_filter: str,
+        q: str | None,
+        page: int,
+        size: int,
+        cursor: str | None = None,
+    ):
         """Return paginated reports filtered by status and optional query."""
         status_value = (status_filter or "reported").strip().lower()
         if status_value not in self.VALID_STATUSES:
@@ -53,8 +67,14 @@ class ReportService:
             )
 
         skip = (page - 1) * size
-        rows = self.repo.list_reports(status=status_value, q=q, skip=skip, limit=size)
-        total = self.repo.count_reports(status=status_value, q=q)
+        page_filters = {"before": decode_cursor(cursor)} if cursor else {}
+        rows = self.repo.list_reports(status=status_value, q=q, skip=skip, limit=size, **page_filters)
+        counted = count_total(
+            "reports.list",
+            lambda: self.repo.count_reports(status=status_value, q=q),
+            namespace="reports",
+            params={"status": status_value, "q": (q or "").strip().lower()},
+        )
 
         items = [
             {
@@ -73,10 +93,12 @@ class ReportService:
         ]
 
         return {
-            "total": total,
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
             "page": page,
             "size": size,
             "items": items,
+            "next_cursor": next_cursor([row[0] for row in rows], size),
         }
 
     def update_report_status(self, report_id: UUID, status_value: str):
@@ -96,4 +118,7 @@ class ReportService:
             )
 
         report.status = status_value
-        return self.repo.update(report)
+        with unit_of_work(self.db):
+            updated = self.repo.update(report)
+        invalidate_counts("reports")
+        return updated
@@ -1,13 +1,24 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
 from fastapi import HTTPException, status
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from backend.services.discussion_service.app.models.thread import Thread
-from backend.services.discussion_service.app.models.comment import Comment
-from backend.services.discussion_service.app.repositories.thread_repositories import ThreadRepository
-from backend.services.discussion_service.app.repositories.like_repository import LikeRepository
+from backend.services.discussion_service.app.repositories.thread_repositories import (
+    AsyncThreadRepository,
+    ThreadRepository,
+)
+from backend.services.discussion_service.app.repositories.like_repository import (
+    AsyncLikeRepository,
+    LikeRepository,
+)
 from backend.services.discussion_service.app.core.events import publish_event
+from backend.services.discussion_service.app.core.pagination import decode_cursor, next_cursor
+from backend.services.discussion_service.app.core.thread_cache import thread_cache
+from backend.services.discussion_service.app.schemas.thread import ThreadRead
+from backend.shared.database.counts import count_total, count_total_async, invalidate_counts
+from backend.shared.database.unit_of_work import on_commit, unit_of_work
 from backend.services.auth_service.app.models.user import User
 from backend.services.discussion_service.app.core.mentions import (
     extract_mentioned_usernames,
@@ -15,6 +26,17 @@ from backend.services.discussion_service.app.core.mentions import (
 )
 
 
+def _apply_author_data(threads: list[Thread], users: list[User]) -> None:
+    users_by_id = {user.id: user for user in users}
+    for thread in threads:
+        author_id = getattr(thread, "author_id", None)
+        user = users_by_id.get(author_id)
+        if user:
+            thread.author_username = user.username
+            thread.author_name = user.full_name
+            thread.author_avatar = user.avatar_url
+
+
 class ThreadService:
     """
     Handles business logic related to threads.
@@ -43,50 +65,23 @@ class ThreadService:
         if not author_ids:
             return
         users = list(self.db.scalars(select(User).where(User.id.in_(author_ids))))
-        users_by_id = {user.id: user for user in users}
-        for thread in threads:
-            author_id = getattr(thread, "author_id", None)
-            user = users_by_id.get(author_id)
-            if user:
-                thread.author_username = user.username
-                thread.author_name = user.full_name
-                thread.author_avatar = user.avatar_url
-
-    def _attach_comment_count(self, thread: Thread) -> None:
-        """Attach the non-deleted comment count to a single thread."""
-        if not hasattr(self.db, "scalar") or not hasattr(thread, "id"):
-            return
-        thread.comment_count = (
-            self.db.scalar(
-                select(func.count()).where(
-                    Comment.thread_id == thread.id,
-                    Comment.is_deleted == False,
-                )
-            )
-            or 0
-        )
+        _apply_author_data(threads, users)
 
-    def _attach_comment_counts_for_threads(self, threads: list[Thread]) -> None:
-        """Attach non-deleted comment counts for each thread in a list."""
-        if not threads or not hasattr(self.db, "execute"):
-            return
-        thread_ids = [thread.id for thread in threads if hasattr(thread, "id")]
-        if not thread_ids:
+    def _attach_like_data_for_threads(self, threads: list[Thread], current_user) -> None:
+        """Attach the viewer's like flag for a list of threads with one IN query."""
+        if not threads:
             return
 
-        rows = list(
-            self.db.execute(
-                select(Comment.thread_id, func.count(Comment.id))
-                .where(
-                    Comment.thread_id.in_(thread_ids),
-                    Comment.is_deleted == False,
-                )
-                .group_by(Comment.thread_id)
-            ).all()
+        liked_ids = (
+            LikeRepository(self.db).get_liked_thread_ids(
+                [thread.id for thread in threads],
+                current_user.id,
+            )
+            if current_user
+            else set()
         )
-        count_map = {thread_id: count for thread_id, count in rows}
         for thread in threads:
-            thread.comment_count = int(count_map.get(thread.id, 0))
+            thread.is_liked_by_current_user = thread.id in liked_ids
 
 
     def create_thread(
@@ -104,36 +99,38 @@ class ThreadService:
             author_id=author_id,
         )
 
-        created_thread = self.thread_repo.create(thread)
+        # Events go to the outbox in the thread's transaction.
+        with unit_of_work(self.db):
+            created_thread = self.thread_repo.create(thread)
+
+            publish_event(
+                channel="thread_updates",
+                thread_id=str(created_thread.id),
+                actor_id=str(author_id),
+                event="thread.created",
+                payload={
+                    "id": str(created_thread.id),
+                    "title": created_thread.title,
+                    "description": created_thread.description,
+                    "image_url": created_thread.image_url,
+                },
+                db=self.db,
+            )
+
+            thread_text = f"{created_thread.title}\n{created_thread.description}"
+            publish_mention_events_for_usernames(
+                self.db,
+                usernames=extract_mentioned_usernames(thread_text),
+                actor_id=author_id,
+                thread_id=created_thread.id,
+                source_type="thread",
+                source_id=created_thread.id,
+                preview=thread_text,
+            )
 
-        created_thread.like_count = 0
-        created_thread.comment_count = 0
         created_thread.is_liked_by_current_user = False
         self._attach_author_data(created_thread)
 
-        publish_event(
-            channel="thread_updates",
-            thread_id=str(created_thread.id),
-            actor_id=str(author_id),
-            event="thread.created",
-            payload={
-                "id": str(created_thread.id),
-                "title": created_thread.title,
-                "image_url": created_thread.image_url,
-            },
-        )
-
-        thread_text = f"{created_thread.title}\n{created_thread.description}"
-        publish_mention_events_for_usernames(
-            self.db,
-            usernames=extract_mentioned_usernames(thread_text),
-            actor_id=author_id,
-            thread_id=created_thread.id,
-            source_type="thread",
-            source_id=created_thread.id,
-            preview=thread_text,
-        )
-
         return created_thread
 
 
@@ -149,8 +146,6 @@ class ThreadService:
 
         like_repo = LikeRepository(self.db)
 
-        thread.like_count = like_repo.count_thread_likes(thread_id)
-        self._attach_comment_count(thread)
         thread.is_liked_by_current_user = (
             like_repo.is_thread_liked_by_user(thread_id, current_user.id)
             if current_user
@@ -160,6 +155,34 @@ class ThreadService:
 
         return thread
 
+    def _build_thread_detail(self, thread_id: UUID) -> dict:
+        """Serialize the viewer-independent part of a thread for caching."""
+        thread = self.thread_repo.get_by_id(thread_id)
+        if not thread:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Thread not found",
+            )
+        self._attach_author_data(thread)
+        thread.is_liked_by_current_user = False
+        return ThreadRead.model_validate(thread).model_dump(
+            mode="json",
+            exclude={"is_liked_by_current_user", "search_rank", "search_snippet"},
+        )
+
+    def get_thread_detail(self, thread_id: UUID, current_user=None) -> dict:
+        """
+        Return thread detail for display, served from the shared cache with
+        the viewer's like flag overlaid.
+        """
+        detail = dict(thread_cache.get_or_build(thread_id, lambda: self._build_thread_detail(thread_id)))
+        detail["is_liked_by_current_user"] = (
+            LikeRepository(self.db).is_thread_liked_by_user(thread_id, current_user.id)
+            if current_user
+            else False
+        )
+        return detail
+
 
     def list_threads(
         self,
@@ -167,33 +190,36 @@ class ThreadService:
         size: int,
         current_user,
         moderation_status: str | None = None,
+        cursor: str | None = None,
     ):
         """Return a paginated list of threads with engagement and author data."""
         skip = (page - 1) * size
-        if moderation_status is None:
-            threads = self.thread_repo.list_threads(skip, size)
-            total = self.thread_repo.count_threads()
-        else:
-            threads = self.thread_repo.list_threads(skip, size, moderation_status=moderation_status)
-            total = self.thread_repo.count_threads(moderation_status=moderation_status)
-
-        like_repo = LikeRepository(self.db)
+        filters = {}
+        if moderation_status is not None:
+            filters["moderation_status"] = moderation_status
+        page_filters = dict(filters)
+        if cursor:
+            page_filters["before"] = decode_cursor(cursor)
+
+        threads = self.thread_repo.list_threads(skip, size, **page_filters)
+        counted = count_total(
+            "threads.list",
+            lambda: self.thread_repo.count_threads(**filters),
+            namespace="threads",
+            params=filters,
+            estimate=None if filters else lambda: self.thread_repo.estimate_threads(),
+        )
 
-        for thread in threads:
-            thread.like_count = like_repo.count_thread_likes(thread.id)
-            thread.is_liked_by_current_user = (
-                like_repo.is_thread_liked_by_user(thread.id, current_user.id)
-                if current_user
-                else False
-            )
-        self._attach_comment_counts_for_threads(threads)
+        self._attach_like_data_for_threads(threads, current_user)
         self._attach_author_data_for_threads(threads)
 
         return {
-            "total": total,
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
             "page": page,
             "size": size,
             "items": threads,
+            "next_cursor": next_cursor(threads, size),
         }
 
     def search_threads(
@@ -203,38 +229,46 @@ class ThreadService:
         size: int,
         current_user,
         moderation_status: str | None = None,
+        cursor: str | None = None,
+        sort: str = "relevance",
     ):
-        """Search threads by keyword and return paginated enriched results."""
-        skip = (page - 1) * size
-        if moderation_status is None:
-            threads = self.thread_repo.search_threads(keyword, skip, size)
-            total = self.thread_repo.count_search_threads(keyword)
-        else:
-            threads = self.thread_repo.search_threads(
-                keyword,
-                skip,
-                size,
-                moderation_status=moderation_status,
-            )
-            total = self.thread_repo.count_search_threads(keyword, moderation_status=moderation_status)
+        """
+        Search threads by keyword and return paginated enriched results.
 
-        like_repo = LikeRepository(self.db)
+        Relevance-ordered pages are reached by page number; a cursor (or
+        sort="recent") switches to newest-first keyset pagination.
+        """
+        skip = (page - 1) * size
+        filters = {}
+        if moderation_status is not None:
+            filters["moderation_status"] = moderation_status
+        page_filters = dict(filters)
+        if cursor:
+            page_filters["before"] = decode_cursor(cursor)
+        elif sort == "recent":
+            page_filters["ranked"] = False
+        # Without full-text search or a search backend the repository pages
+        # newest first, so relevance pages can still hand out a cursor.
+        ranked = sort == "relevance" and not cursor and self.thread_repo.ranks_search()
+
+        threads = self.thread_repo.search_threads(keyword, skip, size, **page_filters)
+        counted = count_total(
+            "threads.search",
+            lambda: self.thread_repo.count_search_threads(keyword, **filters),
+            namespace="threads",
+            params={"q": keyword.strip().lower(), **filters},
+        )
 
-        for thread in threads:
-            thread.like_count = like_repo.count_thread_likes(thread.id)
-            thread.is_liked_by_current_user = (
-                like_repo.is_thread_liked_by_user(thread.id, current_user.id)
-                if current_user
-                else False
-            )
-        self._attach_comment_counts_for_threads(threads)
+        self._attach_like_data_for_threads(threads, current_user)
         self._attach_author_data_for_threads(threads)
 
         return {
-            "total": total,
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
             "page": page,
             "size": size,
             "items": threads,
+            "next_cursor": None if ranked else next_cursor(threads, size),
         }
 
     def update_moderation_status(self, thread_id: UUID, moderation_status: str):
@@ -255,29 +289,35 @@ class ThreadService:
             )
 
         thread.moderation_status = moderation_status
-        return self.thread_repo.update(thread)
-
-    def list_my_threads(self, page: int, size: int, current_user):
+        with unit_of_work(self.db):
+            updated = self.thread_repo.update(thread)
+            # Inside a caller's transaction these wait for its commit.
+            on_commit(self.db, lambda: invalidate_counts("threads"))
+            on_commit(self.db, lambda: thread_cache.invalidate(thread_id))
+        return updated
+
+    def list_my_threads(self, page: int, size: int, current_user, cursor: str | None = None):
         """List paginated threads created by the current user."""
         skip = (page - 1) * size
-        threads = self.thread_repo.list_threads_by_author(current_user.id, skip, size)
-        total = self.thread_repo.count_threads_by_author(current_user.id)
+        page_filters = {"before": decode_cursor(cursor)} if cursor else {}
+        threads = self.thread_repo.list_threads_by_author(current_user.id, skip, size, **page_filters)
+        counted = count_total(
+            "threads.mine",
+            lambda: self.thread_repo.count_threads_by_author(current_user.id),
+            namespace="threads",
+            params={"author_id": current_user.id},
+        )
 
-        like_repo = LikeRepository(self.db)
-        for thread in threads:
-            thread.like_count = like_repo.count_thread_likes(thread.id)
-            thread.is_liked_by_current_user = like_repo.is_thread_liked_by_user(
-                thread.id,
-                current_user.id,
-            )
-        self._attach_comment_counts_for_threads(threads)
+        self._attach_like_data_for_threads(threads, current_user)
         self._attach_author_data_for_threads(threads)
 
         return {
-            "total": total,
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
             "page": page,
             "size": size,
             "items": threads,
+            "next_cursor": next_cursor(threads, size),
         }
 
 
@@ -320,47 +360,46 @@ class ThreadService:
                 )
             thread.is_locked = data["is_locked"]
 
-        updated_thread = self.thread_repo.update(thread)
+        with unit_of_work(self.db):
+            updated_thread = self.thread_repo.update(thread)
+
+            publish_event(
+                channel="thread_updates",
+                thread_id=str(thread.id),
+                actor_id=str(current_user.id),
+                event="thread.updated",
+                payload={
+                    "id": str(thread.id),
+                    "title": thread.title,
+                    "description": thread.description,
+                    "image_url": thread.image_url,
+                    "is_locked": thread.is_locked,
+                },
+                db=self.db,
+            )
+
+            new_thread_text = f"{thread.title}\n{thread.description}"
+            old_mentions = extract_mentioned_usernames(old_thread_text)
+            new_mentions = extract_mentioned_usernames(new_thread_text)
+            newly_added_mentions = new_mentions - old_mentions
+
+            publish_mention_events_for_usernames(
+                self.db,
+                usernames=newly_added_mentions,
+                actor_id=current_user.id,
+                thread_id=thread.id,
+                source_type="thread",
+                source_id=thread.id,
+                preview=new_thread_text,
+            )
 
-        
         like_repo = LikeRepository(self.db)
-        updated_thread.like_count = like_repo.count_thread_likes(thread.id)
-        self._attach_comment_count(updated_thread)
         updated_thread.is_liked_by_current_user = like_repo.is_thread_liked_by_user(
             thread.id,
             current_user.id,
         )
         self._attach_author_data(updated_thread)
 
-        publish_event(
-            channel="thread_updates",
-            thread_id=str(thread.id),
-            actor_id=str(current_user.id),
-            event="thread.updated",
-            payload={
-                "id": str(thread.id),
-                "title": thread.title,
-                "description": thread.description,
-                "image_url": thread.image_url,
-                "is_locked": thread.is_locked,
-            },
-        )
-
-        new_thread_text = f"{thread.title}\n{thread.description}"
-        old_mentions = extract_mentioned_usernames(old_thread_text)
-        new_mentions = extract_mentioned_usernames(new_thread_text)
-        newly_added_mentions = new_mentions - old_mentions
-
-        publish_mention_events_for_usernames(
-            self.db,
-            usernames=newly_added_mentions,
-            actor_id=current_user.id,
-            thread_id=thread.id,
-            source_type="thread",
-            source_id=thread.id,
-            preview=new_thread_text,
-        )
-
         return updated_thread
 
 
@@ -384,14 +423,66 @@ class ThreadService:
                 detail="You do not have permission to delete this thread",
             )
 
-        deleted_thread = self.thread_repo.soft_delete(thread)
+        with unit_of_work(self.db):
+            deleted_thread = self.thread_repo.soft_delete(thread)
 
-        publish_event(
-            channel="thread_updates",
-            thread_id=str(thread.id),
-            actor_id=str(current_user.id),
-            event="thread.deleted",
-            payload={"id": str(thread.id)},
-        )
+            publish_event(
+                channel="thread_updates",
+                thread_id=str(thread.id),
+                actor_id=str(current_user.id),
+                event="thread.deleted",
+                payload={"id": str(thread.id)},
+                db=self.db,
+            )
 
         return deleted_thread
+
+
+class AsyncThreadService:
+    """
+    Async counterpart of ThreadService for the hot read routes. Writes stay
+    on ThreadService and the sync session.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.thread_repo = AsyncThreadRepository(db)
+
+    async def list_threads(self, page: int, size: int, current_user, cursor: str | None = None):
+        """Return a paginated list of threads with engagement and author data."""
+        skip = (page - 1) * size
+        page_filters = {"before": decode_cursor(cursor)} if cursor else {}
+
+        threads = await self.thread_repo.list_threads(skip, size, **page_filters)
+        counted = await count_total_async(
+            "threads.list",
+            self.thread_repo.count_threads,
+            namespace="threads",
+            params={},
+            estimate=self.thread_repo.estimate_threads,
+        )
+
+        liked_ids = (
+            await AsyncLikeRepository(self.db).get_liked_thread_ids(
+                [thread.id for thread in threads],
+                current_user.id,
+            )
+            if threads and current_user
+            else set()
+        )
+        for thread in threads:
+            thread.is_liked_by_current_user = thread.id in liked_ids
+
+        author_ids = {thread.author_id for thread in threads}
+        if author_ids:
+            users = list(await self.db.scalars(select(User).where(User.id.in_(author_ids))))
+            _apply_author_data(threads, users)
+
+        return {
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
+            "page": page,
+            "size": size,
+            "items": threads,
+            "next_cursor": next_cursor(threads, size),
+        }
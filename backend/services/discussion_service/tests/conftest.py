@@ -0,0 +1,90 @@
+import json
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.services.auth_service.app.models.user import User  # noqa: E402
+from backend.services.discussion_service.app.models import Comment, Like, Thread  # noqa: E402,F401
+from backend.services.discussion_service.app.models.thread_report import ThreadReport  # noqa: E402,F401
+from backend.shared.database.base import Base  # noqa: E402
+from backend.shared.database.profiler import assert_query_budget  # noqa: E402
+
+
+@pytest.fixture
+def db_session():
+    """Real SQLAlchemy session on an in-memory SQLite database."""
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def make_user(db_session):
+    def _make_user(username: str) -> User:
+        user = User(
+            username=username,
+            email=f"{username}@example.com",
+            hashed_password="x",
+            full_name=username.title(),
+        )
+        db_session.add(user)
+        db_session.flush()
+        return user
+
+    return _make_user
+
+
+@pytest.fixture
+def query_budget():
+    """`with query_budget(n)` or `with query_budget(route)` fails if the block runs more SQL."""
+    return assert_query_budget
+
+
+class FakeEventRedis:
+    """Stands in for core.events.redis_client and records what the publisher flushes."""
+
+    def __init__(self):
+        self.published = []
+        self.pipelines = 0
+
+    def pipeline(self, transaction=False):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.pending = []
+
+            def publish(self, channel, message):
+                self.pending.append((channel, message))
+
+            def execute(self):
+                redis.pipelines += 1
+                redis.published.extend(self.pending)
+
+        return Pipeline()
+
+
+@pytest.fixture
+def published_events(monkeypatch):
+    """Call to flush the event publisher and get the (channel, event) pairs sent to Redis."""
+    from backend.services.discussion_service.app.core import events
+
+    fake = FakeEventRedis()
+    monkeypatch.setattr(events, "redis_client", fake)
+
+    def _flushed():
+        assert events.event_publisher.flush(timeout=5)
+        return [(channel, json.loads(message)) for channel, message in fake.published]
+
+    _flushed.redis = fake
+    return _flushed
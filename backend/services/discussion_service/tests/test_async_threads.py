@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.services.auth_service.app.models.user import User
+from backend.services.discussion_service.app.models.like import Like
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.services.discussion_service.app.services.thread_service import AsyncThreadService
+from backend.shared.database.async_session import to_async_url
+from backend.shared.database.base import Base
+
+
+def test_to_async_url_swaps_in_the_async_driver():
+    url = to_async_url("postgresql+psycopg2://forum:pw@db:5432/forumdb")
+    assert url.drivername == "postgresql+asyncpg"
+    assert (url.username, url.password, url.host, url.database) == ("forum", "pw", "db", "forumdb")
+    assert to_async_url("postgresql://forum@db/forumdb").drivername == "postgresql+asyncpg"
+    sqlite_url = to_async_url("sqlite+pysqlite:///:memory:")
+    assert (sqlite_url.drivername, sqlite_url.database) == ("sqlite+aiosqlite", ":memory:")
+
+
+def test_async_thread_listing_matches_the_sync_shape():
+    async def scenario():
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            alice = User(username="alice", email="alice@example.com", hashed_password="x", full_name="Alice")
+            db.add(alice)
+            await db.flush()
+            base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            threads = [
+                Thread(title=f"t{i}", description="d", author_id=alice.id, created_at=base + timedelta(minutes=i))
+                for i in range(3)
+            ]
+            db.add_all(threads)
+            await db.flush()
+            db.add(Like(user_id=alice.id, thread_id=threads[2].id))
+            await db.commit()
+
+            service = AsyncThreadService(db)
+            first = await service.list_threads(1, 2, SimpleNamespace(id=alice.id))
+            rest = await service.list_threads(1, 2, SimpleNamespace(id=alice.id), cursor=first["next_cursor"])
+
+        await engine.dispose()
+        return first, rest
+
+    first, rest = asyncio.run(scenario())
+
+    assert first["total"] == 3
+    assert [thread.title for thread in first["items"]] == ["t2", "t1"]
+    assert [thread.is_liked_by_current_user for thread in first["items"]] == [True, False]
+    assert {thread.author_username for thread in first["items"]} == {"alice"}
+    assert [thread.title for thread in rest["items"]] == ["t0"]
+    assert rest["next_cursor"] is None
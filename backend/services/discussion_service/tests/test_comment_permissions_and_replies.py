@@ -15,9 +15,20 @@ def _make_comment(author_id, thread_id=None, parent_id=None):
         thread_id=thread_id or uuid4(),
         parent_id=parent_id,
         replies=[],
+        is_deleted=False,
     )
 
 
+class FakeThreadRepo:
+    """Records counter updates instead of issuing the UPDATE."""
+
+    def __init__(self):
+        self.adjusted = []
+
+    def adjust_counters(self, thread_id, **deltas):
+        self.adjusted.append((thread_id, deltas))
+
+
 def test_create_reply_emits_comment_replied_event(monkeypatch):
     db = SimpleNamespace()
     service = CommentService(db)
@@ -37,6 +48,7 @@ def test_create_reply_emits_comment_replied_event(monkeypatch):
             return created_comment
 
     service.repo = FakeRepo()
+    service.thread_repo = FakeThreadRepo()
     service.thread_service = SimpleNamespace(get_thread=lambda _tid: SimpleNamespace(is_locked=False))
 
     published = []
@@ -56,6 +68,7 @@ def test_create_reply_emits_comment_replied_event(monkeypatch):
     service.create_comment(thread_id, "reply text", reply_author, parent_comment.id)
 
     events = {(e["channel"], e["event"]) for e in published}
+    assert service.thread_repo.adjusted == [(thread_id, {"comment_delta": 1})]
     assert ("thread_updates", "comment.created") in events
     assert ("discussion_events", "comment.replied") in events
 
@@ -77,6 +90,7 @@ def test_create_reply_to_self_does_not_emit_comment_replied(monkeypatch):
             return created_comment
 
     service.repo = FakeRepo()
+    service.thread_repo = FakeThreadRepo()
     service.thread_service = SimpleNamespace(get_thread=lambda _tid: SimpleNamespace(is_locked=False))
 
     published = []
@@ -121,6 +135,7 @@ def test_moderator_can_update_and_delete_any_comment(monkeypatch):
 
     repo = FakeRepo()
     service.repo = repo
+    service.thread_repo = FakeThreadRepo()
 
     monkeypatch.setattr(
         "backend.services.discussion_service.app.services.comment_service.publish_event",
@@ -142,6 +157,7 @@ def test_moderator_can_update_and_delete_any_comment(monkeypatch):
     assert updated.content == "new"
     assert deleted is comment
     assert repo.deleted is True
+    assert service.thread_repo.adjusted == [(comment.thread_id, {"comment_delta": -1})]
 
 
 def test_update_populates_like_fields_for_response(monkeypatch):
@@ -149,6 +165,7 @@ def test_update_populates_like_fields_for_response(monkeypatch):
     service = CommentService(db)
     owner_id = uuid4()
     comment = _make_comment(owner_id)
+    comment.like_count = 2
 
     class FakeRepo:
         def get_by_id(self, _cid):
@@ -161,9 +178,6 @@ def test_update_populates_like_fields_for_response(monkeypatch):
         def __init__(self, _db):
             pass
 
-        def count_comment_likes(self, _comment_id):
-            return 2
-
         def is_comment_liked_by_user(self, _comment_id, _user_id):
             return True
 
@@ -0,0 +1,291 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from backend.services.discussion_service.app.core.comment_tree import build_comment_tree
+from backend.services.discussion_service.app.core.config import settings
+from backend.services.discussion_service.app.core.pagination import START_CURSOR
+from backend.services.discussion_service.app.models.comment import (
+    MAX_COMMENT_DEPTH,
+    Comment,
+    child_path,
+    path_segment,
+)
+from backend.services.discussion_service.app.models.like import Like
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.services.discussion_service.app.repositories.comment_repositories import CommentRepository
+from backend.services.discussion_service.app.schemas.comment import CommentRead, CommentTreePage
+from backend.services.discussion_service.app.services.comment_service import CommentService
+
+
+def _node(parent=None):
+    return SimpleNamespace(id=uuid4(), parent_id=parent.id if parent else None)
+
+
+def _seed_thread(db_session, author):
+    thread = Thread(title="t", description="d", author_id=author.id)
+    db_session.add(thread)
+    db_session.flush()
+    return thread
+
+
+def _count_queries(db_session):
+    statements = []
+    event.listen(
+        db_session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    return statements
+
+
+def test_build_comment_tree_nests_replies_and_keeps_orphans_as_roots():
+    root = _node()
+    reply = _node(root)
+    nested = _node(reply)
+    orphan = SimpleNamespace(id=uuid4(), parent_id=uuid4())
+
+    tree = build_comment_tree([root, reply, orphan, nested])
+
+    assert tree == [root, orphan]
+    assert root.replies == [reply]
+    assert reply.replies == [nested]
+    assert orphan.replies == []
+
+
+def test_build_comment_tree_flattens_replies_below_max_depth():
+    chain = [_node()]
+    for _ in range(5):
+        chain.append(_node(chain[-1]))
+    side = _node(chain[2])
+    comments = chain[:4] + [side] + chain[4:]
+
+    tree = build_comment_tree(comments, max_depth=2)
+
+    assert tree == [chain[0]]
+    assert chain[1].replies == [chain[2]]
+    assert chain[2].replies == [chain[3], side, chain[4], chain[5]]
+    assert all(node.replies == [] for node in chain[3:] + [side])
+    assert chain[5].parent_id == chain[4].id
+
+
+def test_thread_comments_use_fixed_query_count(db_session, make_user):
+    alice = make_user("alice")
+    bob = make_user("bob")
+    thread = _seed_thread(db_session, alice)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    comments = []
+    for i in range(30):
+        parent = comments[i // 2] if i else None
+        comment = Comment(
+            content=f"c{i}",
+            thread_id=thread.id,
+            author_id=(alice if i % 2 else bob).id,
+            parent_id=parent.id if parent else None,
+            created_at=base + timedelta(minutes=i),
+        )
+        db_session.add(comment)
+        db_session.flush()
+        comments.append(comment)
+    db_session.add_all([
+        Like(user_id=alice.id, comment_id=comments[3].id),
+        Like(user_id=alice.id, comment_id=comments[17].id),
+        Like(user_id=bob.id, comment_id=comments[4].id),
+    ])
+    thread_id, viewer = thread.id, SimpleNamespace(id=alice.id)
+    db_session.commit()
+    db_session.expunge_all()
+
+    statements = _count_queries(db_session)
+    tree = CommentService(db_session).get_thread_comments(thread_id, viewer)
+
+    assert len(statements) == 3
+    assert [root.content for root in tree] == ["c0"]
+    payload = CommentRead.model_validate(tree[0]).model_dump()
+    nodes, stack = [], [payload]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node["replies"])
+    assert len(nodes) == 30
+    liked = {node["content"] for node in nodes if node["is_liked_by_current_user"]}
+    assert liked == {"c3", "c17"}
+    assert {node["author_username"] for node in nodes} == {"alice", "bob"}
+    assert len(statements) == 3
+
+
+def test_deep_reply_chain_serializes(db_session, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "comment_tree_max_depth", 50)
+    alice = make_user("alice")
+    thread = _seed_thread(db_session, alice)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    parent_id = None
+    for i in range(600):
+        comment = Comment(
+            id=uuid4(),
+            content=f"c{i}",
+            thread_id=thread.id,
+            author_id=alice.id,
+            parent_id=parent_id,
+            created_at=base + timedelta(seconds=i),
+        )
+        db_session.add(comment)
+        parent_id = comment.id
+    db_session.commit()
+
+    tree = CommentService(db_session).get_thread_comments(thread.id, alice)
+    payload = CommentRead.model_validate(tree[0]).model_dump(mode="json")
+
+    node = payload
+    for _ in range(50):
+        node = node["replies"][0]
+    assert node["content"] == "c50"
+    assert [reply["content"] for reply in node["replies"]] == [f"c{i}" for i in range(51, 600)]
+
+
+def _seed_replies(db_session, thread, author, parent, count, base, prefix):
+    replies = []
+    for i in range(count):
+        reply = Comment(
+            content=f"{prefix}{i}",
+            thread_id=thread.id,
+            author_id=author.id,
+            parent_id=parent.id if parent else None,
+            created_at=base + timedelta(minutes=len(prefix) * 100 + i),
+        )
+        db_session.add(reply)
+        replies.append(reply)
+    db_session.flush()
+    return replies
+
+
+def test_comment_page_inlines_limited_replies_with_continuations(db_session, make_user):
+    alice = make_user("alice")
+    thread = _seed_thread(db_session, alice)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    roots = _seed_replies(db_session, thread, alice, None, 3, base, "r")
+    replies = _seed_replies(db_session, thread, alice, roots[0], 4, base, "rr")
+    _seed_replies(db_session, thread, alice, replies[0], 2, base, "rrr")
+    db_session.add(Like(user_id=alice.id, comment_id=replies[1].id))
+    thread_id, root_id, viewer = thread.id, roots[0].id, SimpleNamespace(id=alice.id)
+    db_session.commit()
+    service = CommentService(db_session)
+
+    statements = _count_queries(db_session)
+    page = service.get_thread_comment_page(thread_id, viewer, size=2, depth=1, breadth=2)
+
+    assert len(statements) == 5
+    first, second = page["items"]
+    assert [first.content, second.content] == ["r0", "r1"]
+    assert first.reply_count == 4
+    assert [reply.content for reply in first.replies] == ["rr0", "rr1"]
+    assert first.replies[1].is_liked_by_current_user is True
+    # Depth is exhausted one level down: counted, not inlined, and resumable from the start.
+    assert first.replies[0].reply_count == 2
+    assert first.replies[0].replies == []
+    assert first.replies[0].replies_cursor == START_CURSOR
+    assert first.replies[1].reply_count == 0 and first.replies[1].replies_cursor is None
+    assert second.reply_count == 0 and second.replies_cursor is None
+
+    nested = service.get_comment_replies(
+        first.replies[0].id, viewer, cursor=first.replies[0].replies_cursor, depth=0
+    )
+    assert [reply.content for reply in nested["items"]] == ["rrr0", "rrr1"]
+
+    rest = service.get_comment_replies(root_id, viewer, cursor=first.replies_cursor, depth=0)
+    assert [reply.content for reply in rest["items"]] == ["rr2", "rr3"]
+    assert rest["parent_id"] == root_id
+    assert rest["descendant_count"] == 6
+
+    last = service.get_thread_comment_page(thread_id, viewer, cursor=page["next_cursor"], size=2)
+    assert [comment.content for comment in last["items"]] == ["r2"]
+    assert last["next_cursor"] is None
+
+    payload = CommentTreePage.model_validate(page).model_dump()
+    assert payload["items"][0]["replies_cursor"] == first.replies_cursor
+
+
+def test_comment_replies_unknown_parent_is_404(db_session):
+    with pytest.raises(HTTPException) as exc:
+        CommentService(db_session).get_comment_replies(uuid4(), None)
+    assert exc.value.status_code == 404
+
+
+def test_inserts_maintain_materialized_paths(db_session, make_user):
+    alice = make_user("alice")
+    thread = _seed_thread(db_session, alice)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    (root,) = _seed_replies(db_session, thread, alice, None, 1, base, "r")
+    (child,) = _seed_replies(db_session, thread, alice, root, 1, base, "rr")
+    grandchildren = _seed_replies(db_session, thread, alice, child, 2, base, "rrr")
+    (sibling,) = _seed_replies(db_session, thread, alice, None, 1, base, "s")
+    repo = CommentRepository(db_session)
+
+    assert root.path == path_segment(root.id) and root.depth == 0
+    assert child.path == root.path + path_segment(child.id) and child.depth == 1
+    assert grandchildren[1].depth == 2
+
+    assert [c.id for c in repo.get_ancestors(grandchildren[0])] == [child.id, root.id]
+    assert repo.count_descendants(root) == 3
+    assert repo.count_descendants(sibling) == 0
+
+
+def test_create_comment_sets_path_from_loaded_parent(db_session, make_user, monkeypatch):
+    monkeypatch.setattr(
+        "backend.services.discussion_service.app.services.comment_service.publish_event",
+        lambda **_kwargs: None,
+    )
+    alice = make_user("alice")
+    thread = _seed_thread(db_session, alice)
+    service = CommentService(db_session)
+
+    root = service.create_comment(thread.id, "root", alice.id, None)
+    reply = service.create_comment(thread.id, "reply", alice.id, root.id)
+
+    assert reply.path == child_path(root.path, reply.id)
+    assert reply.depth == 1
+
+    reply.depth = MAX_COMMENT_DEPTH
+    db_session.commit()
+    with pytest.raises(HTTPException) as exc:
+        service.create_comment(thread.id, "too deep", alice.id, reply.id)
+    assert exc.value.status_code == 400
+
+
+def test_leaf_delete_prunes_placeholder_chain_in_one_commit(db_session, make_user, monkeypatch):
+    published = []
+    monkeypatch.setattr(
+        "backend.services.discussion_service.app.services.comment_service.publish_event",
+        lambda **kwargs: published.append(kwargs),
+    )
+    alice = make_user("alice")
+    thread = _seed_thread(db_session, alice)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    (root,) = _seed_replies(db_session, thread, alice, None, 1, base, "r")
+    kept, upper = _seed_replies(db_session, thread, alice, root, 2, base, "rr")
+    (lower,) = _seed_replies(db_session, thread, alice, upper, 1, base, "rrr")
+    (leaf,) = _seed_replies(db_session, thread, alice, lower, 1, base, "rrrr")
+    for placeholder in (root, upper, lower):
+        placeholder.is_deleted = True
+        placeholder.content = CommentService.DELETED_PLACEHOLDER
+    db_session.add(Like(user_id=alice.id, comment_id=leaf.id))
+    thread.comment_count = 2
+    ids = {name: item.id for name, item in (("root", root), ("kept", kept), ("upper", upper), ("lower", lower), ("leaf", leaf))}
+    db_session.commit()
+
+    commits = []
+    event.listen(db_session, "after_commit", lambda _session: commits.append(1))
+    CommentService(db_session).delete_comment(ids["leaf"], alice)
+
+    assert len(commits) == 1
+    remaining = {comment.id for comment in db_session.query(Comment)}
+    assert remaining == {ids["root"], ids["kept"]}
+    assert db_session.get(Thread, thread.id).comment_count == 1
+    (message,) = published
+    assert message["event"] == "comment.deleted"
+    assert message["payload"]["id"] == str(ids["leaf"])
+    assert message["payload"]["removed_ids"] == [str(ids["leaf"]), str(ids["lower"]), str(ids["upper"])]
@@ -0,0 +1,127 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import redis
+
+from backend.services.discussion_service.app.core.count_invalidation import invalidate_counts_for_event
+from backend.services.discussion_service.app.services.thread_service import ThreadService
+from backend.shared.database import counts
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def mget(self, *keys):
+        return [self.store.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, "0")) + 1)
+
+    def execute(self):
+        return []
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeRedis()
+    monkeypatch.setattr(counts, "_redis_client", cache)
+    return cache
+
+
+def _set_modes(monkeypatch, **modes):
+    monkeypatch.setattr(counts.settings, "count_modes", {k.replace("_", "."): v for k, v in modes.items()})
+
+
+def test_exact_mode_is_default_and_skips_cache(monkeypatch):
+    monkeypatch.setattr(counts, "_redis_client", None)
+    _set_modes(monkeypatch)
+
+    result = counts.count_total("threads.list", lambda: 7, namespace="threads")
+
+    assert result == counts.CountResult(7, is_estimate=False)
+    assert counts._redis_client is None
+
+
+def test_cached_mode_reuses_total_until_namespace_is_invalidated(monkeypatch, fake_cache):
+    _set_modes(monkeypatch, threads_list="cached")
+    calls = []
+
+    def exact():
+        calls.append(1)
+        return len(calls) * 10
+
+    first = counts.count_total("threads.list", exact, namespace="threads", params={"s": "a"})
+    second = counts.count_total("threads.list", exact, namespace="threads", params={"s": "a"})
+    other = counts.count_total("threads.list", exact, namespace="threads", params={"s": "b"})
+    counts.invalidate_counts("threads")
+    third = counts.count_total("threads.list", exact, namespace="threads", params={"s": "a"})
+
+    assert (first.total, second.total, other.total, third.total) == (10, 10, 20, 30)
+    assert not third.is_estimate
+
+
+def test_estimate_mode_uses_planner_only_for_large_unfiltered_totals(monkeypatch, fake_cache):
+    _set_modes(monkeypatch, comments_list="estimate")
+    monkeypatch.setattr(counts.settings, "count_estimate_exact_below", 1000)
+
+    large = counts.count_total("comments.list", lambda: 5, namespace="comments", estimate=lambda: 250000)
+    small = counts.count_total("comments.list", lambda: 5, namespace="comments", estimate=lambda: 12)
+    no_planner = counts.count_total("comments.list", lambda: 6, namespace="comments", estimate=lambda: None)
+
+    assert large == counts.CountResult(250000, is_estimate=True)
+    assert small == counts.CountResult(5)
+    assert no_planner == counts.CountResult(6)  # cached, not estimated
+
+
+def test_cache_failures_fall_back_to_exact(monkeypatch):
+    class BrokenRedis:
+        def mget(self, *_keys):
+            raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(counts, "_redis_client", BrokenRedis())
+    _set_modes(monkeypatch, threads_list="cached")
+
+    assert counts.count_total("threads.list", lambda: 3, namespace="threads").total == 3
+
+
+def test_events_invalidate_matching_namespaces(monkeypatch, fake_cache):
+    _set_modes(monkeypatch, threads_list="cached")
+    actor_id = str(uuid4())
+
+    invalidate_counts_for_event({"event": "thread.created", "actor_id": actor_id})
+    invalidate_counts_for_event({"event": "thread.like.updated", "actor_id": actor_id})
+
+    assert fake_cache.store["counts:gen:threads"] == "1"
+    assert fake_cache.store[f"counts:gen:activity:{actor_id}"] == "2"
+    assert "counts:gen:comments" not in fake_cache.store
+
+
+def test_thread_listing_reports_estimated_totals(monkeypatch):
+    _set_modes(monkeypatch, threads_list="estimate")
+    monkeypatch.setattr(counts.settings, "count_estimate_exact_below", 1000)
+
+    class FakeThreadRepo:
+        def list_threads(self, skip, limit):
+            return []
+
+        def count_threads(self):
+            raise AssertionError("exact count should be skipped")
+
+        def estimate_threads(self):
+            return 1_200_000
+
+    service = ThreadService(SimpleNamespace())
+    service.thread_repo = FakeThreadRepo()
+
+    out = service.list_threads(1, 10, None)
+
+    assert out["total"] == 1_200_000
+    assert out["total_is_estimate"] is True
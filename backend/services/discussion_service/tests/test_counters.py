@@ -0,0 +1,58 @@
+from uuid import uuid4
+
+from backend.services.discussion_service.app.core import counters
+from backend.services.discussion_service.app.models.comment import Comment
+from backend.services.discussion_service.app.models.like import Like
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.services.discussion_service.app.repositories.thread_repositories import ThreadRepository
+
+
+def test_reconcile_counters_repairs_drift_in_batches(db_session, make_user):
+    db = db_session
+    alice = make_user("alice")
+    bob = make_user("bob")
+
+    threads = [
+        Thread(title=f"thread {i}", description="d", author_id=alice.id, like_count=9)
+        for i in range(3)
+    ]
+    db.add_all(threads)
+    db.flush()
+    comment = Comment(content="c", thread_id=threads[0].id, author_id=bob.id, like_count=4)
+    deleted = Comment(content="x", thread_id=threads[0].id, author_id=bob.id, is_deleted=True)
+    db.add_all([comment, deleted])
+    db.flush()
+    db.add_all([
+        Like(user_id=bob.id, thread_id=threads[0].id),
+        Like(user_id=alice.id, comment_id=comment.id),
+    ])
+    db.commit()
+
+    repaired = counters.reconcile_counters(db, batch_size=2)
+    db.expire_all()
+
+    assert repaired == {"threads": 3, "comments": 1}
+    by_id = {thread.id: thread for thread in db.query(Thread)}
+    assert by_id[threads[0].id].like_count == 1
+    assert by_id[threads[0].id].comment_count == 1
+    assert by_id[threads[1].id].like_count == 0
+    assert db.get(Comment, comment.id).like_count == 1
+
+    # A second pass finds nothing left to fix.
+    assert counters.reconcile_counters(db, batch_size=2) == {"threads": 0, "comments": 0}
+
+
+def test_adjust_counters_returns_new_values_without_committing(db_session, make_user):
+    db = db_session
+    alice = make_user("alice")
+    thread = Thread(title="hello", description="d", author_id=alice.id)
+    db.add(thread)
+    db.commit()
+
+    repo = ThreadRepository(db)
+    assert repo.adjust_counters(thread.id, like_delta=1, comment_delta=2) == (1, 2)
+    db.rollback()
+    db.expire_all()
+
+    assert db.get(Thread, thread.id).like_count == 0
+    assert repo.adjust_counters(uuid4(), like_delta=1) is None
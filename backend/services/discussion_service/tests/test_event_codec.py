@@ -0,0 +1,63 @@
+import logging
+
+import pytest
+
+from backend.shared.events import codec
+from backend.shared.events.codec import JsonCodec, get_codec
+from backend.shared.events.envelope import ENVELOPE_VERSION, UnsupportedEnvelope, check_envelope, make_envelope
+
+PAYLOAD = {"thread_id": "t1", "like_count": 3}
+
+
+def test_envelope_is_versioned_and_warns_about_missing_payload_keys(caplog):
+    envelope = make_envelope("thread.like.updated", "t1", "u1", PAYLOAD)
+    assert envelope["v"] == ENVELOPE_VERSION
+    assert envelope["payload"] == PAYLOAD
+    assert check_envelope(envelope) is envelope
+    assert check_envelope({"event": "thread.liked"})  # pre-envelope events read as version 0
+
+    with caplog.at_level(logging.WARNING):
+        make_envelope("thread.like.updated", "t1", "u1", {"thread_id": "t1"})
+        make_envelope("brand.new.event", "t1", "u1", {})
+    assert [record.getMessage() for record in caplog.records] == ["thread.like.updated payload is missing like_count"]
+
+    with pytest.raises(UnsupportedEnvelope):
+        check_envelope({**envelope, "v": ENVELOPE_VERSION + 1})
+
+
+@pytest.mark.parametrize("name", ["json", "orjson"])
+def test_json_codecs_round_trip_and_agree(name):
+    event_codec = get_codec(name)
+    envelope = make_envelope("comment.created", "t1", "u1", {"content": "héllo ✓", "parent_id": None})
+
+    encoded = event_codec.encode(envelope)
+    assert isinstance(encoded, bytes)
+    assert event_codec.decode(encoded) == envelope
+    assert event_codec.decode(encoded.decode()) == envelope
+    assert JsonCodec().decode(encoded) == envelope
+    assert event_codec.to_text(envelope) == encoded.decode()
+
+    with pytest.raises(ValueError):
+        event_codec.decode("{")
+
+
+def test_msgpack_survives_surrogateescape_decoding():
+    pytest.importorskip("msgpack")
+    event_codec = get_codec("msgpack")
+    envelope = make_envelope("thread.liked", "t1", "u1", {"owner_id": "u2"})
+
+    encoded = event_codec.encode(envelope)
+    # What a decode_responses=True client configured with EVENT_REDIS_OPTIONS hands back.
+    received = encoded.decode("utf-8", codec.EVENT_REDIS_OPTIONS["encoding_errors"])
+    assert event_codec.decode(received) == envelope
+    assert len(encoded) < len(get_codec("json").encode(envelope))
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError, match="EVENT_CODEC"):
+        get_codec("yaml")
+
+
+def test_stored_outbox_text_is_forwarded_as_is_for_json_codecs(monkeypatch):
+    monkeypatch.setattr(codec, "event_codec", JsonCodec())
+    assert codec.stored_to_wire('{"event":"thread.liked"}') == '{"event":"thread.liked"}'
@@ -1,17 +1,10 @@
-import json
+import threading
 
 from backend.services.discussion_service.app.core import events
+from backend.services.discussion_service.app.core.events import DROPPED, EventPublisher
 
 
-def test_publish_event_serializes_expected_payload(monkeypatch):
-    published = []
-
-    class FakeRedis:
-        def publish(self, channel, message):
-            published.append((channel, message))
-
-    monkeypatch.setattr(events, "redis_client", FakeRedis())
-
+def test_publish_event_serializes_expected_payload(published_events):
     events.publish_event(
         channel="discussion_events",
         event="mention",
@@ -20,12 +13,60 @@ def test_publish_event_serializes_expected_payload(monkeypatch):
         payload={"k": "v"},
     )
 
+    published = published_events()
     assert len(published) == 1
-    channel, message = published[0]
-    data = json.loads(message)
+    channel, data = published[0]
     assert channel == "discussion_events"
     assert data["event"] == "mention"
     assert data["thread_id"] == "t1"
     assert data["actor_id"] == "u1"
     assert "event_id" in data
     assert "timestamp" in data
+
+
+def test_publisher_batches_in_order_and_does_not_wait_for_redis(published_events, monkeypatch):
+    redis = published_events.redis
+    release = threading.Event()
+
+    def stalled_pipeline(transaction=False):
+        pipe = type(redis).pipeline(redis, transaction)
+        execute = pipe.execute
+
+        def wait_then_execute():
+            release.wait(5)
+            execute()
+
+        pipe.execute = wait_then_execute
+        return pipe
+
+    monkeypatch.setattr(redis, "pipeline", stalled_pipeline)
+
+    for n in range(50):
+        events.publish_event("thread_updates", "thread.like.updated", "t1", "u1", {"n": n})
+    assert redis.published == []  # publish_event returned while Redis was stalled
+
+    release.set()
+    published = published_events()
+    assert [data["payload"]["n"] for _, data in published] == list(range(50))
+    assert redis.pipelines < 50
+
+
+def test_full_queue_drops_and_redis_failures_are_counted(monkeypatch):
+    def dropped(reason):
+        return DROPPED._merged().get((reason,), 0.0)
+
+    publisher = EventPublisher(maxsize=1, batch_size=10, retries=0)
+    monkeypatch.setattr(publisher, "_ensure_started", lambda: None)
+    before = dropped("queue_full")
+    assert publisher.publish("thread_updates", "{}") is True
+    assert publisher.publish("thread_updates", "{}") is False
+    assert dropped("queue_full") == before + 1
+
+    class DownRedis:
+        def pipeline(self, transaction=False):
+            raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(events, "redis_client", DownRedis())
+    before = dropped("redis_error")
+    publisher._send([("thread_updates", "{}"), ("discussion_events", "{}")])
+    assert dropped("redis_error") == before + 2
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+
+from backend.shared.metrics.http import MetricsMiddleware, router as metrics_router
+from backend.shared.metrics.pubsub import record_consumed
+from backend.shared.metrics.registry import Counter, Gauge, Histogram, Registry, REGISTRY
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    requests = Counter("requests_total", "Requests.", ("method",), registry=registry)
+    in_flight = Gauge("in_flight", "In flight.", registry=registry)
+    latency = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0), registry=registry)
+
+    requests.inc(method="GET")
+    requests.inc(2, method="GET")
+    in_flight.inc()
+    in_flight.dec()
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5, route="/a")
+
+    text = registry.render()
+    assert "# TYPE requests_total counter\nrequests_total{method=\"GET\"} 3\n" in text
+    assert "in_flight 0\n" in text
+    assert "# TYPE latency_seconds histogram\n" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2\n' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3\n' in text
+    assert 'latency_seconds_sum{route="/a"} 5.55\n' in text
+    assert 'latency_seconds_count{route="/a"} 3\n' in text
+
+
+def test_counter_sums_per_thread_shards():
+    registry = Registry()
+    hits = Counter("hits_total", "Hits.", registry=registry)
+
+    def work():
+        for _ in range(10_000):
+            hits.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert "hits_total 80000\n" in registry.render()
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+
+    @app.get("/threads/{thread_id}")
+    def show(thread_id: str):
+        return thread_id
+
+    app.include_router(metrics_router)
+    app.add_middleware(MetricsMiddleware, service="metrics-test")
+
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    def call(path):
+        sent.clear()
+        scope = {
+            "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http", "path": path,
+            "raw_path": path.encode(), "root_path": "", "query_string": b"", "headers": [],
+            "server": ("test", 80), "client": ("test", 1234),
+        }
+        asyncio.run(app(scope, receive, send))
+        return b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+
+    call("/threads/1")
+    call("/threads/2")
+    call("/nowhere")
+    text = call("/metrics").decode()
+
+    assert 'http_request_duration_seconds_count{service="metrics-test",method="GET",route="/threads/{thread_id}",status="200"} 2' in text
+    assert 'route="/nowhere"' not in text
+    assert 'http_request_duration_seconds_count{service="metrics-test",method="GET",route="unmatched",status="404"} 1' in text
+    assert 'http_requests_in_flight{service="metrics-test"} 1' in text  # the scrape itself
+
+
+def test_record_consumed_counts_lagged_events():
+    record_consumed("metrics-test", "events", {"timestamp": "2020-01-01T00:00:00+00:00"})
+    record_consumed("metrics-test", "events", None, outcome="invalid")
+
+    text = REGISTRY.render()
+    assert 'redis_listener_events_total{service="metrics-test",channel="events",outcome="ok"} 1' in text
+    assert 'redis_listener_events_total{service="metrics-test",channel="events",outcome="invalid"} 1' in text
+    assert 'redis_listener_lagged_events_total{service="metrics-test",channel="events"} 1' in text
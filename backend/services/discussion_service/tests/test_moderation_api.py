@@ -9,11 +9,15 @@ def test_moderation_threads_uses_list_or_search(monkeypatch):
         def __init__(self, _db):
             pass
 
-        def list_threads(self, page, size, current_user):
+        def list_threads(self, page, size, current_user, moderation_status=None, cursor=None):
+            assert moderation_status is None and cursor is None
             return {"total": 1, "page": page, "size": size, "items": []}
 
-        def search_threads(self, q, page, size, current_user):
+        def search_threads(
+            self, q, page, size, current_user, moderation_status=None, cursor=None, sort="relevance"
+        ):
             assert q == "python"
+            assert sort == "relevance"
             return {"total": 2, "page": page, "size": size, "items": []}
 
     monkeypatch.setattr(moderation_api, "ThreadService", FakeThreadService)
@@ -43,11 +47,13 @@ def test_moderation_comments_uses_list_or_search(monkeypatch):
         def __init__(self, _db):
             pass
 
-        def list_comments(self, page, size, current_user):
+        def list_comments(self, page, size, current_user, cursor=None):
+            assert cursor is None
             return {"total": 3, "page": page, "size": size, "items": []}
 
-        def search_comments(self, q, page, size, current_user):
+        def search_comments(self, q, page, size, current_user, cursor=None, sort="relevance"):
             assert q == "mention"
+            assert sort == "relevance"
             return {"total": 1, "page": page, "size": size, "items": []}
 
     monkeypatch.setattr(moderation_api, "CommentService", FakeCommentService)
@@ -0,0 +1,74 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from backend.services.discussion_service.app.core import events
+from backend.services.discussion_service.app.core.outbox import relay_outbox_batch
+from backend.services.discussion_service.app.models.event_outbox import EventOutbox
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.services.discussion_service.app.services.like_service import LikeService
+
+
+def _pending(db_session):
+    return list(db_session.scalars(select(EventOutbox).where(EventOutbox.delivered_at.is_(None)).order_by(EventOutbox.id)))
+
+
+def test_like_writes_events_to_outbox_and_relay_publishes_them(db_session, make_user, published_events, monkeypatch):
+    owner, fan = make_user("owner"), make_user("fan")
+    thread = Thread(title="t", description="d", author_id=owner.id)
+    db_session.add(thread)
+    db_session.commit()
+    seen = []
+    monkeypatch.setattr(events, "_local_listeners", [seen.append])
+
+    LikeService(db_session).toggle_thread_like(thread.id, fan.id)
+
+    assert [row.event for row in _pending(db_session)] == ["thread.like.updated", "thread.liked"]
+    assert [message["event"] for message in seen] == ["thread.like.updated", "thread.liked"]
+    assert published_events() == []  # nothing reaches Redis from the request
+
+    assert relay_outbox_batch(db_session) == 2
+    published = published_events()
+    assert [(channel, data["event"]) for channel, data in published] == [
+        ("thread_updates", "thread.like.updated"),
+        ("discussion_events", "thread.liked"),
+    ]
+    assert published[0][1]["payload"]["like_count"] == 1
+    assert _pending(db_session) == []
+    assert relay_outbox_batch(db_session) == 0
+
+
+def test_rolled_back_write_leaves_no_event(db_session, make_user, monkeypatch):
+    owner, fan = make_user("owner"), make_user("fan")
+    thread = Thread(title="t", description="d", author_id=owner.id)
+    db_session.add(thread)
+    db_session.commit()
+    service = LikeService(db_session)
+    service.toggle_thread_like(thread.id, fan.id)
+    before = len(_pending(db_session))
+
+    # A duplicate like fails on the unique constraint after its events were staged.
+    monkeypatch.setattr(service.repo, "get_thread_like", lambda *_args: None)
+    with pytest.raises(HTTPException):
+        service.toggle_thread_like(thread.id, fan.id)
+
+    assert len(_pending(db_session)) == before
+
+
+def test_failed_publish_keeps_rows_pending(db_session, monkeypatch):
+    class DownRedis:
+        def pipeline(self, transaction=False):
+            raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(events, "redis_client", DownRedis())
+    monkeypatch.setattr(events.event_publisher, "retries", 1)
+    events.publish_event("thread_updates", "thread.deleted", "t1", "u1", {"id": "t1"}, db=db_session)
+    dropped_before = sum(events.DROPPED._merged().values())
+
+    # The relay goes through the publisher's pipeline and retries, but a
+    # failure leaves rows for the next pass instead of dropping them.
+    with pytest.raises(ConnectionError):
+        relay_outbox_batch(db_session)
+
+    assert [row.event for row in _pending(db_session)] == ["thread.deleted"]
+    assert sum(events.DROPPED._merged().values()) == dropped_before
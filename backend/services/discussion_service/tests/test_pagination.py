@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from backend.services.discussion_service.app.core.pagination import (
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+)
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.services.discussion_service.app.repositories.thread_repositories import ThreadRepository
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    created_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    item_id = uuid4()
+
+    assert decode_cursor(encode_cursor(created_at, item_id)) == (created_at, item_id)
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_keyset_walk_visits_every_thread_once_despite_timestamp_ties(db_session, make_user):
+    author = make_user("alice")
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    # Pairs of threads share a timestamp so ordering must fall back to id.
+    db_session.add_all([
+        Thread(
+            title=f"thread {i}",
+            description="d",
+            author_id=author.id,
+            created_at=base + timedelta(minutes=i // 2),
+        )
+        for i in range(7)
+    ])
+    db_session.commit()
+    repo = ThreadRepository(db_session)
+
+    seen = []
+    before = None
+    while True:
+        page = repo.list_threads(0, 3, before=before)
+        seen.extend(thread.id for thread in page)
+        token = next_cursor(page, 3)
+        if token is None:
+            break
+        before = decode_cursor(token)
+
+    expected = [thread.id for thread in repo.list_threads(0, 10)]
+    assert seen == expected
+    assert len(set(seen)) == 7
+
+
+def test_keyset_ignores_offset_and_respects_author_filter(db_session, make_user):
+    alice = make_user("alice")
+    bob = make_user("bob")
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    db_session.add_all([
+        Thread(title=f"a{i}", description="d", author_id=alice.id, created_at=base + timedelta(hours=i))
+        for i in range(3)
+    ] + [Thread(title="b", description="d", author_id=bob.id, created_at=base)])
+    db_session.commit()
+    repo = ThreadRepository(db_session)
+
+    first = repo.list_threads_by_author(alice.id, 0, 1)
+    rest = repo.list_threads_by_author(
+        alice.id,
+        50,
+        10,
+        before=(first[0].created_at, first[0].id),
+    )
+
+    assert [t.title for t in first + rest] == ["a2", "a1", "a0"]
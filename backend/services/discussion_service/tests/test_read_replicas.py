@@ -0,0 +1,98 @@
+import pytest
+import redis
+from sqlalchemy import create_engine, select
+
+from backend.services.auth_service.app.core.config import settings
+from backend.services.auth_service.app.models.user import User
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.shared.database import routing
+from backend.shared.database.base import Base
+from backend.shared.database.routing import RoutingSession, bind_user
+
+
+class FakePinStore:
+    def __init__(self):
+        self.keys = {}
+
+    def set(self, key, value, ex=None):
+        self.keys[key] = (value, ex)
+
+    def exists(self, key):
+        return int(key in self.keys)
+
+
+class DownPinStore:
+    def exists(self, _key):
+        raise redis.ConnectionError("down")
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """A primary and a 'replica' that is really a second database with different rows."""
+    monkeypatch.setattr(settings, "database_replica_urls", ["replica"])
+    engines = []
+    for name in ("primary", "replica"):
+        engine = create_engine(f"sqlite+pysqlite:///{tmp_path / name}.db")
+        Base.metadata.create_all(engine)
+        with RoutingSession(bind=engine) as db:
+            author = User(username="alice", email="alice@example.com", hashed_password="x", full_name="Alice")
+            db.add(author)
+            db.flush()
+            db.add(Thread(title=f"on {name}", description="d", author_id=author.id))
+            db.commit()
+            author_id = author.id
+        engines.append(engine)
+    yield engines[0], engines[1], author_id
+    for engine in engines:
+        engine.dispose()
+
+
+def _titles(db, **options):
+    query = select(Thread.title)
+    if options.get("for_update"):
+        query = query.with_for_update()
+    return set(db.scalars(query))
+
+
+def test_read_only_sessions_use_replica_until_they_write(databases, monkeypatch):
+    primary, replica, author_id = databases
+    store = FakePinStore()
+    monkeypatch.setattr(routing, "get_pin_store", lambda: store)
+
+    with RoutingSession(bind=primary, replicas=[replica]) as db:
+        db.info["read_only"] = True
+        bind_user(db, author_id)
+        assert _titles(db) == {"on replica"}
+        assert _titles(db, for_update=True) == {"on primary"}
+
+        db.add(Thread(title="new", description="d", author_id=author_id))
+        db.commit()
+        assert _titles(db) == {"on primary", "new"}
+
+    assert set(store.keys) == {f"db:pin:{author_id}"}
+    assert store.keys[f"db:pin:{author_id}"][1] == settings.replica_pin_seconds
+
+    # The writer's next GET is pinned; other users still read the replica.
+    with RoutingSession(bind=primary, replicas=[replica]) as db:
+        db.info["read_only"] = True
+        bind_user(db, author_id)
+        assert _titles(db) == {"on primary", "new"}
+
+    with RoutingSession(bind=primary, replicas=[replica]) as db:
+        db.info["read_only"] = True
+        bind_user(db, "someone-else")
+        assert _titles(db) == {"on replica"}
+
+
+def test_writes_and_unavailable_pin_store_fall_back_to_primary(databases, monkeypatch):
+    primary, replica, author_id = databases
+
+    with RoutingSession(bind=primary, replicas=[replica]) as db:
+        db.info["read_only"] = False
+        assert _titles(db) == {"on primary"}
+
+    monkeypatch.setattr(routing, "get_pin_store", lambda: DownPinStore())
+    with RoutingSession(bind=primary, replicas=[replica]) as db:
+        db.info["read_only"] = True
+        bind_user(db, author_id)
+        assert _titles(db) == {"on primary"}
@@ -14,8 +14,10 @@ def test_threads_search_api_calls_service(monkeypatch):
         def __init__(self, _db):
             pass
 
-        def search_threads(self, q, page, size, current_user):
+        def search_threads(self, q, page, size, current_user, cursor=None, sort="relevance"):
             assert q == "python"
+            assert cursor is None
+            assert sort == "relevance"
             assert page == 1
             assert size == 10
             assert current_user.id
@@ -39,8 +41,10 @@ def test_comments_search_api_calls_service(monkeypatch):
         def __init__(self, _db):
             pass
 
-        def search_comments(self, q, page, size, current_user):
+        def search_comments(self, q, page, size, current_user, cursor=None, sort="relevance"):
             assert q == "mention"
+            assert cursor is None
+            assert sort == "relevance"
             assert page == 1
             assert size == 10
             assert current_user.id
@@ -59,10 +63,13 @@ def test_comments_search_api_calls_service(monkeypatch):
 
 def test_thread_and_comment_search_service_attach_like_metadata(monkeypatch):
     user = SimpleNamespace(id=uuid4())
-    thread_obj = SimpleNamespace(id=uuid4())
-    comment_obj = SimpleNamespace(id=uuid4(), replies=[])
+    thread_obj = SimpleNamespace(id=uuid4(), like_count=5)
+    comment_obj = SimpleNamespace(id=uuid4(), replies=[], like_count=3)
 
     class FakeThreadRepo:
+        def ranks_search(self):
+            return True
+
         def search_threads(self, keyword, skip, limit):
             assert keyword == "fastapi"
             assert skip == 0
@@ -74,6 +81,9 @@ def test_thread_and_comment_search_service_attach_like_metadata(monkeypatch):
             return 1
 
     class FakeCommentRepo:
+        def ranks_search(self):
+            return True
+
         def search_comments(self, keyword, skip, limit):
             assert keyword == "fastapi"
             assert skip == 0
@@ -88,18 +98,18 @@ def test_thread_and_comment_search_service_attach_like_metadata(monkeypatch):
         def __init__(self, _db):
             pass
 
-        def count_thread_likes(self, _thread_id):
-            return 5
-
         def is_thread_liked_by_user(self, _thread_id, _user_id):
             return True
 
-        def count_comment_likes(self, _comment_id):
-            return 3
+        def get_liked_thread_ids(self, thread_ids, _user_id):
+            return set(thread_ids)
 
         def is_comment_liked_by_user(self, _comment_id, _user_id):
             return False
 
+        def get_liked_comment_ids(self, _comment_ids, _user_id):
+            return set()
+
     thread_service = ThreadService(SimpleNamespace())
     thread_service.thread_repo = FakeThreadRepo()
 
@@ -125,3 +135,94 @@ def test_thread_and_comment_search_service_attach_like_metadata(monkeypatch):
     assert comment_out["total"] == 1
     assert comment_out["items"][0].like_count == 3
     assert comment_out["items"][0].is_liked_by_current_user is False
+
+
+def test_build_tsquery_handles_phrases_prefixes_and_exclusions():
+    from backend.services.discussion_service.app.core.search import build_tsquery
+
+    assert build_tsquery("fastapi redis") == "fastapi & redis"
+    assert build_tsquery('"real time" pyth*') == "(real <-> time) & pyth:*"
+    assert build_tsquery("python -django") == "python & !django"
+    assert build_tsquery("c++ it's") == "c & (it <-> s)"
+    assert build_tsquery("-only !!! \"\"") is None
+
+
+def test_render_snippet_escapes_user_text_before_highlighting():
+    from backend.services.discussion_service.app.core.search import render_snippet
+
+    raw = "<b>x</b> \x02fastapi\x03 rocks"
+    assert render_snippet(raw) == "&lt;b&gt;x&lt;/b&gt; <mark>fastapi</mark> rocks"
+    assert render_snippet(None) is None
+
+
+def test_postgres_thread_search_uses_tsvector_match_and_rank():
+    from sqlalchemy.dialects import postgresql
+
+    from backend.services.discussion_service.app.repositories.thread_repositories import ThreadRepository
+
+    captured = []
+
+    class FakeResult:
+        def all(self):
+            return []
+
+    class FakePostgresDB:
+        def get_bind(self):
+            return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+        def execute(self, statement):
+            captured.append(statement)
+            return FakeResult()
+
+    repo = ThreadRepository(FakePostgresDB())
+    assert repo.search_threads("fast* api", 0, 10) == []
+
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    assert "threads.search_vector @@ to_tsquery('english'::regconfig" in sql
+    assert "ts_rank_cd(threads.search_vector" in sql
+    assert "ILIKE" not in sql.upper()
+
+
+def test_non_postgres_search_falls_back_to_substring_match(db_session, make_user):
+    from backend.services.discussion_service.app.models.comment import Comment
+    from backend.services.discussion_service.app.models.thread import Thread
+    from backend.services.discussion_service.app.repositories.comment_repositories import CommentRepository
+    from backend.services.discussion_service.app.repositories.thread_repositories import ThreadRepository
+
+    author = make_user("alice")
+    thread = Thread(title="Realtime FastAPI", description="websockets", author_id=author.id)
+    db_session.add_all([thread, Thread(title="Other", description="nothing", author_id=author.id)])
+    db_session.flush()
+    db_session.add(Comment(content="I love fastapi", thread_id=thread.id, author_id=author.id))
+    db_session.commit()
+
+    thread_repo = ThreadRepository(db_session)
+    comment_repo = CommentRepository(db_session)
+
+    assert [t.title for t in thread_repo.search_threads("fastapi", 0, 10)] == ["Realtime FastAPI"]
+    assert thread_repo.count_search_threads("fastapi") == 1
+    assert len(comment_repo.search_comments("FASTAPI", 0, 10)) == 1
+    assert comment_repo.count_search_comments("FASTAPI") == 1
+
+
+def test_relevance_search_without_full_text_still_returns_a_cursor(db_session, make_user):
+    from backend.services.discussion_service.app.models.comment import Comment
+    from backend.services.discussion_service.app.models.thread import Thread
+
+    author = make_user("alice")
+    threads = [Thread(title=f"FastAPI {n}", description="", author_id=author.id) for n in range(3)]
+    db_session.add_all(threads)
+    db_session.flush()
+    db_session.add_all(
+        [Comment(content=f"fastapi {n}", thread_id=threads[0].id, author_id=author.id) for n in range(3)]
+    )
+    db_session.commit()
+
+    # SQLite has no full-text ranking, so "relevance" pages newest first and can be walked.
+    thread_page = ThreadService(db_session).search_threads("fastapi", 1, 2, author, sort="relevance")
+    comment_page = CommentService(db_session).search_comments("fastapi", 1, 2, author, sort="relevance")
+
+    assert thread_page["next_cursor"] is not None
+    assert comment_page["next_cursor"] is not None
+    rest = ThreadService(db_session).search_threads("fastapi", 1, 2, author, cursor=thread_page["next_cursor"])
+    assert len(thread_page["items"]) + len(rest["items"]) == 3
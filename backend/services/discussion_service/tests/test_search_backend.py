@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from backend.services.discussion_service.app.core import events, search_backend
+from backend.services.discussion_service.app.core.search_backend import (
+    BM25Index,
+    InMemorySearchBackend,
+    highlight,
+)
+from backend.services.discussion_service.app.core.search import parse_search_terms
+from backend.services.discussion_service.app.models.comment import Comment
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.services.discussion_service.app.repositories.comment_repositories import CommentRepository
+from backend.services.discussion_service.app.repositories.thread_repositories import ThreadRepository
+
+
+def _event(event, **payload):
+    return {"event": event, "payload": payload, "timestamp": datetime.now(timezone.utc).isoformat()}
+
+
+def test_bm25_ranks_rarer_and_denser_matches_higher():
+    index = BM25Index()
+    a, b, c = uuid4(), uuid4(), uuid4()
+    index.add(a, {"redis": 3, "cache": 1})
+    index.add(b, {"redis": 1, "python": 5, "web": 4})
+    index.add(c, {"python": 1})
+
+    ranked = [key for key, _ in index.search(parse_search_terms("redis"))]
+    assert ranked == [a, b]
+    assert [key for key, _ in index.search(parse_search_terms("red* -cache"))] == [b]
+    assert index.search(parse_search_terms("redis python cache")) == []
+
+
+def test_index_compacts_tombstones_and_keeps_results(monkeypatch):
+    monkeypatch.setattr(search_backend.settings, "search_index_compact_ratio", 0.25)
+    index = BM25Index()
+    keys = [uuid4() for _ in range(8)]
+    for key in keys:
+        index.add(key, {"fastapi": 1})
+    for key in keys[:3]:
+        index.remove(key)
+
+    assert len(index) == 5
+    assert len(index._keys) == 5  # compacted once tombstones passed 25%
+    assert {key for key, _ in index.search(parse_search_terms("fastapi"))} == set(keys[3:])
+
+
+def test_memory_backend_follows_thread_and_comment_events():
+    backend = InMemorySearchBackend()
+    thread_id, comment_id = uuid4(), uuid4()
+
+    backend.apply_event(_event("thread.created", id=str(thread_id), title="Realtime", description="websockets"))
+    backend.apply_event(_event("comment.created", id=str(comment_id), content="nice websockets demo"))
+    assert [key for key, _ in backend.search("thread", "websock*")] == [thread_id]
+    assert [key for key, _ in backend.search("comment", "demo")] == [comment_id]
+
+    backend.apply_event(_event("thread.updated", id=str(thread_id), title="Polling", description="http"))
+    backend.apply_event(_event("comment.deleted", id=str(comment_id)))
+    assert backend.search("thread", "websockets") == []
+    assert [key for key, _ in backend.search("thread", "polling")] == [thread_id]
+    assert backend.search("comment", "demo") == []
+
+
+def test_memory_backend_drops_every_removed_comment():
+    backend = InMemorySearchBackend()
+    leaf_id, parent_id = uuid4(), uuid4()
+    backend.apply_event(_event("comment.created", id=str(parent_id), content="redis parent"))
+    backend.apply_event(_event("comment.created", id=str(leaf_id), content="redis leaf"))
+
+    backend.apply_event(_event("comment.deleted", id=str(leaf_id), removed_ids=[str(leaf_id), str(parent_id)]))
+    assert backend.search("comment", "redis") == []
+
+
+def test_memory_backend_skips_bad_ids_and_keeps_applying_the_rest():
+    backend = InMemorySearchBackend()
+    first_id, second_id = uuid4(), uuid4()
+    backend.apply_event(_event("comment.created", id=str(first_id), content="redis first"))
+    backend.apply_event(_event("comment.created", id=str(second_id), content="redis second"))
+    backend.apply_event(_event("comment.created", content="no id"))
+
+    backend.apply_event(
+        _event("comment.deleted", id=str(first_id), removed_ids=[str(first_id), "not-a-uuid", None, str(second_id)])
+    )
+    assert backend.search("comment", "redis") == []
+
+
+def test_search_backend_interface_is_abstract():
+    class Partial(search_backend.SearchBackend):
+        def rebuild(self, db):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_memory_backend_is_refused_with_several_workers(monkeypatch):
+    monkeypatch.setattr(search_backend.settings, "search_backend", "memory")
+    monkeypatch.setattr(search_backend.settings, "web_concurrency", 4)
+    assert search_backend.configure_search_backend() is None
+    assert search_backend.get_search_backend() is None
+
+    monkeypatch.setattr(search_backend.settings, "web_concurrency", 1)
+    assert isinstance(search_backend.configure_search_backend(), InMemorySearchBackend)
+    search_backend.set_search_backend(None)
+
+
+def test_rebuild_replays_events_published_while_building(db_session, make_user, monkeypatch):
+    author = make_user("alice")
+    db_session.add(Thread(title="Indexed at startup", description="d", author_id=author.id))
+    db_session.commit()
+
+    backend = InMemorySearchBackend()
+    late_id = uuid4()
+    original_build = backend._build
+
+    def build_with_concurrent_write(db, batch_size):
+        result = original_build(db, batch_size)
+        backend.apply_event(_event("thread.created", id=str(late_id), title="Arrived late", description="d"))
+        return result
+
+    monkeypatch.setattr(backend, "_build", build_with_concurrent_write)
+    backend.rebuild(db_session)
+
+    assert len(backend.search("thread", "startup")) == 1
+    assert [key for key, _ in backend.search("thread", "late")] == [late_id]
+
+
+def test_publish_event_feeds_local_listeners(monkeypatch, published_events):
+    seen = []
+    monkeypatch.setattr(events, "_local_listeners", [seen.append])
+
+    events.publish_event("thread_updates", "thread.deleted", "t1", "u1", {"id": "t1"})
+
+    assert seen[0]["event"] == "thread.deleted"
+    assert published_events()[0][1] == seen[0]
+
+
+def test_repositories_rank_with_memory_backend_and_filter_in_database(db_session, make_user, monkeypatch):
+    author = make_user("alice")
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    strong = Thread(title="Redis streams", description="redis redis", author_id=author.id, created_at=base)
+    weak = Thread(
+        title="Caching",
+        description="we tried redis once",
+        author_id=author.id,
+        created_at=base + timedelta(hours=1),
+    )
+    hidden = Thread(
+        title="Redis",
+        description="redis",
+        author_id=author.id,
+        moderation_status="reported",
+    )
+    db_session.add_all([strong, weak, hidden])
+    db_session.flush()
+    db_session.add(Comment(content="redis <3", thread_id=strong.id, author_id=author.id))
+    db_session.commit()
+
+    backend = InMemorySearchBackend()
+    backend.rebuild(db_session)
+    monkeypatch.setattr(search_backend, "_backend", backend)
+    thread_repo = ThreadRepository(db_session)
+
+    ranked = thread_repo.search_threads("redis", 0, 10, moderation_status="pending")
+    assert [t.id for t in ranked] == [strong.id, weak.id]
+    assert ranked[0].search_rank > ranked[1].search_rank
+    assert thread_repo.count_search_threads("redis", moderation_status="pending") == 2
+
+    recent = thread_repo.search_threads("redis", 0, 10, moderation_status="pending", ranked=False)
+    assert [t.id for t in recent] == [weak.id, strong.id]
+
+    comments = CommentRepository(db_session).search_comments("redis", 0, 10)
+    assert comments[0].search_snippet == "<mark>redis</mark> &lt;3"
+
+
+def test_highlight_windows_around_first_hit():
+    text = " ".join(["filler"] * 40 + ["FastAPI"] + ["tail"] * 5)
+    snippet = highlight(text, "fast*", max_words=12)
+
+    assert snippet.startswith("... ")
+    assert "<mark>FastAPI</mark>" in snippet
+    assert not snippet.endswith(" ...")
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy import select
+
+from backend.services.auth_service.app.models.user import User
+from backend.services.discussion_service.app.api import comments as comments_api
+from backend.services.discussion_service.app.models.comment import Comment
+from backend.services.discussion_service.app.models.like import Like
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.shared.database.profiler import SQLProfilerMiddleware, fingerprint, query_budget as budget
+
+
+def test_fingerprint_folds_literals_and_parameter_lists():
+    assert fingerprint("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND n = 3") == (
+        fingerprint("SELECT *\n FROM t WHERE id IN (%(id_1_1)s) AND n = 'x'")
+    )
+    assert fingerprint("SELECT a FROM t WHERE b = $1 LIMIT 10") == "SELECT a FROM t WHERE b = ? LIMIT ?"
+
+
+def test_comment_search_checks_likes_in_one_query(db_session, make_user, query_budget):
+    viewer, author = make_user("viewer"), make_user("author")
+    thread = Thread(title="t", description="d", author_id=author.id)
+    db_session.add(thread)
+    db_session.flush()
+    comments = [Comment(content=f"cache tip {n}", thread_id=thread.id, author_id=author.id) for n in range(10)]
+    db_session.add_all(comments)
+    db_session.flush()
+    db_session.add_all(Like(user_id=viewer.id, comment_id=comment.id) for comment in comments[:3])
+    db_session.commit()
+
+    with query_budget(comments_api.search_comments) as profile:
+        page = comments_api.search_comments(
+            q="cache", page=1, size=10, cursor=None, sort="relevance", db=db_session, current_user=viewer
+        )
+
+    assert profile.repeated(3) == []
+    liked = {comment.id for comment in page["items"] if comment.is_liked_by_current_user}
+    assert liked == {comment.id for comment in comments[:3]}
+
+    with pytest.raises(AssertionError, match="1 queries, budget 0"):
+        with query_budget(0):
+            db_session.scalar(select(User.id))
+
+
+def test_middleware_adds_server_timing_and_warns(db_session, make_user, caplog):
+    make_user("alice")
+
+    @budget(2)
+    def endpoint():
+        pass
+
+    async def app(scope, _receive, send):
+        scope["endpoint"] = endpoint
+        for name in ("alice", "bob", "carol"):
+            db_session.scalar(select(User.id).where(User.username == name))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = SQLProfilerMiddleware(app, repeat_threshold=3)
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(middleware({"type": "http", "method": "GET", "path": "/users", "headers": []}, None, send))
+
+    timing = dict(sent[0]["headers"])[b"server-timing"].decode()
+    assert timing.startswith("db;dur=") and timing.endswith('desc="3 queries"')
+    assert "GET /users ran 3 queries, over its budget of 2" in caplog.text
+    assert "Possible N+1 on GET /users: 3 x SELECT users.id FROM users WHERE users.username = ?" in caplog.text
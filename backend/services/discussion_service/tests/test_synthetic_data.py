@@ -0,0 +1,71 @@
+from collections import Counter
+
+from sqlalchemy import create_engine, func, select
+
+from backend.scripts.synthetic_data import GeneratorConfig, generate
+from backend.services.auth_service.app.models.user import User
+from backend.services.discussion_service.app.models.comment import Comment
+from backend.services.discussion_service.app.models.like import Like
+from backend.services.discussion_service.app.models.thread import Thread
+
+CONFIG = GeneratorConfig(
+    users=60, threads=25, comments=400, seed=3, workers=1,
+    users_per_chunk=16, threads_per_chunk=4, likes_per_thread=4, likes_per_comment=1,
+)
+
+
+def _load(tmp_path, name, config=CONFIG):
+    url = f"sqlite+pysqlite:///{tmp_path / name}.db"
+    totals = generate(url, config, "shared-hash")
+    return create_engine(url), totals
+
+
+def _snapshot(engine):
+    with engine.connect() as connection:
+        return [
+            connection.execute(select(table).order_by(table.c.id)).all()
+            for table in (User.__table__, Thread.__table__, Comment.__table__, Like.__table__)
+        ]
+
+
+def test_same_seed_gives_identical_data(tmp_path):
+    first, totals = _load(tmp_path, "first")
+    second, _ = _load(tmp_path, "second")
+
+    assert totals["users"] == totals["user_roles"] == 60
+    assert totals["threads"] == 25 and totals["comments"] > 0
+    assert _snapshot(first) == _snapshot(second)
+    other, _ = _load(tmp_path, "other", GeneratorConfig(**{**CONFIG.__dict__, "seed": 4}))
+    assert _snapshot(other)[2] != _snapshot(first)[2]
+
+
+def test_counters_paths_and_hash_are_consistent(tmp_path):
+    engine, _ = _load(tmp_path, "data")
+    with engine.connect() as connection:
+        assert set(connection.scalars(select(User.hashed_password))) == {"shared-hash"}
+        comments = {row.id: row for row in connection.execute(select(Comment.__table__))}
+        threads = connection.execute(select(Thread.__table__)).all()
+        likes = connection.execute(select(Like.__table__)).all()
+
+    per_thread = Counter(comment.thread_id for comment in comments.values())
+    thread_likes = Counter(like.thread_id for like in likes if like.thread_id)
+    comment_likes = Counter(like.comment_id for like in likes if like.comment_id)
+    for thread in threads:
+        assert thread.comment_count == per_thread[thread.id]
+        assert thread.like_count == thread_likes[thread.id]
+
+    depths = Counter()
+    for comment in comments.values():
+        assert comment.like_count == comment_likes[comment.id]
+        depths[comment.depth] += 1
+        if comment.parent_id is None:
+            assert comment.depth == 0
+        else:
+            parent = comments[comment.parent_id]
+            assert comment.depth == parent.depth + 1
+            assert comment.path.startswith(parent.path) and comment.thread_id == parent.thread_id
+    # Replies thin out with depth.
+    assert depths[0] > depths[1] > depths[3]
+    assert len(comments) == sum(per_thread.values())
+    with engine.connect() as connection:
+        assert connection.scalar(select(func.count()).select_from(Like.__table__)) == len(likes)
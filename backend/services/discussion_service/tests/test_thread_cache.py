@@ -0,0 +1,182 @@
+import threading
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import redis
+
+from backend.services.discussion_service.app.core import thread_cache as thread_cache_module
+from backend.services.discussion_service.app.core.thread_cache import ThreadDetailCache
+from backend.services.discussion_service.app.services.thread_service import ThreadService
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        with self._lock:
+            if nx and key in self.store:
+                return None
+            self.store[key] = value
+            return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def eval(self, _script, _numkeys, key, lock_key, token, value, _ttl):
+        # thread_cache._SET_IF_LOCKED
+        with self._lock:
+            if self.store.get(lock_key) != token:
+                return 0
+            self.store[key] = value
+            return 1
+
+
+class DownRedis:
+    def get(self, _key):
+        raise redis.ConnectionError("down")
+
+
+def test_cold_key_is_built_once_then_served_from_cache():
+    cache = ThreadDetailCache(FakeRedis())
+    thread_id = uuid4()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"id": str(thread_id), "like_count": 3}
+
+    assert cache.get_or_build(thread_id, build) == {"id": str(thread_id), "like_count": 3}
+    assert cache.get_or_build(thread_id, build)["like_count"] == 3
+    assert len(builds) == 1
+    stats = cache.stats.snapshot()
+    assert (stats["hits"], stats["misses"], stats["rebuilds"]) == (1, 1, 1)
+    assert cache.client.get(f"{cache.key(thread_id)}:lock") is None
+
+
+def test_concurrent_misses_share_a_single_rebuild(monkeypatch):
+    monkeypatch.setattr(thread_cache_module.settings, "thread_cache_wait_ms", 2000)
+    cache = ThreadDetailCache(FakeRedis())
+    thread_id = uuid4()
+    builds = []
+    start = threading.Barrier(8)
+    results = []
+
+    def build():
+        builds.append(1)
+        time.sleep(0.1)
+        return {"id": str(thread_id)}
+
+    def reader():
+        start.wait()
+        results.append(cache.get_or_build(thread_id, build))
+
+    workers = [threading.Thread(target=reader) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len(builds) == 1
+    assert results == [{"id": str(thread_id)}] * 8
+    stats = cache.stats.snapshot()
+    assert stats["lock_waits"] == stats["coalesced"] > 0
+
+
+def test_invalidation_during_rebuild_keeps_stale_detail_out_of_cache():
+    cache = ThreadDetailCache(FakeRedis())
+    thread_id = uuid4()
+
+    def build():
+        # A write commits and invalidates while this rebuild is reading.
+        cache.invalidate(thread_id)
+        return {"like_count": 1}
+
+    assert cache.get_or_build(thread_id, build) == {"like_count": 1}
+    assert cache.key(thread_id) not in cache.client.store
+    assert cache.stats.snapshot()["stale_rebuilds"] == 1
+
+    assert cache.get_or_build(thread_id, lambda: {"like_count": 2}) == {"like_count": 2}
+    assert cache.get_or_build(thread_id, lambda: {"like_count": 3}) == {"like_count": 2}
+
+
+def test_redis_outage_falls_back_to_database():
+    cache = ThreadDetailCache(DownRedis())
+
+    assert cache.get_or_build(uuid4(), lambda: {"ok": True}) == {"ok": True}
+    assert cache.stats.snapshot()["errors"] == 1
+
+
+def test_only_detail_changing_events_invalidate():
+    cache = ThreadDetailCache(FakeRedis())
+    thread_id = str(uuid4())
+    key = cache.key(thread_id)
+
+    cache.client.store[key] = "{}"
+    cache.handle_event({"event": "comment.like.updated", "thread_id": thread_id})
+    assert key in cache.client.store
+
+    cache.handle_event({"event": "thread.like.updated", "thread_id": thread_id})
+    assert key not in cache.client.store
+
+
+def test_thread_detail_overlays_viewer_like_flag_on_shared_entry(monkeypatch):
+    cache = ThreadDetailCache(FakeRedis())
+    monkeypatch.setattr(
+        "backend.services.discussion_service.app.services.thread_service.thread_cache",
+        cache,
+    )
+    now = datetime.now(timezone.utc)
+    thread = SimpleNamespace(
+        id=uuid4(),
+        author_id=uuid4(),
+        title="Cached thread",
+        description="d",
+        image_url=None,
+        is_deleted=False,
+        is_locked=False,
+        moderation_status="approved",
+        created_at=now,
+        updated_at=now,
+        like_count=4,
+        comment_count=2,
+    )
+    lookups = []
+    liked_by = set()
+
+    class FakeThreadRepo:
+        def get_by_id(self, thread_id):
+            lookups.append(thread_id)
+            return thread
+
+    class FakeLikeRepo:
+        def __init__(self, _db):
+            pass
+
+        def is_thread_liked_by_user(self, _thread_id, user_id):
+            return user_id in liked_by
+
+    monkeypatch.setattr(
+        "backend.services.discussion_service.app.services.thread_service.LikeRepository",
+        FakeLikeRepo,
+    )
+    service = ThreadService(SimpleNamespace())
+    service.thread_repo = FakeThreadRepo()
+    fan, stranger = SimpleNamespace(id=uuid4()), SimpleNamespace(id=uuid4())
+    liked_by.add(fan.id)
+
+    as_fan = service.get_thread_detail(thread.id, fan)
+    as_stranger = service.get_thread_detail(thread.id, stranger)
+
+    assert len(lookups) == 1
+    assert as_fan["is_liked_by_current_user"] is True
+    assert as_stranger["is_liked_by_current_user"] is False
+    assert as_stranger["like_count"] == 4
+    assert "is_liked_by_current_user" not in cache.client.store[cache.key(thread.id)]
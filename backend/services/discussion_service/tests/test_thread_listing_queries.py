@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from backend.services.discussion_service.app.services.thread_service import ThreadService
+
+
+class CountingDB:
+    """Fake session that records every statement sent to the database."""
+
+    def __init__(self, liked_ids=None):
+        self.statements = []
+        self.liked_ids = liked_ids or set()
+
+    def execute(self, query):
+        self.statements.append(query)
+        return SimpleNamespace(all=lambda: [])
+
+    def scalars(self, query):
+        self.statements.append(query)
+        if "likes" in str(query):
+            return list(self.liked_ids)
+        return []
+
+    def scalar(self, query):
+        self.statements.append(query)
+        return None
+
+
+def _make_threads(count):
+    return [
+        SimpleNamespace(
+            id=uuid4(),
+            author_id=uuid4(),
+            created_at=datetime.now(timezone.utc),
+            like_count=index,
+            comment_count=0,
+        )
+        for index in range(count)
+    ]
+
+
+def _list_with_page_size(size):
+    threads = _make_threads(size)
+    db = CountingDB(liked_ids={threads[-1].id})
+    service = ThreadService(db)
+    service.thread_repo = SimpleNamespace(
+        list_threads=lambda _skip, _limit: threads,
+        count_threads=lambda: size,
+    )
+    out = service.list_threads(1, size, SimpleNamespace(id=uuid4()))
+    return out, db
+
+
+def test_list_threads_query_count_is_independent_of_page_size():
+    _, small_db = _list_with_page_size(2)
+    _, large_db = _list_with_page_size(50)
+
+    assert len(small_db.statements) == len(large_db.statements)
+    # liked set and authors; counters come from the thread rows
+    assert len(large_db.statements) == 2
+
+
+def test_list_threads_batched_like_data_is_attached_per_thread():
+    out, _ = _list_with_page_size(3)
+    items = out["items"]
+
+    assert [thread.like_count for thread in items] == [0, 1, 2]
+    assert [thread.is_liked_by_current_user for thread in items] == [False, False, True]
+
+
+def test_list_threads_without_viewer_skips_liked_lookup():
+    threads = _make_threads(5)
+    db = CountingDB()
+    service = ThreadService(db)
+    service.thread_repo = SimpleNamespace(
+        list_threads=lambda _skip, _limit: threads,
+        count_threads=lambda: 5,
+    )
+
+    out = service.list_threads(1, 5, None)
+
+    assert len(db.statements) == 1
+    assert all(thread.is_liked_by_current_user is False for thread in out["items"])
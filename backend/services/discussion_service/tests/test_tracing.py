@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+
+from backend.services.discussion_service.app.core import events
+from backend.services.notification_service.app.core import redis_listener
+from backend.shared.tracing import tracer
+from backend.shared.tracing.exporters import FileExporter, otlp_payload
+from backend.shared.tracing.tracer import SpanContext, extract, start_span
+
+
+class MemoryProcessor:
+    def __init__(self):
+        self.spans = []
+
+    def submit(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def spans():
+    processor = MemoryProcessor()
+    tracer.set_processor(processor)
+    yield processor.spans
+    tracer.set_processor(None)
+
+
+def test_traceparent_round_trip_and_rejects_garbage():
+    context = SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", sampled=True)
+    assert context.traceparent == "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    assert SpanContext.parse(context.traceparent) == context
+    assert SpanContext.parse("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert SpanContext.parse("not-a-traceparent") is None
+
+
+def test_disabled_tracing_leaves_events_untouched(published_events):
+    with start_span("request") as span:
+        events.publish_event("discussion_events", "thread.liked", "t1", "u1", {})
+
+    assert span is None
+    assert "traceparent" not in published_events()[0][1]
+
+
+def test_like_event_trace_continues_through_notification_listener(monkeypatch, spans, published_events):
+    notifications = []
+
+    class NotificationRedis:
+        async def publish(self, channel, message):
+            notifications.append(json.loads(message))
+
+    class FakeDB:
+        def close(self):
+            pass
+
+        def scalar(self, _query):
+            return None
+
+    class FakeRepo:
+        def __init__(self, _db):
+            pass
+
+        def get_by_source_event(self, _event_id):
+            return None
+
+        def exists_notification(self, **_kwargs):
+            return False
+
+        def create(self, notification):
+            notification.id = "00000000-0000-0000-0000-000000000001"
+            return notification
+
+    monkeypatch.setattr(redis_listener, "redis_client", NotificationRedis())
+    monkeypatch.setattr(redis_listener, "SessionLocal", lambda: FakeDB())
+    monkeypatch.setattr(redis_listener, "NotificationRepository", FakeRepo)
+
+    owner, actor, thread = (
+        "11111111-1111-1111-1111-111111111111",
+        "22222222-2222-2222-2222-222222222222",
+        "33333333-3333-3333-3333-333333333333",
+    )
+    with start_span("POST /likes/threads/{thread_id}", kind="server") as request:
+        events.publish_event("discussion_events", "thread.liked", thread, actor, {"owner_id": owner})
+
+    event = published_events()[0][1]
+    with start_span("handle_event", parent=extract(event), kind="consumer"):
+        asyncio.run(redis_listener.handle_event(event))
+
+    notification = notifications[0]
+    assert notification["origin_timestamp"] == event["timestamp"]
+    assert extract(notification).trace_id == request.context.trace_id
+
+    by_name = {span.name: span for span in spans}
+    assert set(by_name) == {"POST /likes/threads/{thread_id}", "publish_event", "handle_event", "publish_notification"}
+    assert by_name["publish_event"].parent_id == request.context.span_id
+    assert by_name["handle_event"].parent_id == by_name["publish_event"].context.span_id
+    assert by_name["publish_notification"].parent_id == by_name["handle_event"].context.span_id
+
+
+def test_exporters_write_spans(tmp_path, spans):
+    with pytest.raises(ValueError):
+        with start_span("broadcast", room_type="feed", recipients=3):
+            raise ValueError("socket closed")
+
+    FileExporter(str(tmp_path / "traces.jsonl")).export(spans)
+    record = json.loads((tmp_path / "traces.jsonl").read_text())
+    assert record["name"] == "broadcast"
+    assert record["attributes"] == {"room_type": "feed", "recipients": 3}
+    assert record["error"] == "ValueError: socket closed"
+
+    otlp_span = otlp_payload(spans)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert otlp_span["traceId"] == spans[0].context.trace_id
+    assert otlp_span["status"] == {"code": 2, "message": "ValueError: socket closed"}
+    assert {"key": "recipients", "value": {"intValue": "3"}} in otlp_span["attributes"]
@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from backend.services.discussion_service.app.models.comment import Comment
+from backend.services.discussion_service.app.models.thread import Thread
+from backend.services.discussion_service.app.models.thread_report import ThreadReport
+from backend.services.discussion_service.app.services import report_service, thread_service
+from backend.services.discussion_service.app.services.comment_service import CommentService
+from backend.services.discussion_service.app.services.report_service import ReportService
+from backend.shared.database.unit_of_work import on_commit, unit_of_work
+
+
+@pytest.fixture
+def db(db_session):
+    """A session configured like SessionLocal: nothing expires on commit."""
+    session = Session(db_session.get_bind(), expire_on_commit=False)
+    yield session
+    session.close()
+
+
+def _record(db):
+    log = []
+    event.listen(db, "after_commit", lambda _session: log.append("commit"))
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: log.append(args[2]))
+    return log
+
+
+def test_nested_units_commit_once_and_defer_callbacks(db, make_user):
+    author = db.merge(make_user("alice"))
+    log = _record(db)
+
+    with unit_of_work(db):
+        with unit_of_work(db):
+            db.add(Thread(title="t", description="d", author_id=author.id))
+            on_commit(db, lambda: log.append("callback"))
+        assert "commit" not in log
+    assert log[-2:] == ["commit", "callback"]
+    assert log.count("commit") == 1
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            db.add(Thread(title="lost", description="d", author_id=author.id))
+            on_commit(db, lambda: log.append("never"))
+            raise RuntimeError
+    assert "never" not in log
+    assert db.scalar(select(Thread.title).where(Thread.title == "lost")) is None
+
+
+def test_report_thread_is_one_transaction(db_session, db, make_user, monkeypatch):
+    alice, bob = make_user("alice"), make_user("bob")
+    thread = Thread(title="t", description="d", author_id=alice.id)
+    db_session.add(thread)
+    db_session.commit()
+    thread_id, bob_id = thread.id, bob.id
+    log = _record(db)
+    monkeypatch.setattr(thread_service.thread_cache, "invalidate", lambda tid: log.append(("invalidate", tid)))
+    monkeypatch.setattr(thread_service, "invalidate_counts", lambda *_args: None)
+    monkeypatch.setattr(report_service, "invalidate_counts", lambda *_args: None)
+
+    report = ReportService(db).report_thread(thread_id, bob_id, "spam")
+
+    assert log.count("commit") == 1
+    # The cache is invalidated only once the status change is committed.
+    assert log.index(("invalidate", thread_id)) > log.index("commit")
+    # Written rows are usable without a refresh.
+    statements = len(log)
+    assert report.status == "reported" and report.created_at is not None
+    assert len(log) == statements
+    assert db_session.scalar(select(Thread.moderation_status).where(Thread.id == thread_id)) == "reported"
+    assert db_session.scalar(select(ThreadReport.reason)) == "spam"
+
+
+def test_create_comment_commits_counter_with_row(db, make_user, monkeypatch):
+    monkeypatch.setattr(
+        "backend.services.discussion_service.app.services.comment_service.publish_event",
+        lambda **_kwargs: None,
+    )
+    author = db.merge(make_user("alice"))
+    thread = Thread(title="t", description="d", author_id=author.id)
+    db.add(thread)
+    db.commit()
+    log = _record(db)
+
+    comment = CommentService(db).create_comment(thread.id, "hello", author.id, None)
+
+    assert log.count("commit") == 1
+    after_commit = log[log.index("commit") + 1:]
+    assert any(statement.startswith("INSERT INTO comments") for statement in log[:log.index("commit")])
+    # Only the author enrichment runs afterwards; the new row is not reloaded.
+    assert len(after_commit) == 1 and "FROM users" in after_commit[0]
+    assert comment.content == "hello" and comment.like_count == 0
+    assert db.get(Thread, thread.id).comment_count == 1
+    assert db.scalar(select(Comment.id)) == comment.id
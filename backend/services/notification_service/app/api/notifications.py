@@ -1,38 +1,46 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.services.auth_service.app.core.security import get_current_user
+from backend.services.auth_service.app.core.security import get_current_user, get_current_user_async
 from backend.services.notification_service.app.schemas.notification import (
     NotificationListResponse,
     NotificationRead,
     NotificationUnreadCountResponse,
 )
-from backend.services.notification_service.app.services.notification_service import NotificationService
+from backend.services.notification_service.app.services.notification_service import (
+    AsyncNotificationService,
+    NotificationService,
+)
+from backend.shared.database.async_session import get_async_db
 from backend.shared.database.session import get_db
+from backend.shared.database.profiler import query_budget
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
 @router.get("/me", response_model=NotificationListResponse)
-def list_my_notifications(
+@query_budget(4)
+async def list_my_notifications(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
 ):
-    service = NotificationService(db)
-    return service.list_my_notifications(current_user.id, page, size)
+    service = AsyncNotificationService(db)
+    return await service.list_my_notifications(current_user.id, page, size)
 
 
 @router.get("/unread-count", response_model=NotificationUnreadCountResponse)
-def unread_count(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+@query_budget(3)
+async def unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
 ):
-    service = NotificationService(db)
-    return {"unread_count": service.unread_count(current_user.id)}
+    service = AsyncNotificationService(db)
+    return {"unread_count": await service.unread_count(current_user.id)}
 
 
 @router.patch("/{notification_id}/read", response_model=NotificationRead)
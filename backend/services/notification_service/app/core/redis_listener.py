@@ -1,5 +1,4 @@
 import redis.asyncio as redis
-import json
 import os
 from uuid import UUID
 from sqlalchemy import select
@@ -8,6 +7,12 @@ from backend.services.notification_service.app.repositories.notification_reposit
 from backend.services.notification_service.app.models.notification import Notification
 from backend.services.auth_service.app.models.user import User
 from backend.shared.database.session import SessionLocal
+from backend.shared.database.unit_of_work import unit_of_work
+from backend.shared.events.codec import EVENT_REDIS_OPTIONS, event_codec
+from backend.shared.events.envelope import check_envelope
+from backend.shared.events.streams import StreamConsumer, queue_publish, stream_settings
+from backend.shared.metrics.pubsub import record_consumed, timed_publish
+from backend.shared.tracing.tracer import extract, inject, start_span
 
 
 def get_redis_port() -> int:
@@ -21,12 +26,22 @@ redis_client = redis.Redis(
     host=os.getenv("REDIS_HOST", "localhost"),
     port=get_redis_port(),
     decode_responses=True,
+    **EVENT_REDIS_OPTIONS,
 )
 
 LIKE_NOTIFICATION_COOLDOWN_SECONDS = 30
 
 
+NOTIFICATION_GROUP = "notification_service"
+
+
 async def start_notification_listener():
+    if stream_settings.enabled:
+        print("Notification service reading the discussion_events stream...")
+        consumer = StreamConsumer(redis_client, "discussion_events", NOTIFICATION_GROUP, consume_event)
+        await consumer.run()
+        return
+
     print("Notification service listening...")
 
     pubsub = redis_client.pubsub()
@@ -37,14 +52,49 @@ async def start_notification_listener():
             continue
 
         try:
-            data = json.loads(message["data"])
-            await handle_event(data)
-        except json.JSONDecodeError:
-            print("Invalid JSON in discussion_events payload")
+            data = event_codec.decode(message["data"])
+        except ValueError:
+            record_consumed("notification", "discussion_events", None, outcome="invalid")
+            print("Invalid discussion_events payload")
+            continue
+        try:
+            await consume_event(data)
         except Exception as e:
             print(f"Notification listener error: {e}")
 
 
+async def consume_event(data: dict) -> None:
+    """Handle one discussion event; raising leaves a stream entry unacknowledged for retry."""
+    try:
+        check_envelope(data)
+        with start_span("handle_event", parent=extract(data), kind="consumer", event=data.get("event")):
+            await handle_event(data)
+    except Exception:
+        record_consumed("notification", "discussion_events", data, outcome="error")
+        raise
+    record_consumed("notification", "discussion_events", data)
+
+
+async def _publish(channel: str, message: dict, event: dict) -> None:
+    # Keep the source event's publish time and trace so realtime can measure
+    # and trace the whole path to the socket.
+    message["origin_timestamp"] = event.get("timestamp")
+    with start_span("publish_notification", kind="producer", channel=channel, event=message.get("event")):
+        inject(message)
+        with timed_publish("notification", channel):
+            await queue_publish(redis_client, channel, event_codec.encode(message))
+
+
+def _save_notification(db, repo, notification: Notification, event: dict, delivered: Notification | None):
+    """Store `notification` for `event`, or return the row an earlier delivery of it stored."""
+    if delivered is not None:
+        return delivered
+    notification.source_event_id = event.get("event_id")
+    with unit_of_work(db):
+        repo.create(notification)
+    return notification
+
+
 async def handle_event(event: dict):
     event_type = event.get("event")
     thread_id = event.get("thread_id")
@@ -58,6 +108,11 @@ async def handle_event(event: dict):
     repo = NotificationRepository(db)
 
     try:
+        event_id = event.get("event_id")
+        # Streams retry unacknowledged entries and the outbox relays at least
+        # once, so the same event can arrive again after its row was stored.
+        delivered = repo.get_by_source_event(event_id) if event_id else None
+
         actor_user = db.scalar(select(User).where(User.id == UUID(actor_id))) if actor_id else None
         actor_name = actor_user.username if actor_user else "Someone"
 
@@ -72,7 +127,8 @@ async def handle_event(event: dict):
             if receiver_id == actor_uuid:
                 return
             if (
-                hasattr(repo, "exists_notification")
+                delivered is None
+                and hasattr(repo, "exists_notification")
                 and repo.exists_notification(
                     user_id=receiver_id,
                     actor_id=actor_uuid,
@@ -91,22 +147,21 @@ async def handle_event(event: dict):
                 message=f"{actor_name} liked your thread",
             )
 
-            repo.create(notification)
+            notification = _save_notification(db, repo, notification, event, delivered)
 
-            await redis_client.publish(
+            await _publish(
                 "user_notifications",
-                json.dumps(
-                    {
-                        "type": "notification",
-                        "user_id": str(receiver_id),
-                        "message": notification.message,
-                        "notification_id": str(notification.id),
-                        "event": event_type,
-                        "thread_id": str(thread_uuid),
-                        "actor_id": str(actor_uuid),
-                        "reference_id": str(thread_uuid),
-                    }
-                ),
+                {
+                    "type": "notification",
+                    "user_id": str(receiver_id),
+                    "message": notification.message,
+                    "notification_id": str(notification.id),
+                    "event": event_type,
+                    "thread_id": str(thread_uuid),
+                    "actor_id": str(actor_uuid),
+                    "reference_id": str(thread_uuid),
+                },
+                event,
             )
 
         elif event_type == "comment.liked":
@@ -121,7 +176,8 @@ async def handle_event(event: dict):
             if receiver_id == actor_uuid:
                 return
             if (
-                hasattr(repo, "exists_notification")
+                delivered is None
+                and hasattr(repo, "exists_notification")
                 and repo.exists_notification(
                     user_id=receiver_id,
                     actor_id=actor_uuid,
@@ -140,23 +196,22 @@ async def handle_event(event: dict):
                 message=f"{actor_name} liked your comment",
             )
 
-            repo.create(notification)
+            notification = _save_notification(db, repo, notification, event, delivered)
 
-            await redis_client.publish(
+            await _publish(
                 "user_notifications",
-                json.dumps(
-                    {
-                        "type": "notification",
-                        "user_id": str(receiver_id),
-                        "message": notification.message,
-                        "notification_id": str(notification.id),
-                        "event": event_type,
-                        "thread_id": str(thread_uuid),
-                        "comment_id": str(comment_id),
-                        "actor_id": str(actor_uuid),
-                        "reference_id": str(thread_uuid),
-                    }
-                ),
+                {
+                    "type": "notification",
+                    "user_id": str(receiver_id),
+                    "message": notification.message,
+                    "notification_id": str(notification.id),
+                    "event": event_type,
+                    "thread_id": str(thread_uuid),
+                    "comment_id": str(comment_id),
+                    "actor_id": str(actor_uuid),
+                    "reference_id": str(thread_uuid),
+                },
+                event,
             )
 
         elif event_type == "mention":
@@ -183,25 +238,24 @@ async def handle_event(event: dict):
                 message=f"{actor_name} mentioned you in a {source_type}",
             )
 
-            repo.create(notification)
+            notification = _save_notification(db, repo, notification, event, delivered)
 
-            await redis_client.publish(
+            await _publish(
                 "user_notifications",
-                json.dumps(
-                    {
-                        "type": "notification",
-                        "user_id": str(receiver_id),
-                        "message": notification.message,
-                        "notification_id": str(notification.id),
-                        "event": event_type,
-                        "thread_id": thread_id,
-                        "actor_id": str(actor_uuid),
-                        "source_id": str(source_uuid),
-                        "source_type": source_type,
-                        "reference_id": str(reference_uuid),
-                        "preview": preview,
-                    }
-                ),
+                {
+                    "type": "notification",
+                    "user_id": str(receiver_id),
+                    "message": notification.message,
+                    "notification_id": str(notification.id),
+                    "event": event_type,
+                    "thread_id": thread_id,
+                    "actor_id": str(actor_uuid),
+                    "source_id": str(source_uuid),
+                    "source_type": source_type,
+                    "reference_id": str(reference_uuid),
+                    "preview": preview,
+                },
+                event,
             )
 
         elif event_type == "comment.replied":
@@ -226,24 +280,23 @@ async def handle_event(event: dict):
                 message=f"{actor_name} replied to your comment",
             )
 
-            repo.create(notification)
+            notification = _save_notification(db, repo, notification, event, delivered)
 
-            await redis_client.publish(
+            await _publish(
                 "user_notifications",
-                json.dumps(
-                    {
-                        "type": "notification",
-                        "user_id": str(receiver_uuid),
-                        "message": notification.message,
-                        "notification_id": str(notification.id),
-                        "event": event_type,
-                        "thread_id": str(thread_uuid),
-                        "actor_id": str(actor_uuid),
-                        "comment_id": str(comment_uuid),
-                        "reference_id": str(thread_uuid),
-                        "preview": preview,
-                    }
-                ),
+                {
+                    "type": "notification",
+                    "user_id": str(receiver_uuid),
+                    "message": notification.message,
+                    "notification_id": str(notification.id),
+                    "event": event_type,
+                    "thread_id": str(thread_uuid),
+                    "actor_id": str(actor_uuid),
+                    "comment_id": str(comment_uuid),
+                    "reference_id": str(thread_uuid),
+                    "preview": preview,
+                },
+                event,
             )
 
         elif event_type == "thread.commented":
@@ -266,24 +319,23 @@ async def handle_event(event: dict):
                 reference_id=thread_uuid,
                 message=f"{actor_name} commented on your thread",
             )
-            repo.create(notification)
+            notification = _save_notification(db, repo, notification, event, delivered)
 
-            await redis_client.publish(
+            await _publish(
                 "user_notifications",
-                json.dumps(
-                    {
-                        "type": "notification",
-                        "user_id": str(receiver_uuid),
-                        "message": notification.message,
-                        "notification_id": str(notification.id),
-                        "event": event_type,
-                        "thread_id": str(thread_uuid),
-                        "actor_id": str(actor_uuid),
-                        "comment_id": str(comment_id) if comment_id else None,
-                        "reference_id": str(thread_uuid),
-                        "preview": preview,
-                    }
-                ),
+                {
+                    "type": "notification",
+                    "user_id": str(receiver_uuid),
+                    "message": notification.message,
+                    "notification_id": str(notification.id),
+                    "event": event_type,
+                    "thread_id": str(thread_uuid),
+                    "actor_id": str(actor_uuid),
+                    "comment_id": str(comment_id) if comment_id else None,
+                    "reference_id": str(thread_uuid),
+                    "preview": preview,
+                },
+                event,
             )
 
     finally:
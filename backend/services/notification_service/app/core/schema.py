@@ -0,0 +1,22 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Lightweight schema sync for local/dev where migrations are not set up.
+COLUMN_STATEMENTS = [
+    # Source envelope of each notification, so redelivered events are not stored twice.
+    "ALTER TABLE notifications ADD COLUMN IF NOT EXISTS source_event_id VARCHAR(64)",
+]
+
+# create_all only builds indexes for new tables; keep existing ones in step.
+INDEX_STATEMENTS = [
+    (
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_notifications_source_event_id "
+        "ON notifications (source_event_id)"
+    ),
+]
+
+
+def sync_schema(connection: Connection) -> None:
+    """Apply additive schema changes that create_all does not cover."""
+    for statement in COLUMN_STATEMENTS + INDEX_STATEMENTS:
+        connection.execute(text(statement))
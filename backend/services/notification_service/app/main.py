@@ -5,10 +5,17 @@ import asyncio
 import os
 
 from backend.services.notification_service.app.core.redis_listener import start_notification_listener
+from backend.services.notification_service.app.core.schema import sync_schema
 from backend.services.notification_service.app.models.notification import Notification
 from backend.services.notification_service.app.api.notifications import router as notifications_router
+from backend.services.notification_service.app.api.diagnostics import router as diagnostics_router
 from backend.shared.database.base import Base
+from backend.shared.database.async_session import dispose_async_engine
 from backend.shared.database.engine import engine
+from backend.shared.database.profiler import SQLProfilerMiddleware
+from backend.shared.metrics.http import MetricsMiddleware, router as metrics_router
+from backend.shared.tracing.http import TracingMiddleware
+from backend.shared.tracing.tracer import setup_tracing
 
 
 def get_cors_origins() -> list[str]:
@@ -23,19 +30,30 @@ def get_cors_origins() -> list[str]:
 async def lifespan(app: FastAPI):
     with engine.connect():
         Base.metadata.create_all(bind=engine)
+    try:
+        with engine.begin() as connection:
+            sync_schema(connection)
+    except Exception as e:
+        print("Schema sync error in notification service:", e)
 
     listener_task = asyncio.create_task(start_notification_listener())
     try:
         yield
     finally:
         listener_task.cancel()
+        await dispose_async_engine()
+
 
+setup_tracing("notification_service")
 
 app = FastAPI(
     title="Notification Service",
     lifespan=lifespan,
 )
 
+app.add_middleware(SQLProfilerMiddleware)
+app.add_middleware(MetricsMiddleware, service="notification")
+app.add_middleware(TracingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=get_cors_origins(),
@@ -44,4 +62,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(metrics_router)
 app.include_router(notifications_router)
+app.include_router(diagnostics_router)
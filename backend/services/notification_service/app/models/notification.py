@@ -44,6 +44,15 @@ class Notification(Base):
         nullable=False,
     )
 
+    # event_id of the envelope that produced this notification, so a
+    # redelivered event finds it instead of inserting a second row.
+    source_event_id: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        unique=True,
+        index=True,
+    )
+
     is_read: Mapped[bool] = mapped_column(
         Boolean,
         default=False,
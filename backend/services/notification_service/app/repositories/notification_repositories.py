@@ -1,10 +1,13 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 from typing import List
 from uuid import UUID
 from datetime import datetime, timezone, timedelta
 
 from backend.services.notification_service.app.models.notification import Notification
+from backend.shared.database.counts import invalidate_counts
+from backend.shared.database.unit_of_work import on_commit
 
 
 class NotificationRepository:
@@ -14,10 +17,14 @@ class NotificationRepository:
 
     def create(self, notification: Notification) -> Notification:
         self.db.add(notification)
-        self.db.commit()
-        self.db.refresh(notification)
+        self.db.flush()
+        on_commit(self.db, lambda: invalidate_counts(f"notifications:{notification.user_id}"))
         return notification
 
+    def get_by_source_event(self, event_id: str) -> Notification | None:
+        query = select(Notification).where(Notification.source_event_id == event_id)
+        return self.db.scalar(query)
+
     def get_user_notifications(self, user_id: UUID) -> List[Notification]:
         query = (
             select(Notification)
@@ -26,26 +33,31 @@ class NotificationRepository:
         )
         return list(self.db.scalars(query))
 
-    def list_user_notifications(self, user_id: UUID, *, skip: int, limit: int) -> List[Notification]:
-        query = (
+    @staticmethod
+    def _list_query(user_id: UUID, skip: int, limit: int):
+        return (
             select(Notification)
             .where(Notification.user_id == user_id)
             .order_by(Notification.created_at.desc())
             .offset(skip)
             .limit(limit)
         )
-        return list(self.db.scalars(query))
+
+    @staticmethod
+    def _count_query(user_id: UUID, unread_only: bool = False):
+        filters = [Notification.user_id == user_id]
+        if unread_only:
+            filters.append(Notification.is_read == False)
+        return select(func.count()).select_from(Notification).where(*filters)
+
+    def list_user_notifications(self, user_id: UUID, *, skip: int, limit: int) -> List[Notification]:
+        return list(self.db.scalars(self._list_query(user_id, skip, limit)))
 
     def count_user_notifications(self, user_id: UUID) -> int:
-        query = select(func.count()).select_from(Notification).where(Notification.user_id == user_id)
-        return self.db.scalar(query)
+        return self.db.scalar(self._count_query(user_id))
 
     def count_unread_notifications(self, user_id: UUID) -> int:
-        query = select(func.count()).select_from(Notification).where(
-            Notification.user_id == user_id,
-            Notification.is_read == False,
-        )
-        return self.db.scalar(query)
+        return self.db.scalar(self._count_query(user_id, unread_only=True))
 
     def get_user_notification_by_id(self, notification_id: UUID, user_id: UUID) -> Notification | None:
         query = select(Notification).where(
@@ -56,23 +68,21 @@ class NotificationRepository:
 
     def mark_as_read(self, notification: Notification) -> Notification:
         notification.is_read = True
-        self.db.commit()
-        self.db.refresh(notification)
+        self.db.flush()
         return notification
 
     def mark_all_as_read(self, user_id: UUID) -> int:
-        notifications = list(
-            self.db.scalars(
-                select(Notification).where(
-                    Notification.user_id == user_id,
-                    Notification.is_read == False,
-                )
+        """Flag every unread notification in one UPDATE and return how many changed."""
+        result = self.db.execute(
+            update(Notification)
+            .where(
+                Notification.user_id == user_id,
+                Notification.is_read == False,
             )
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
         )
-        for notification in notifications:
-            notification.is_read = True
-        self.db.commit()
-        return len(notifications)
+        return result.rowcount or 0
 
     def exists_notification(
         self,
@@ -95,3 +105,22 @@ class NotificationRepository:
 
         query = select(Notification.id).where(*filters).limit(1)
         return self.db.scalar(query) is not None
+
+
+class AsyncNotificationRepository:
+    """
+    Notification reads on an AsyncSession, sharing NotificationRepository's queries.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_user_notifications(self, user_id: UUID, *, skip: int, limit: int) -> List[Notification]:
+        query = NotificationRepository._list_query(user_id, skip, limit)
+        return list(await self.db.scalars(query))
+
+    async def count_user_notifications(self, user_id: UUID) -> int:
+        return await self.db.scalar(NotificationRepository._count_query(user_id))
+
+    async def count_unread_notifications(self, user_id: UUID) -> int:
+        return await self.db.scalar(NotificationRepository._count_query(user_id, unread_only=True))
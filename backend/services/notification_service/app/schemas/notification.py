@@ -21,6 +21,7 @@ class NotificationListResponse(BaseModel):
     page: int
     size: int
     items: list[NotificationRead]
+    total_is_estimate: bool = False
 
 
 class NotificationUnreadCountResponse(BaseModel):
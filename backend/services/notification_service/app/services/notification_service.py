@@ -2,21 +2,32 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 
-from backend.services.notification_service.app.repositories.notification_repositories import NotificationRepository
+from backend.services.notification_service.app.repositories.notification_repositories import (
+    AsyncNotificationRepository,
+    NotificationRepository,
+)
+from backend.shared.database.counts import count_total, count_total_async
+from backend.shared.database.unit_of_work import unit_of_work
 
 
 class NotificationService:
     def __init__(self, db):
         """Initialize the notification service with its repository dependency."""
+        self.db = db
         self.repo = NotificationRepository(db)
 
     def list_my_notifications(self, user_id: UUID, page: int, size: int):
         """Return paginated notifications for a user."""
         skip = (page - 1) * size
         items = self.repo.list_user_notifications(user_id, skip=skip, limit=size)
-        total = self.repo.count_user_notifications(user_id)
+        counted = count_total(
+            "notifications.list",
+            lambda: self.repo.count_user_notifications(user_id),
+            namespace=f"notifications:{user_id}",
+        )
         return {
-            "total": total,
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
             "page": page,
             "size": size,
             "items": items,
@@ -31,8 +42,37 @@ class NotificationService:
         notification = self.repo.get_user_notification_by_id(notification_id, user_id)
         if not notification:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
-        return self.repo.mark_as_read(notification)
+        with unit_of_work(self.db):
+            return self.repo.mark_as_read(notification)
 
     def mark_all_read(self, user_id: UUID) -> int:
         """Mark all notifications as read for a user and return affected count."""
-        return self.repo.mark_all_as_read(user_id)
+        with unit_of_work(self.db):
+            return self.repo.mark_all_as_read(user_id)
+
+
+class AsyncNotificationService:
+    def __init__(self, db):
+        """Initialize the async notification service for the polled read routes."""
+        self.repo = AsyncNotificationRepository(db)
+
+    async def list_my_notifications(self, user_id: UUID, page: int, size: int):
+        """Return paginated notifications for a user."""
+        skip = (page - 1) * size
+        items = await self.repo.list_user_notifications(user_id, skip=skip, limit=size)
+        counted = await count_total_async(
+            "notifications.list",
+            lambda: self.repo.count_user_notifications(user_id),
+            namespace=f"notifications:{user_id}",
+        )
+        return {
+            "total": counted.total,
+            "total_is_estimate": counted.is_estimate,
+            "page": page,
+            "size": size,
+            "items": items,
+        }
+
+    async def unread_count(self, user_id: UUID) -> int:
+        """Return the unread notification count for a user."""
+        return await self.repo.count_unread_notifications(user_id)
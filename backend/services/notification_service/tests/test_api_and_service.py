@@ -1,3 +1,4 @@
+import asyncio
 import os
 from types import SimpleNamespace
 from uuid import uuid4
@@ -13,16 +14,20 @@ from backend.services.notification_service.app.services.notification_service imp
 
 
 def test_notifications_api_routes_delegate_to_service(monkeypatch):
-    class FakeService:
+    class FakeAsyncService:
         def __init__(self, _db):
             pass
 
-        def list_my_notifications(self, _uid, _page, _size):
+        async def list_my_notifications(self, _uid, _page, _size):
             return {"total": 1, "page": 1, "size": 20, "items": []}
 
-        def unread_count(self, _uid):
+        async def unread_count(self, _uid):
             return 3
 
+    class FakeService:
+        def __init__(self, _db):
+            pass
+
         def mark_one_read(self, _nid, _uid):
             return SimpleNamespace(
                 id=uuid4(),
@@ -39,10 +44,11 @@ def test_notifications_api_routes_delegate_to_service(monkeypatch):
             return 5
 
     monkeypatch.setattr(notifications_api, "NotificationService", FakeService)
+    monkeypatch.setattr(notifications_api, "AsyncNotificationService", FakeAsyncService)
     user = SimpleNamespace(id=uuid4())
 
-    out_list = notifications_api.list_my_notifications(db=object(), current_user=user)
-    out_count = notifications_api.unread_count(db=object(), current_user=user)
+    out_list = asyncio.run(notifications_api.list_my_notifications(page=1, size=20, db=object(), current_user=user))
+    out_count = asyncio.run(notifications_api.unread_count(db=object(), current_user=user))
     out_mark_all = notifications_api.mark_all_read(db=object(), current_user=user)
 
     assert out_list["total"] == 1
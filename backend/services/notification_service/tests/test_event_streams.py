@@ -0,0 +1,230 @@
+import asyncio
+import json
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+
+from backend.shared.events.streams import StreamConsumer, StreamSettings, queue_publish, tail_stream  # noqa: E402
+
+SETTINGS = StreamSettings(
+    enabled=True, maxlen=1000, batch_size=10, block_ms=0, claim_idle_ms=0, max_deliveries=2, start_id="0"
+)
+
+
+class FakeStreamRedis:
+    """Just enough of the async Redis stream commands for one process (idle times are ignored)."""
+
+    def __init__(self):
+        self.streams: dict[str, list] = {}
+        self.groups: dict[tuple, dict] = {}
+        self.published = []
+        self.empty_reads = 0
+
+    async def publish(self, channel, data):
+        self.published.append((channel, data))
+
+    async def xadd(self, name, fields, maxlen=None, approximate=True):
+        entries = self.streams.setdefault(name, [])
+        entry_id = f"{len(entries) + 1}-0"
+        entries.append((entry_id, dict(fields)))
+        return entry_id
+
+    async def xgroup_create(self, name, groupname, id="$", mkstream=False):
+        if (name, groupname) in self.groups:
+            raise Exception("BUSYGROUP Consumer Group name already exists")
+        entries = self.streams.setdefault(name, [])
+        self.groups[(name, groupname)] = {"next": len(entries) if id == "$" else 0, "pending": {}}
+
+    async def xreadgroup(self, groupname, consumername, streams, count=None, block=None):
+        [(name, _)] = streams.items()
+        group = self.groups[(name, groupname)]
+        batch = self.streams[name][group["next"]:group["next"] + count]
+        group["next"] += len(batch)
+        for entry_id, _ in batch:
+            group["pending"][entry_id] = [consumername, 1]
+        return [[name, batch]] if batch else []
+
+    async def xack(self, name, groupname, *ids):
+        pending = self.groups[(name, groupname)]["pending"]
+        return sum(pending.pop(entry_id, None) is not None for entry_id in ids)
+
+    async def xautoclaim(self, name, groupname, consumername, min_idle_time, start_id="0-0", count=None):
+        pending = self.groups[(name, groupname)]["pending"]
+        entries = dict(self.streams[name])
+        claimed = []
+        for entry_id, state in list(pending.items())[:count]:
+            state[0] = consumername
+            state[1] += 1
+            claimed.append((entry_id, entries[entry_id]))
+        return ["0-0", claimed, []]
+
+    async def xpending_range(self, name, groupname, min, max, count, consumername=None, idle=None):
+        state = self.groups[(name, groupname)]["pending"].get(min)
+        return [{"message_id": min, "consumer": state[0], "times_delivered": state[1]}] if state else []
+
+    async def xrevrange(self, name, max="+", min="-", count=None):
+        return list(reversed(self.streams.get(name, [])))[:count]
+
+    async def xread(self, streams, count=None, block=None):
+        [(name, last_id)] = streams.items()
+        after = int(last_id.split("-")[0])
+        batch = [entry for entry in self.streams.get(name, []) if int(entry[0].split("-")[0]) > after][:count]
+        if not batch:
+            self.empty_reads += 1
+            if self.empty_reads > 1:
+                raise asyncio.CancelledError  # stands in for blocking forever
+            await asyncio.sleep(0)
+        return [[name, batch]]
+
+
+def _events(redis, name):
+    return [json.loads(fields["data"]) for _, fields in redis.streams.get(name, [])]
+
+
+def test_queue_publish_adds_stream_channels_and_publishes_the_rest():
+    redis = FakeStreamRedis()
+
+    async def scenario():
+        await queue_publish(redis, "discussion_events", json.dumps({"n": 1}), SETTINGS)
+        await queue_publish(redis, "thread_updates", json.dumps({"n": 2}), SETTINGS)
+        await queue_publish(redis, "discussion_events", json.dumps({"n": 3}), StreamSettings.from_env())
+
+    asyncio.run(scenario())
+
+    assert _events(redis, "discussion_events") == [{"n": 1}]
+    assert redis.published == [("thread_updates", '{"n": 2}'), ("discussion_events", '{"n": 3}')]
+
+
+def test_consumer_group_shares_events_between_workers_and_acks_them():
+    redis = FakeStreamRedis()
+    handled = []
+
+    def handler_for(worker):
+        async def handle(event):
+            handled.append((worker, event["n"]))
+
+        return handle
+
+    async def scenario():
+        workers = [
+            StreamConsumer(redis, "discussion_events", "notifications", handler_for(name), name, SETTINGS)
+            for name in ("a", "b")
+        ]
+        for worker in workers:
+            await worker.ensure_group()
+        for n in range(3):
+            await redis.xadd("discussion_events", {"data": json.dumps({"n": n})})
+
+        workers[0].settings = StreamSettings(**{**SETTINGS.__dict__, "batch_size": 2})
+        await workers[0].poll()
+        await workers[1].poll()
+        await workers[1].poll()
+
+    asyncio.run(scenario())
+
+    assert sorted(n for _, n in handled) == [0, 1, 2]
+    assert {worker for worker, _ in handled} == {"a", "b"}
+    assert redis.groups[("discussion_events", "notifications")]["pending"] == {}
+
+
+def test_failed_entries_are_reclaimed_then_dead_lettered():
+    redis = FakeStreamRedis()
+    attempts = []
+
+    async def flaky(event):
+        attempts.append(event["n"])
+        if event["n"] == 0:
+            raise RuntimeError("database down")
+
+    async def scenario():
+        consumer = StreamConsumer(redis, "discussion_events", "notifications", flaky, "a", SETTINGS)
+        await consumer.ensure_group()
+        await consumer.ensure_group()  # an existing group is fine
+        await redis.xadd("discussion_events", {"data": json.dumps({"n": 0})})
+        await redis.xadd("discussion_events", {"data": "not json"})
+        await redis.xadd("discussion_events", {"data": json.dumps({"n": 2})})
+
+        await consumer.poll()
+        assert list(redis.groups[("discussion_events", "notifications")]["pending"]) == ["1-0"]
+
+        # A second worker picks up what the first left pending.
+        rescuer = StreamConsumer(redis, "discussion_events", "notifications", flaky, "b", SETTINGS)
+        await rescuer.reclaim(force=True)
+
+    asyncio.run(scenario())
+
+    assert attempts == [0, 2, 0]
+    assert redis.groups[("discussion_events", "notifications")]["pending"] == {}
+    dead = redis.streams["discussion_events:dead"]
+    assert [(fields["source_id"], fields["reason"]) for _, fields in dead] == [("2-0", "invalid"), ("1-0", "failed")]
+
+
+def test_tail_stream_starts_after_existing_entries():
+    redis = FakeStreamRedis()
+    seen = []
+
+    async def handle(event, raw):
+        seen.append((event["n"], raw))
+
+    async def scenario():
+        await redis.xadd("user_notifications", {"data": json.dumps({"n": 0})})
+        task = asyncio.create_task(tail_stream(redis, "user_notifications", handle, SETTINGS))
+        await asyncio.sleep(0)
+        await redis.xadd("user_notifications", {"data": json.dumps({"n": 1})})
+        await redis.xadd("user_notifications", {"data": "{"})
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+
+    assert seen == [(1, '{"n": 1}')]
+
+
+def test_redelivered_event_stores_one_notification_and_publishes_again(monkeypatch):
+    from uuid import uuid4
+
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import sessionmaker
+
+    from backend.services.auth_service.app.models.user import User  # noqa: F401
+    from backend.services.notification_service.app.core import redis_listener
+    from backend.services.notification_service.app.models.notification import Notification
+    from backend.shared.database.base import Base
+    from backend.shared.events.envelope import make_envelope
+
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(redis_listener, "SessionLocal", sessionmaker(bind=engine))
+
+    redis = FakeStreamRedis()
+    monkeypatch.setattr(redis_listener, "redis_client", redis)
+    publishes = []
+
+    async def flaky_publish(client, channel, data, settings=None):
+        publishes.append(json.loads(data))
+        if len(publishes) == 1:
+            raise ConnectionError("redis went away after the commit")
+
+    monkeypatch.setattr(redis_listener, "queue_publish", flaky_publish)
+    event = make_envelope("thread.liked", str(uuid4()), str(uuid4()), {"owner_id": str(uuid4())})
+
+    async def scenario():
+        consumer = StreamConsumer(
+            redis, "discussion_events", "notifications", redis_listener.consume_event, "a", SETTINGS
+        )
+        await consumer.ensure_group()
+        await redis.xadd("discussion_events", {"data": json.dumps(event)})
+        await consumer.poll()
+        await consumer.reclaim(force=True)
+
+    asyncio.run(scenario())
+
+    with engine.connect() as connection:
+        assert connection.scalar(select(func.count()).select_from(Notification)) == 1
+    assert len(publishes) == 2
+    assert publishes[0]["notification_id"] == publishes[1]["notification_id"]
+    assert redis.groups[("discussion_events", "notifications")]["pending"] == {}
+    engine.dispose()
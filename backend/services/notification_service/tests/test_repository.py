@@ -6,17 +6,14 @@ from backend.services.notification_service.app.repositories.notification_reposit
 
 
 def test_repository_create_calls_db_methods():
-    calls = {"add": 0, "commit": 0, "refresh": 0}
+    calls = {"add": 0, "flush": 0}
 
     class FakeDB:
         def add(self, _obj):
             calls["add"] += 1
 
-        def commit(self):
-            calls["commit"] += 1
-
-        def refresh(self, _obj):
-            calls["refresh"] += 1
+        def flush(self):
+            calls["flush"] += 1
 
     repo = NotificationRepository(FakeDB())
     n = Notification(
@@ -30,7 +27,7 @@ def test_repository_create_calls_db_methods():
 
     out = repo.create(n)
     assert out is n
-    assert calls == {"add": 1, "commit": 1, "refresh": 1}
+    assert calls == {"add": 1, "flush": 1}
 
 
 def test_repository_get_user_notifications_returns_scalars():
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from backend.shared.metrics.registry import Counter
+
+logger = logging.getLogger(__name__)
+
+# Counter updates that may be merged, and the payload field naming their target.
+COALESCED_EVENTS = {
+    "thread.like.updated": "thread_id",
+    "comment.like.updated": "comment_id",
+}
+
+COALESCED = Counter(
+    "realtime_coalesced_events_total",
+    "Counter updates dropped because a newer one for the same target arrived within the window.",
+    ("event",),
+)
+
+Deliver = Callable[[str, dict, str], Awaitable[None]]
+
+
+class Coalescer:
+    """
+    Merge like-counter updates per target over a short window.
+
+    The first update for a thread or comment opens the window; later ones
+    replace it, and when the window closes only the latest count is
+    delivered. Everything else (created, updated, deleted, notifications)
+    is delivered at once, after flushing the same thread's pending
+    counters so clients still see a thread's events in order.
+
+    A failed delivery is logged and does not stop the rest of a flush;
+    close() delivers whatever is still pending at shutdown.
+    """
+
+    def __init__(self, window_seconds: float, deliver: Deliver):
+        self.window = window_seconds
+        self.deliver = deliver
+        # (thread_id, event, target) -> (channel, data, text), in arrival order.
+        self._pending: dict[tuple, tuple[str, dict, str]] = {}
+        self._timer: asyncio.Task | None = None
+
+    def _key(self, channel: str, data: dict) -> tuple | None:
+        if self.window <= 0 or channel != "thread_updates":
+            return None
+        event = data.get("event")
+        field = COALESCED_EVENTS.get(event)
+        target = (data.get("payload") or {}).get(field) if field else None
+        if not target:
+            return None
+        return (data.get("thread_id"), event, target)
+
+    async def submit(self, channel: str, data: dict, text: str) -> None:
+        key = self._key(channel, data)
+        if key is None:
+            if self._pending and data.get("thread_id"):
+                await self.flush(data["thread_id"])
+            await self.deliver(channel, data, text)
+            return
+
+        if key in self._pending:
+            COALESCED.inc(event=key[1])
+        self._pending[key] = (channel, data, text)
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+            self._timer.add_done_callback(self._timer_done)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self.flush()
+
+    @staticmethod
+    def _timer_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Coalescer flush failed: %s", task.exception())
+
+    async def close(self) -> None:
+        """Stop the window timer and deliver everything still pending."""
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        await self.flush()
+
+    async def flush(self, thread_id: str | None = None) -> None:
+        """Deliver pending updates now: all of them, or only those for `thread_id`."""
+        if thread_id is None:
+            ready, self._pending = list(self._pending.values()), {}
+        else:
+            keys = [key for key in self._pending if key[0] == thread_id]
+            ready = [self._pending.pop(key) for key in keys]
+        for channel, data, text in ready:
+            try:
+                await self.deliver(channel, data, text)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.error("Delivering coalesced %s failed: %s", data.get("event"), exc)
+
+    def pending(self) -> int:
+        return len(self._pending)
@@ -3,6 +3,9 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     secret_key: str
     algorithm: str = "HS256"
+    # Like-counter updates for the same thread or comment within this window
+    # are merged into one broadcast of the latest count; 0 disables merging.
+    like_coalesce_window_ms: int = 250
 
     class Config:
         env_file = ".env"
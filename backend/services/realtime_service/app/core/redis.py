@@ -1,7 +1,21 @@
+import asyncio
 import redis.asyncio as redis
-import json
 import os
+from backend.services.realtime_service.app.core.coalescer import Coalescer
+from backend.services.realtime_service.app.core.config import settings
 from backend.services.realtime_service.app.websocket.manager import manager
+from backend.shared.events.codec import EVENT_REDIS_OPTIONS, event_codec
+from backend.shared.events.envelope import check_envelope
+from backend.shared.events.streams import tail_stream, uses_stream
+from backend.shared.metrics.pubsub import event_age, record_consumed
+from backend.shared.metrics.registry import Histogram
+from backend.shared.tracing.tracer import extract, start_span
+
+DELIVERY_AGE = Histogram(
+    "event_delivery_age_seconds",
+    "Time from the originating publish_event to websocket delivery.",
+    ("channel", "event"),
+)
 
 
 def get_redis_port() -> int:
@@ -15,30 +29,98 @@ redis_client = redis.Redis(
     host=os.getenv("REDIS_HOST", "localhost"),
     port=get_redis_port(),
     decode_responses=True,
+    **EVENT_REDIS_OPTIONS,
 )
 
+
+def _as_text(raw: bytes | str) -> str:
+    return raw if isinstance(raw, str) else raw.decode()
+
+
 async def start_redis_listener():
     print("Starting Redis listener...")
     pubsub = redis_client.pubsub()
-    await pubsub.subscribe("thread_updates", "user_notifications")
-    print("Subscribed to thread_updates and user_notifications")
+    if uses_stream("user_notifications"):
+        # Every realtime process needs every notification, so the stream is
+        # tailed without a consumer group.
+        await pubsub.subscribe("thread_updates")
+        notifications = asyncio.create_task(
+            tail_stream(redis_client, "user_notifications", lambda data, raw: receive("user_notifications", data, raw))
+        )
+        print("Subscribed to thread_updates; tailing the user_notifications stream")
+    else:
+        await pubsub.subscribe("thread_updates", "user_notifications")
+        notifications = None
+        print("Subscribed to thread_updates and user_notifications")
+
+    try:
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
 
-    async for message in pubsub.listen():
-        print("Redis message received:", message)
-        if message["type"] == "message":
-            data = json.loads(message["data"])
             channel = message.get("channel")
+            try:
+                data = event_codec.decode(message["data"])
+            except ValueError:
+                record_consumed("realtime", channel, None, outcome="invalid")
+                print(f"Invalid {channel} payload")
+                continue
+            await receive(channel, data, message["data"])
+    finally:
+        if notifications is not None:
+            notifications.cancel()
+
+
+async def receive(channel: str, data, raw: bytes | str) -> None:
+    """Check a decoded event and dispatch it; a bad event never stops the listener."""
+    try:
+        if not isinstance(data, dict):
+            raise ValueError("event is not an object")
+        check_envelope(data)
+    except ValueError as e:
+        record_consumed("realtime", channel, None, outcome="invalid")
+        print(f"Invalid {channel} event: {e}")
+        return
+
+    try:
+        await dispatch(channel, data, raw)
+    except Exception as e:
+        record_consumed("realtime", channel, data, outcome="error")
+        print(f"Realtime listener error: {e}")
+
+
+async def dispatch(channel: str, data: dict, raw: bytes | str) -> None:
+    """
+    Route one received event to its rooms, through the like-counter coalescer.
+
+    `data` is decoded once for routing; sockets get `raw` as received
+    when it is already JSON text, so JSON events are never re-encoded.
+    """
+    text = event_codec.to_text(data) if event_codec.binary else _as_text(raw)
+    await coalescer.submit(channel, data, text)
+    record_consumed("realtime", channel, data)
+
+
+async def deliver(channel: str, data: dict, text: str) -> None:
+    """Broadcast one event to the rooms it belongs to."""
+    with start_span("deliver", parent=extract(data), kind="consumer", channel=channel, event=data.get("event")):
+        if channel == "thread_updates":
+            thread_id = data.get("thread_id")
+            if thread_id:
+                await manager.broadcast(thread_id, data, text)
+            # Also broadcast to the global feed room so the
+            # HomePage can pick up likes/updates in real-time.
+            await manager.broadcast("__feed__", data, text)
+
+        elif channel == "user_notifications":
+            user_id = data.get("user_id")
+            if user_id:
+                await manager.broadcast(user_id, data, text)
 
-            if channel == "thread_updates":
-                thread_id = data.get("thread_id")
-                if thread_id:
-                    await manager.broadcast(thread_id, data)
-                # Also broadcast to the global feed room so the
-                # HomePage can pick up likes/updates in real-time.
-                await manager.broadcast("__feed__", data)
+    # Notifications carry the source event's publish time as origin_timestamp.
+    age = event_age(data, "origin_timestamp" if data.get("origin_timestamp") else "timestamp")
+    if age is not None:
+        DELIVERY_AGE.observe(age, channel=channel, event=data.get("event") or data.get("type") or "unknown")
 
-            elif channel == "user_notifications":
-                user_id = data.get("user_id")
-                if user_id:
-                    await manager.broadcast(user_id, data)
 
+coalescer = Coalescer(settings.like_coalesce_window_ms / 1000, deliver)
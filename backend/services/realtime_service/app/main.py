@@ -6,10 +6,14 @@ import logging
 import os
 
 from backend.services.realtime_service.app.websocket.routes import router as ws_router
-from backend.services.realtime_service.app.core.redis import start_redis_listener
+from backend.services.realtime_service.app.core.redis import coalescer, start_redis_listener
+from backend.shared.metrics.http import MetricsMiddleware, router as metrics_router
+from backend.shared.tracing.http import TracingMiddleware
+from backend.shared.tracing.tracer import setup_tracing
 
 logger = logging.getLogger("realtime_service")
 logging.basicConfig(level=logging.INFO)
+setup_tracing("realtime_service")
 
 
 def get_cors_origins() -> list[str]:
@@ -28,6 +32,7 @@ async def lifespan(app: FastAPI):
     
     logger.info("Shutting down Realtime Service...")
     task.cancel()
+    await coalescer.close()
 
 
 app = FastAPI(
@@ -35,6 +40,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware, service="realtime")
+app.add_middleware(TracingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=get_cors_origins(),
@@ -43,4 +50,5 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(metrics_router)
 app.include_router(ws_router)
@@ -1,27 +1,53 @@
+import time
 from typing import Dict, List
 from fastapi import WebSocket
 
+from backend.shared.events.codec import event_codec
+from backend.shared.metrics.registry import Counter, Gauge, Histogram
+from backend.shared.tracing.tracer import start_span
+
+CONNECTIONS = Gauge("websocket_connections", "Open websocket connections by room type.", ("room_type",))
+BROADCAST_DURATION = Histogram(
+    "websocket_broadcast_duration_seconds",
+    "Time to send one message to every socket in a room.",
+    ("room_type",),
+)
+MESSAGES_SENT = Counter("websocket_messages_sent_total", "Messages written to websockets.", ("room_type",))
+
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, List[WebSocket]] = {}
+        # Room type ("thread", "feed" or "user") per room, for metric labels.
+        self.room_types: Dict[str, str] = {}
 
-    async def connect(self, thread_id: str, websocket: WebSocket):
+    async def connect(self, thread_id: str, websocket: WebSocket, room_type: str = "thread"):
         await websocket.accept()
         self.active_connections.setdefault(thread_id, []).append(websocket)
+        self.room_types[thread_id] = room_type
+        CONNECTIONS.inc(room_type=room_type)
 
     def disconnect(self, thread_id: str, websocket: WebSocket):
         self.active_connections[thread_id].remove(websocket)
+        CONNECTIONS.dec(room_type=self.room_types.get(thread_id, "thread"))
         if not self.active_connections[thread_id]:
             del self.active_connections[thread_id]
+            self.room_types.pop(thread_id, None)
 
-    async def broadcast(self, thread_id: str, message: dict):
-        print("Broadcasting to thread:", thread_id)
-        print("Active connections:", self.active_connections.keys())
-
+    async def broadcast(self, thread_id: str, message: dict, text: str | None = None):
+        """Send `message` to every socket in the room, encoded once (or as the given JSON `text`)."""
         connections = self.active_connections.get(thread_id, [])
-        print("Connections found:", len(connections))
+        if not connections:
+            return
 
-        for connection in connections:
-            await connection.send_json(message)
+        room_type = self.room_types.get(thread_id, "thread")
+        started = time.perf_counter()
+        if text is None:
+            text = event_codec.to_text(message)
+        with start_span("broadcast", room_type=room_type, recipients=len(connections)):
+            for connection in connections:
+                await connection.send_text(text)
+        BROADCAST_DURATION.observe(time.perf_counter() - started, room_type=room_type)
+        MESSAGES_SENT.inc(len(connections), room_type=room_type)
 
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager()
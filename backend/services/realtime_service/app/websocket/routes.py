@@ -64,7 +64,7 @@ async def feed_websocket_endpoint(websocket: WebSocket):
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
-    await manager.connect("__feed__", websocket)
+    await manager.connect("__feed__", websocket, room_type="feed")
     try:
         while True:
             await websocket.receive_text()
@@ -86,7 +86,7 @@ async def notifications_websocket_endpoint(websocket: WebSocket):
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
-    await manager.connect(str(user_id), websocket)
+    await manager.connect(str(user_id), websocket, room_type="user")
 
     try:
         while True:
@@ -0,0 +1,99 @@
+import asyncio
+
+from backend.services.realtime_service.app.core.coalescer import Coalescer
+
+
+def _like(thread_id, count):
+    return {"event": "thread.like.updated", "thread_id": thread_id, "payload": {"thread_id": thread_id, "like_count": count}}
+
+
+def _comment_like(thread_id, comment_id, count):
+    return {"event": "comment.like.updated", "thread_id": thread_id, "payload": {"comment_id": comment_id, "like_count": count}}
+
+
+def _run(window, events, settle=True):
+    delivered = []
+
+    async def deliver(channel, data, text):
+        delivered.append((data["event"], data["payload"].get("like_count")))
+
+    async def scenario():
+        coalescer = Coalescer(window, deliver)
+        for channel, data in events:
+            await coalescer.submit(channel, data, "")
+        if settle:
+            await asyncio.sleep(window * 2 + 0.01)
+        return coalescer
+
+    return delivered, asyncio.run(scenario())
+
+
+def test_like_storm_is_merged_into_the_latest_count_per_target():
+    delivered, coalescer = _run(
+        0.01,
+        [("thread_updates", _like("t1", n)) for n in range(1, 50)]
+        + [("thread_updates", _comment_like("t1", "c1", 5)), ("thread_updates", _comment_like("t1", "c1", 6))]
+        + [("thread_updates", _like("t2", 1))],
+    )
+
+    assert delivered == [("thread.like.updated", 49), ("comment.like.updated", 6), ("thread.like.updated", 1)]
+    assert coalescer.pending() == 0
+
+
+def test_lifecycle_events_are_never_merged_and_keep_thread_order():
+    created = {"event": "comment.created", "thread_id": "t1", "payload": {"id": "c2"}}
+    deleted = {"event": "comment.deleted", "thread_id": "t1", "payload": {"id": "c1"}}
+    delivered, coalescer = _run(
+        10.0,
+        [
+            ("thread_updates", _like("t1", 1)),
+            ("thread_updates", _like("t2", 7)),
+            ("thread_updates", created),
+            ("thread_updates", created),
+            ("thread_updates", _comment_like("t1", "c1", 3)),
+            ("thread_updates", deleted),
+            ("user_notifications", {"event": "thread.liked", "payload": {}}),
+        ],
+        settle=False,
+    )
+
+    assert delivered == [
+        ("thread.like.updated", 1),
+        ("comment.created", None),
+        ("comment.created", None),
+        ("comment.like.updated", 3),
+        ("comment.deleted", None),
+        ("thread.liked", None),
+    ]
+    assert coalescer.pending() == 1  # t2's update waits for its window
+
+
+def test_zero_window_delivers_everything():
+    delivered, _ = _run(0, [("thread_updates", _like("t1", n)) for n in range(3)], settle=False)
+    assert [count for _, count in delivered] == [0, 1, 2]
+
+
+def test_failed_delivery_does_not_lose_the_rest_and_close_flushes():
+    delivered = []
+
+    async def deliver(channel, data, text):
+        if data["thread_id"] == "dead":
+            raise RuntimeError("socket closed")
+        delivered.append(data["thread_id"])
+
+    async def scenario():
+        coalescer = Coalescer(0.01, deliver)
+        for thread_id in ("t1", "dead", "t2"):
+            await coalescer.submit("thread_updates", _like(thread_id, 1), "")
+        await asyncio.sleep(0.05)
+        assert delivered == ["t1", "t2"]
+
+        # Updates still inside their window go out on shutdown.
+        coalescer.window = 10.0
+        await coalescer.submit("thread_updates", _like("t3", 1), "")
+        await coalescer.close()
+        return coalescer
+
+    coalescer = asyncio.run(scenario())
+    assert delivered == ["t1", "t2", "t3"]
+    assert coalescer.pending() == 0
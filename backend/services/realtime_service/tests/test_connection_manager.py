@@ -1,6 +1,10 @@
 import asyncio
+import json
+import os
 
-from backend.services.realtime_service.app.websocket.manager import ConnectionManager
+os.environ.setdefault("SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+
+from backend.services.realtime_service.app.websocket.manager import ConnectionManager  # noqa: E402
 
 
 def test_connect_broadcast_disconnect_flow():
@@ -14,8 +18,8 @@ def test_connect_broadcast_disconnect_flow():
         async def accept(self):
             self.accepted = True
 
-        async def send_json(self, payload):
-            self.messages.append(payload)
+        async def send_text(self, text):
+            self.messages.append(json.loads(text))
 
     ws = FakeWebSocket()
     payload = {"event": "thread.updated"}
@@ -33,3 +37,84 @@ def test_broadcast_to_unknown_key_is_noop():
     manager = ConnectionManager()
     asyncio.run(manager.broadcast("missing-thread", {"event": "noop"}))
     assert manager.active_connections == {}
+
+
+def test_metrics_track_connections_per_room_type():
+    from backend.shared.metrics.registry import REGISTRY
+
+    manager = ConnectionManager()
+
+    class FakeWebSocket:
+        async def accept(self):
+            pass
+
+        async def send_text(self, text):
+            pass
+
+    def connections(room_type):
+        line = f'websocket_connections{{room_type="{room_type}"}} '
+        return next((float(row.removeprefix(line)) for row in REGISTRY.render().splitlines() if row.startswith(line)), 0.0)
+
+    before = connections("feed")
+    sockets = [FakeWebSocket(), FakeWebSocket()]
+    for ws in sockets:
+        asyncio.run(manager.connect("__feed__", ws, room_type="feed"))
+    asyncio.run(manager.broadcast("__feed__", {"event": "thread.updated"}))
+    assert connections("feed") == before + 2
+
+    for ws in sockets:
+        manager.disconnect("__feed__", ws)
+    assert connections("feed") == before
+    assert manager.room_types == {}
+    assert 'websocket_broadcast_duration_seconds_count{room_type="feed"}' in REGISTRY.render()
+
+
+def test_dispatch_forwards_received_json_without_reencoding(monkeypatch):
+    from backend.services.realtime_service.app.core import redis as realtime_redis
+
+    manager = ConnectionManager()
+    monkeypatch.setattr(realtime_redis, "manager", manager)
+
+    class FakeWebSocket:
+        def __init__(self):
+            self.frames = []
+
+        async def accept(self):
+            pass
+
+        async def send_text(self, text):
+            self.frames.append(text)
+
+    thread_ws, feed_ws = FakeWebSocket(), FakeWebSocket()
+    asyncio.run(manager.connect("t1", thread_ws))
+    asyncio.run(manager.connect("__feed__", feed_ws, room_type="feed"))
+
+    raw = '{"event":"thread.updated","thread_id":"t1","payload":{"id":"t1","title":"New"}}'
+    asyncio.run(realtime_redis.dispatch("thread_updates", json.loads(raw), raw))
+
+    assert thread_ws.frames == [raw]
+    assert feed_ws.frames[0] is thread_ws.frames[0]
+
+
+def test_bad_events_are_counted_and_do_not_reach_sockets(monkeypatch):
+    from backend.services.realtime_service.app.core import redis as realtime_redis
+    from backend.shared.metrics.registry import REGISTRY
+
+    dispatched = []
+
+    async def dispatch(channel, data, raw):
+        dispatched.append(data)
+
+    monkeypatch.setattr(realtime_redis, "dispatch", dispatch)
+
+    def invalid():
+        line = 'redis_listener_events_total{service="realtime",channel="thread_updates",outcome="invalid"} '
+        return next((float(row.removeprefix(line)) for row in REGISTRY.render().splitlines() if row.startswith(line)), 0.0)
+
+    before = invalid()
+    asyncio.run(realtime_redis.receive("thread_updates", {"v": 99, "event": "thread.updated"}, "{}"))
+    asyncio.run(realtime_redis.receive("thread_updates", ["not", "an", "event"], "[]"))
+    asyncio.run(realtime_redis.receive("thread_updates", {"v": 1, "event": "thread.updated"}, "{}"))
+
+    assert invalid() == before + 2
+    assert dispatched == [{"v": 1, "event": "thread.updated"}]
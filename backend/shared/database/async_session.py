@@ -0,0 +1,97 @@
+from typing import AsyncGenerator
+
+from fastapi import Request
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from backend.services.auth_service.app.core.config import settings
+from backend.shared.database.pool import forget_engine, instrument_engine, pool_options
+from backend.shared.database.routing import READ_METHODS, RoutingSession
+
+# Async driver used for each backend when ASYNC_DATABASE_URL is not set.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_engine: AsyncEngine | None = None
+_replica_engines: list[AsyncEngine] | None = None
+_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def to_async_url(database_url: str) -> URL:
+    """Swap the sync driver in DATABASE_URL for its async counterpart."""
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()!r}")
+    return url.set(drivername=driver)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the process-wide async engine, created on first use so services
+    and scripts that stay on the sync engine never need the async driver.
+    """
+    global _engine
+    if _engine is None:
+        url = settings.async_database_url or to_async_url(settings.database_url)
+        _engine = create_async_engine(
+            url,
+            echo=settings.debug,
+            **pool_options(url, is_async=True),
+        )
+        instrument_engine(_engine, "async")
+    return _engine
+
+
+def get_async_replica_engines() -> list[AsyncEngine]:
+    """Async engines for DATABASE_REPLICA_URLS, created with the primary's pool settings."""
+    global _replica_engines
+    if _replica_engines is None:
+        _replica_engines = []
+        for index, replica_url in enumerate(settings.database_replica_urls):
+            url = to_async_url(replica_url)
+            replica = create_async_engine(url, echo=settings.debug, **pool_options(url, is_async=True))
+            instrument_engine(replica, f"async_replica{index}")
+            _replica_engines.append(replica)
+    return _replica_engines
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _sessionmaker
+    if _sessionmaker is None:
+        # Loaded rows stay usable after commit; async sessions cannot lazy-load.
+        _sessionmaker = async_sessionmaker(
+            bind=get_async_engine(),
+            sync_session_class=RoutingSession,
+            replicas=[replica.sync_engine for replica in get_async_replica_engines()],
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _sessionmaker
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        db.info["read_only"] = request.method in READ_METHODS
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections on shutdown, if the engine was used."""
+    global _engine, _replica_engines, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+        forget_engine("async")
+    for index, replica in enumerate(_replica_engines or []):
+        await replica.dispose()
+        forget_engine(f"async_replica{index}")
+    _engine = None
+    _replica_engines = None
+    _sessionmaker = None
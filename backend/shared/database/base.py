@@ -1,4 +1,6 @@
 from sqlalchemy.orm import DeclarativeBase
 
 class Base(DeclarativeBase):
-    pass
+    # Fetch server-generated values with RETURNING as part of each INSERT/UPDATE
+    # instead of a refresh after commit.
+    __mapper_args__ = {"eager_defaults": True}
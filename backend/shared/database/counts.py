@@ -0,0 +1,239 @@
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.services.auth_service.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXACT = "exact"
+CACHED = "cached"
+ESTIMATE = "estimate"
+COUNT_MODES = {EXACT, CACHED, ESTIMATE}
+
+_redis_client: redis.Redis | None = None
+_async_redis_client: aioredis.Redis | None = None
+
+
+@dataclass(frozen=True)
+class CountResult:
+    total: int
+    is_estimate: bool = False
+
+
+def get_redis_port() -> int:
+    try:
+        return int(os.getenv("REDIS_PORT", "6379"))
+    except ValueError:
+        return 6379
+
+
+def get_count_cache() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=get_redis_port(),
+            decode_responses=True,
+            socket_timeout=0.5,
+        )
+    return _redis_client
+
+
+def get_async_count_cache() -> aioredis.Redis:
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = aioredis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=get_redis_port(),
+            decode_responses=True,
+            socket_timeout=0.5,
+        )
+    return _async_redis_client
+
+
+def _generation_key(namespace: str) -> str:
+    return f"counts:gen:{namespace}"
+
+
+def _value_key(namespace: str, name: str, params: dict | None) -> str:
+    digest = hashlib.sha1(
+        json.dumps(params or {}, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+    return f"counts:{namespace}:{name}:{digest}"
+
+
+def invalidate_counts(*namespaces: str) -> None:
+    """Bump namespace generations so every cached count under them is ignored."""
+    if not any(mode in (CACHED, ESTIMATE) for mode in settings.count_modes.values()):
+        return
+    try:
+        pipe = get_count_cache().pipeline(transaction=False)
+        for namespace in namespaces:
+            pipe.incr(_generation_key(namespace))
+        pipe.execute()
+    except redis.RedisError as exc:
+        logger.warning("Count cache invalidation failed for %s: %s", namespaces, exc)
+
+
+def _cached_value(generation: str, cached: str | None) -> int | None:
+    """Decode a "generation:total" entry, or None if missing or stale."""
+    if not cached:
+        return None
+    cached_generation, _, total = cached.partition(":")
+    return int(total) if cached_generation == generation else None
+
+
+def _cached_count(name: str, namespace: str, params: dict | None, exact: Callable[[], int]) -> int:
+    generation_key = _generation_key(namespace)
+    value_key = _value_key(namespace, name, params)
+    try:
+        client = get_count_cache()
+        generation, cached = client.mget(generation_key, value_key)
+        generation = generation or "0"
+        total = _cached_value(generation, cached)
+        if total is not None:
+            return total
+    except (redis.RedisError, ValueError) as exc:
+        logger.warning("Count cache read failed for %s: %s", name, exc)
+        return exact()
+
+    total = exact()
+    try:
+        client.set(value_key, f"{generation}:{total}", ex=settings.count_cache_ttl_seconds)
+    except redis.RedisError as exc:
+        logger.warning("Count cache write failed for %s: %s", name, exc)
+    return total
+
+
+async def _cached_count_async(
+    name: str,
+    namespace: str,
+    params: dict | None,
+    exact: Callable[[], Awaitable[int]],
+) -> int:
+    generation_key = _generation_key(namespace)
+    value_key = _value_key(namespace, name, params)
+    try:
+        client = get_async_count_cache()
+        generation, cached = await client.mget(generation_key, value_key)
+        generation = generation or "0"
+        total = _cached_value(generation, cached)
+        if total is not None:
+            return total
+    except (redis.RedisError, ValueError) as exc:
+        logger.warning("Count cache read failed for %s: %s", name, exc)
+        return await exact()
+
+    total = await exact()
+    try:
+        await client.set(value_key, f"{generation}:{total}", ex=settings.count_cache_ttl_seconds)
+    except redis.RedisError as exc:
+        logger.warning("Count cache write failed for %s: %s", name, exc)
+    return total
+
+
+def _explain_statement(bind, statement):
+    compiled = statement.compile(bind, compile_kwargs={"literal_binds": True})
+    return text(f"EXPLAIN (FORMAT JSON) {compiled}")
+
+
+def _plan_rows(plan) -> int:
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_row_count(db: Session, statement) -> int | None:
+    """
+    Return the PostgreSQL planner's row estimate for a SELECT, or None on
+    other dialects. Uses EXPLAIN so filtered statements are estimated too.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    return _plan_rows(db.execute(_explain_statement(bind, statement)).scalar())
+
+
+async def estimate_row_count_async(db: AsyncSession, statement) -> int | None:
+    """estimate_row_count for an AsyncSession."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    return _plan_rows((await db.execute(_explain_statement(bind, statement))).scalar())
+
+
+def _count_mode(name: str, default_mode: str) -> str:
+    mode = settings.count_modes.get(name, default_mode)
+    if mode not in COUNT_MODES:
+        logger.warning("Unknown count mode %r for %s, counting exactly", mode, name)
+        mode = EXACT
+    return mode
+
+
+def count_total(
+    name: str,
+    exact: Callable[[], int],
+    *,
+    namespace: str,
+    params: dict | None = None,
+    estimate: Callable[[], int | None] | None = None,
+    default_mode: str = EXACT,
+) -> CountResult:
+    """
+    Resolve the total for a paginated endpoint.
+
+    The mode comes from settings.count_modes[name] (falling back to
+    `default_mode`):
+    - exact: run the COUNT query.
+    - cached: serve the count from Redis for up to count_cache_ttl_seconds;
+      invalidate_counts(namespace) drops it early when the data changes.
+    - estimate: use the planner's estimate when the caller supplies one
+      (unfiltered totals only), otherwise behave like cached. Small
+      estimates are re-counted exactly since those counts are cheap.
+    """
+    mode = _count_mode(name, default_mode)
+
+    if mode == ESTIMATE and estimate is not None:
+        estimated = estimate()
+        if estimated is not None:
+            if estimated >= settings.count_estimate_exact_below:
+                return CountResult(estimated, is_estimate=True)
+            return CountResult(exact())
+
+    if mode in (CACHED, ESTIMATE):
+        return CountResult(_cached_count(name, namespace, params, exact))
+    return CountResult(exact())
+
+
+async def count_total_async(
+    name: str,
+    exact: Callable[[], Awaitable[int]],
+    *,
+    namespace: str,
+    params: dict | None = None,
+    estimate: Callable[[], Awaitable[int | None]] | None = None,
+    default_mode: str = EXACT,
+) -> CountResult:
+    """count_total for async routes: `exact` and `estimate` are coroutine functions."""
+    mode = _count_mode(name, default_mode)
+
+    if mode == ESTIMATE and estimate is not None:
+        estimated = await estimate()
+        if estimated is not None:
+            if estimated >= settings.count_estimate_exact_below:
+                return CountResult(estimated, is_estimate=True)
+            return CountResult(await exact())
+
+    if mode in (CACHED, ESTIMATE):
+        return CountResult(await _cached_count_async(name, namespace, params, exact))
+    return CountResult(await exact())
@@ -1,9 +1,19 @@
 from sqlalchemy import create_engine
 from backend.services.auth_service.app.core.config import settings
+from backend.shared.database.pool import instrument_engine, pool_options
 
 DATABASE_URL = settings.database_url
 
 engine = create_engine(
     DATABASE_URL,
-    echo=settings.debug
+    echo=settings.debug,
+    **pool_options(DATABASE_URL),
 )
+instrument_engine(engine, "sync")
+
+replica_engines = [
+    create_engine(url, echo=settings.debug, **pool_options(url))
+    for url in settings.database_replica_urls
+]
+for index, replica in enumerate(replica_engines):
+    instrument_engine(replica, f"replica{index}")
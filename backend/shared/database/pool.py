@@ -0,0 +1,227 @@
+import threading
+import time
+from collections import deque
+from statistics import quantiles
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from backend.services.auth_service.app.core.config import settings
+from backend.shared.metrics.registry import REGISTRY
+
+POOL_PROFILES = ("default", "pgbouncer")
+
+# Checkout waits kept for the latency percentiles on /diagnostics/db-pool.
+LATENCY_SAMPLES = 1024
+
+
+class PoolMetrics:
+    """Thread-safe counters and checkout latencies for one engine's pool."""
+
+    FIELDS = ("checkouts", "connects", "invalidations", "timeouts")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = dict.fromkeys(self.FIELDS, 0)
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._waits = deque(maxlen=LATENCY_SAMPLES)
+        self._max_wait = 0.0
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            self._values[field] += 1
+
+    def checked_out(self) -> None:
+        with self._lock:
+            self._values["checkouts"] += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+
+    def checked_in(self) -> None:
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+            self._max_wait = max(self._max_wait, seconds)
+            if timed_out:
+                self._values["timeouts"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            values = dict(self._values)
+            values["in_use"] = self._in_use
+            values["peak_in_use"] = self._peak_in_use
+            waits = [wait * 1000 for wait in self._waits]
+            max_wait = self._max_wait * 1000
+
+        latency = {"samples": len(waits), "max": round(max_wait, 3)}
+        if len(waits) >= 2:
+            cuts = quantiles(waits, n=100, method="inclusive")
+            latency.update(p50=round(cuts[49], 3), p95=round(cuts[94], 3), p99=round(cuts[98], 3))
+        elif waits:
+            latency.update(p50=round(waits[0], 3), p95=round(waits[0], 3), p99=round(waits[0], 3))
+        values["checkout_ms"] = latency
+        return values
+
+
+class _TimedCheckout:
+    """Pool mixin that times how long each checkout waits for a connection."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        if self.metrics is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+_engines: dict[str, tuple[Engine, PoolMetrics]] = {}
+
+
+def pool_options(database_url: str | URL, is_async: bool = False) -> dict:
+    """
+    create_engine keyword arguments for the configured DB_POOL_PROFILE.
+
+    "default" keeps a QueuePool sized by the DB_POOL_* settings. "pgbouncer"
+    is for PgBouncer in transaction mode: PgBouncer owns the pooling, so the
+    app opens a connection per checkout and asyncpg's prepared statement
+    caches are disabled (server connections are shared between clients).
+    SQLite keeps SQLAlchemy's own pool choice.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return {}
+    if settings.db_pool_profile not in POOL_PROFILES:
+        raise ValueError(f"Unknown DB_POOL_PROFILE {settings.db_pool_profile!r}")
+
+    if settings.db_pool_profile == "pgbouncer":
+        options = {"poolclass": InstrumentedNullPool}
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def instrument_engine(engine: Engine | AsyncEngine, name: str) -> PoolMetrics:
+    """Feed the engine's pool events into a PoolMetrics reported as `name`."""
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    metrics = PoolMetrics()
+    if isinstance(engine.pool, _TimedCheckout):
+        engine.pool.metrics = metrics
+
+    event.listen(engine, "checkout", lambda *_args: metrics.checked_out())
+    event.listen(engine, "checkin", lambda *_args: metrics.checked_in())
+    event.listen(engine, "connect", lambda *_args: metrics.incr("connects"))
+    event.listen(engine, "invalidate", lambda *_args: metrics.incr("invalidations"))
+    _engines[name] = (engine, metrics)
+    return metrics
+
+
+def forget_engine(name: str) -> None:
+    _engines.pop(name, None)
+
+
+def pool_status() -> dict:
+    """Pool configuration, live occupancy and counters for every instrumented engine."""
+    status = {}
+    for name, (engine, metrics) in _engines.items():
+        pool = engine.pool
+        entry = {"pool_class": type(pool).__name__, "profile": settings.db_pool_profile}
+        if isinstance(pool, QueuePool):
+            entry.update(
+                size=pool.size(),
+                timeout_seconds=pool.timeout(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(0, pool.overflow()),
+            )
+        entry.update(metrics.snapshot())
+        status[name] = entry
+    return status
+
+
+def _pool_families() -> list:
+    """pool_status() as Prometheus families, read at scrape time."""
+    status = pool_status()
+    gauges = {
+        "size": "Configured pool size.",
+        "checked_out": "Connections checked out of the pool.",
+        "checked_in": "Idle connections held by the pool.",
+        "overflow": "Connections open beyond the pool size.",
+        "in_use": "Connections in use by this process.",
+    }
+    counters = {
+        "checkouts": "Connections handed out by the pool.",
+        "connects": "New DBAPI connections opened.",
+        "invalidations": "Connections invalidated after errors.",
+        "timeouts": "Checkouts that gave up after DB_POOL_TIMEOUT.",
+    }
+    families = []
+    for field, documentation in gauges.items():
+        samples = [({"engine": name}, entry[field]) for name, entry in status.items() if field in entry]
+        families.append((f"db_pool_{field}", "gauge", documentation, samples))
+    for field, documentation in counters.items():
+        samples = [({"engine": name}, entry[field]) for name, entry in status.items()]
+        families.append((f"db_pool_{field}_total", "counter", documentation, samples))
+    waits = [
+        ({"engine": name, "quantile": quantile}, entry["checkout_ms"][key] / 1000)
+        for name, entry in status.items()
+        for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99"))
+        if key in entry["checkout_ms"]
+    ]
+    families.append(
+        (
+            "db_pool_checkout_wait_seconds",
+            "gauge",
+            f"Checkout wait percentiles over the last {LATENCY_SAMPLES} checkouts.",
+            waits,
+        )
+    )
+    return families
+
+
+REGISTRY.add_collector(_pool_families)
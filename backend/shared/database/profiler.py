@@ -0,0 +1,154 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from backend.services.auth_service.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar["QueryProfile | None"] = ContextVar("sql_profile", default=None)
+_STARTED_KEY = "profiler_started"
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement text with literals and bind parameters folded to `?`."""
+    text = _LITERALS.sub("?", _PLACEHOLDERS.sub("?", statement))
+    # IN (?, ?, ?) and IN (?) are the same query.
+    return _SPACE.sub(" ", _LISTS.sub("?", text)).strip()
+
+
+@dataclass
+class QueryProfile:
+    """SQL issued while one request (or one test block) ran."""
+
+    count: int = 0
+    duration_ms: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    # An enclosing profile (a test budget around a request) sees the same statements.
+    parent: "QueryProfile | None" = field(default=None, repr=False)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += elapsed_ms
+        self.statements[fingerprint(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement, elapsed_ms)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Fingerprints run at least `threshold` times, the usual sign of an N+1."""
+        return [(statement, times) for statement, times in self.statements.most_common() if times >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration_ms:.1f};desc="{self.count} queries"'
+
+    def describe(self, limit: int = 5) -> str:
+        return "\n".join(f"{times:>4} x {statement[:200]}" for statement, times in self.statements.most_common(limit))
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany):
+    profile = _current.get()
+    started = conn.info.get(_STARTED_KEY)
+    if profile is None or not started:
+        return
+    profile.record(statement, (time.perf_counter() - started.pop()) * 1000)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """Collect the SQL run in this context, including sync routes' threadpool and async drivers."""
+    profile = QueryProfile(parent=_current.get())
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+def query_budget(limit: int):
+    """Declare the most SQL statements a route may issue per request."""
+
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.query_budget = limit
+        return endpoint
+
+    return decorate
+
+
+def declared_budget(endpoint) -> int | None:
+    return getattr(endpoint, "query_budget", None)
+
+
+@contextmanager
+def assert_query_budget(budget: int | Callable) -> Iterator[QueryProfile]:
+    """
+    Fail if the block runs more statements than `budget`, either a number
+    or a route decorated with @query_budget.
+    """
+    limit = budget if isinstance(budget, int) else declared_budget(budget)
+    if limit is None:
+        raise ValueError(f"{budget!r} declares no query budget")
+    with profile_queries() as profile:
+        yield profile
+    if profile.count > limit:
+        raise AssertionError(f"{profile.count} queries, budget {limit}:\n{profile.describe()}")
+
+
+class SQLProfilerMiddleware:
+    """
+    Profile the SQL of every HTTP request.
+
+    Adds a `Server-Timing: db` header with the statement count and time,
+    and logs a warning when a route goes over its @query_budget or runs the
+    same statement SQL_REPEAT_THRESHOLD times or more.
+    """
+
+    def __init__(self, app, repeat_threshold: int | None = None):
+        self.app = app
+        self.repeat_threshold = repeat_threshold or settings.sql_repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.sql_profiler_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as profile:
+
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+        self._report(scope, profile)
+
+    def _report(self, scope, profile: QueryProfile) -> None:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        budget = declared_budget(scope.get("endpoint"))
+        if budget is not None and profile.count > budget:
+            logger.warning(
+                "%s %s ran %d queries, over its budget of %d:\n%s",
+                scope["method"], route, profile.count, budget, profile.describe(),
+            )
+        for statement, times in profile.repeated(self.repeat_threshold):
+            logger.warning("Possible N+1 on %s %s: %d x %s", scope["method"], route, times, statement[:200])
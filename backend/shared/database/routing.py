@@ -0,0 +1,152 @@
+import logging
+import os
+import random
+
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+
+from backend.services.auth_service.app.core.config import settings
+from backend.shared.database.counts import get_redis_port
+
+logger = logging.getLogger(__name__)
+
+# Requests with these methods may read from a replica.
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_redis_client: redis.Redis | None = None
+_async_redis_client: aioredis.Redis | None = None
+
+
+def _redis_options() -> dict:
+    return {
+        "host": os.getenv("REDIS_HOST", "localhost"),
+        "port": get_redis_port(),
+        "decode_responses": True,
+        "socket_timeout": 0.5,
+    }
+
+
+def get_pin_store() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis(**_redis_options())
+    return _redis_client
+
+
+def get_async_pin_store() -> aioredis.Redis:
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = aioredis.Redis(**_redis_options())
+    return _async_redis_client
+
+
+def _pin_key(user_id) -> str:
+    return f"db:pin:{user_id}"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to a replica when the request allows it.
+
+    Reads only go to a replica when `info["read_only"]` is set (by get_db for
+    GET requests) and the session has not written yet; flushes, DML,
+    SELECT ... FOR UPDATE and raw SQL stay on the primary bind. One replica
+    is picked per session so a request sees a single snapshot source.
+    """
+
+    def __init__(self, *args, replicas=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = list(replicas)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if isinstance(clause, UpdateBase):
+            _mark_write(self)
+        elif self._reads_from_replica(clause):
+            if "replica" not in self.info:
+                self.info["replica"] = random.choice(self.replicas)
+            return self.info["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def _reads_from_replica(self, clause) -> bool:
+        return (
+            bool(self.replicas)
+            and self.info.get("read_only", False)
+            and not self.info.get("wrote", False)
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        )
+
+
+def _mark_write(session: Session) -> None:
+    session.info["wrote"] = True
+    session.info["pin_pending"] = True
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _flush_is_write(session, _flush_context, _instances):
+    _mark_write(session)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_writer(session):
+    if session.info.pop("pin_pending", False) and session.info.get("user_id") is not None:
+        pin_primary(session.info["user_id"])
+
+
+def _routing_session(db) -> RoutingSession | None:
+    session = getattr(db, "sync_session", db)
+    if isinstance(session, RoutingSession) and session.replicas:
+        return session
+    return None
+
+
+def pin_primary(user_id) -> None:
+    """Send this user's reads to the primary for REPLICA_PIN_SECONDS."""
+    if not settings.database_replica_urls:
+        return
+    try:
+        get_pin_store().set(_pin_key(user_id), 1, ex=settings.replica_pin_seconds)
+    except redis.RedisError as exc:
+        logger.warning("Could not pin user %s to the primary: %s", user_id, exc)
+
+
+def bind_user(db, user_id) -> None:
+    """
+    Attach the authenticated user to the request session.
+
+    Their writes pin them to the primary after commit, and a pinned user's
+    GET requests skip the replicas. If Redis is unavailable the request
+    reads from the primary.
+    """
+    session = _routing_session(db)
+    if session is None:
+        return
+    session.info["user_id"] = user_id
+    if not session.info.get("read_only"):
+        return
+    try:
+        pinned = get_pin_store().exists(_pin_key(user_id))
+    except redis.RedisError:
+        pinned = True
+    if pinned:
+        session.info["read_only"] = False
+
+
+async def bind_user_async(db, user_id) -> None:
+    """bind_user for AsyncSession-based requests."""
+    session = _routing_session(db)
+    if session is None:
+        return
+    session.info["user_id"] = user_id
+    if not session.info.get("read_only"):
+        return
+    try:
+        pinned = await get_async_pin_store().exists(_pin_key(user_id))
+    except redis.RedisError:
+        pinned = True
+    if pinned:
+        session.info["read_only"] = False
@@ -1,17 +1,25 @@
 from typing import Generator
 
+from fastapi import Request
 from sqlalchemy.orm import sessionmaker, Session
 
-from backend.shared.database.engine import engine
+from backend.shared.database.engine import engine, replica_engines
+from backend.shared.database.routing import READ_METHODS, RoutingSession
 
 SessionLocal = sessionmaker(
     bind=engine,
+    class_=RoutingSession,
+    replicas=replica_engines,
     autoflush=False,
     autocommit=False,
+    # Written rows stay loaded after the unit of work commits (no refresh).
+    expire_on_commit=False,
 )
 
-def get_db() -> Generator[Session, None, None]:
+def get_db(request: Request) -> Generator[Session, None, None]:
     db = SessionLocal()
+    # Reads may go to a replica until the user is found to be pinned (bind_user).
+    db.info["read_only"] = request.method in READ_METHODS
     try:
         yield db
     finally:
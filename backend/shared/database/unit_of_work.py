@@ -0,0 +1,59 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy.orm import Session
+
+_DEPTH_KEY = "unit_of_work_depth"
+_CALLBACKS_KEY = "unit_of_work_callbacks"
+
+
+def _info(db) -> dict | None:
+    info = getattr(db, "info", None)
+    return info if isinstance(info, dict) else None
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Run a block of writes as one transaction.
+
+    Repositories only flush; the outermost unit_of_work commits once when
+    the block succeeds and rolls back if it raises. Nested blocks (a service
+    calling another service's write method) join the outer transaction.
+    Sessions do not expire on commit and mappers fetch server-generated
+    values with RETURNING, so written rows need no refresh afterwards.
+    """
+    info = _info(db)
+    depth = info.get(_DEPTH_KEY, 0) if info is not None else 0
+    if info is not None:
+        info[_DEPTH_KEY] = depth + 1
+    try:
+        yield db
+        if depth == 0 and hasattr(db, "commit"):
+            db.commit()
+    except BaseException:
+        if depth == 0:
+            if hasattr(db, "rollback"):
+                db.rollback()
+            if info is not None:
+                info.pop(_CALLBACKS_KEY, None)
+        raise
+    finally:
+        if info is not None:
+            info[_DEPTH_KEY] = depth
+
+    if depth == 0 and info is not None:
+        for callback in info.pop(_CALLBACKS_KEY, []):
+            callback()
+
+
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    Run `callback` once the enclosing unit_of_work commits, or now if there
+    is none, so cache invalidations never race ahead of the data.
+    """
+    info = _info(db)
+    if info is None or not info.get(_DEPTH_KEY):
+        callback()
+        return
+    info.setdefault(_CALLBACKS_KEY, []).append(callback)
@@ -0,0 +1,116 @@
+"""
+Pluggable wire codecs for events on Redis, chosen with EVENT_CODEC.
+
+- `orjson` (default): compact JSON, several times faster than the stdlib.
+  Falls back to `json` when orjson is not installed.
+- `json`: the stdlib, byte-compatible with orjson output.
+- `msgpack`: smaller binary frames (optional `msgpack` package). Every
+  service must run the same codec; websockets still get JSON, encoded
+  once per event rather than once per socket.
+
+Consumers read with decode_responses=True clients. Binary payloads
+survive that through EVENT_REDIS_OPTIONS (surrogateescape decoding),
+and decode() turns the str back into the original bytes.
+
+Configuration comes from the environment rather than the auth settings
+because the realtime service imports this module too.
+"""
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Extra redis.Redis() options for clients that consume events.
+EVENT_REDIS_OPTIONS = {"encoding_errors": "surrogateescape"}
+
+
+class JsonCodec:
+    name = "json"
+    binary = False
+
+    def encode(self, message: dict) -> bytes:
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+    def decode(self, raw: bytes | str) -> dict:
+        return json.loads(raw)
+
+    def to_text(self, message: dict) -> str:
+        """The JSON text websocket clients receive."""
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def encode(self, message: dict) -> bytes:
+        return self._orjson.dumps(message, default=str)
+
+    def decode(self, raw: bytes | str) -> dict:
+        return self._orjson.loads(raw)
+
+    def to_text(self, message: dict) -> str:
+        return self._orjson.dumps(message, default=str).decode()
+
+
+class MsgpackCodec:
+    name = "msgpack"
+    binary = True
+
+    def __init__(self, text_codec: JsonCodec):
+        import msgpack
+
+        self._msgpack = msgpack
+        self._text = text_codec
+
+    def encode(self, message: dict) -> bytes:
+        return self._msgpack.packb(message, default=str)
+
+    def decode(self, raw: bytes | str) -> dict:
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8", "surrogateescape")
+        try:
+            return self._msgpack.unpackb(raw)
+        except Exception as exc:  # msgpack raises several unrelated types for garbage
+            raise ValueError(f"invalid msgpack event: {exc}") from exc
+
+    def to_text(self, message: dict) -> str:
+        return self._text.to_text(message)
+
+
+def _text_codec() -> JsonCodec:
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return JsonCodec()
+
+
+def get_codec(name: str):
+    """The codec called `name`; raises ValueError for unknown names and missing packages."""
+    name = name.lower()
+    if name == "json":
+        return JsonCodec()
+    if name == "orjson":
+        codec = _text_codec()
+        if codec.name != "orjson":
+            logger.warning("orjson is not installed; encoding events with the stdlib json module")
+        return codec
+    if name == "msgpack":
+        try:
+            return MsgpackCodec(_text_codec())
+        except ImportError as exc:
+            raise ValueError("EVENT_CODEC=msgpack needs the msgpack package: pip install msgpack") from exc
+    raise ValueError(f"Unknown EVENT_CODEC {name!r}; use orjson, json or msgpack")
+
+
+event_codec = get_codec(os.getenv("EVENT_CODEC", "orjson"))
+
+
+def stored_to_wire(text: str) -> bytes | str:
+    """Outbox rows keep events as JSON text; re-encode them only for binary codecs."""
+    return event_codec.encode(json.loads(text)) if event_codec.binary else text
@@ -0,0 +1,165 @@
+"""
+The versioned envelope every discussion event travels in.
+
+    {"v": 1, "event_id", "event", "thread_id", "actor_id", "payload",
+     "timestamp", "traceparent"?}
+
+`event` names a registered EventType whose TypedDict describes the
+payload. Bump ENVELOPE_VERSION only for changes old consumers cannot
+ignore; adding event types or optional payload keys does not need it.
+Websocket clients receive the envelope as is, so field names stay long.
+"""
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TypedDict
+
+logger = logging.getLogger(__name__)
+
+ENVELOPE_VERSION = 1
+
+
+class UnsupportedEnvelope(ValueError):
+    """An event from a newer producer than this consumer understands."""
+
+
+class ThreadCreatedPayload(TypedDict):
+    id: str
+    title: str
+    description: str | None
+    image_url: str | None
+
+
+class ThreadUpdatedPayload(ThreadCreatedPayload):
+    is_locked: bool
+
+
+class DeletedPayload(TypedDict):
+    id: str
+
+
+class CommentCreatedPayload(TypedDict):
+    id: str
+    content: str
+    author_id: str
+    parent_id: str | None
+    like_count: int
+
+
+class CommentUpdatedPayload(TypedDict):
+    id: str
+    content: str
+
+
+class CommentDeletedPayload(DeletedPayload):
+    removed_ids: list[str]
+
+
+class ThreadLikeUpdatedPayload(TypedDict):
+    thread_id: str
+    like_count: int
+
+
+class CommentLikeUpdatedPayload(TypedDict):
+    comment_id: str
+    like_count: int
+
+
+class ThreadLikedPayload(TypedDict):
+    owner_id: str
+
+
+class CommentLikedPayload(ThreadLikedPayload):
+    comment_id: str
+
+
+class ThreadCommentedPayload(TypedDict):
+    owner_id: str
+    comment_id: str
+    preview: str
+
+
+class CommentRepliedPayload(TypedDict):
+    receiver_id: str
+    comment_id: str
+    parent_id: str
+    preview: str
+
+
+class MentionPayload(TypedDict):
+    mentioned_user_id: str
+    mentioned_username: str
+    source_type: str
+    source_id: str
+    preview: str
+
+
+@dataclass(frozen=True)
+class EventType:
+    name: str
+    channel: str
+    payload: type
+
+    @property
+    def required_keys(self) -> frozenset:
+        return self.payload.__required_keys__
+
+
+EVENT_TYPES: dict[str, EventType] = {}
+
+
+def register_event_type(name: str, channel: str, payload: type) -> EventType:
+    event_type = EVENT_TYPES[name] = EventType(name, channel, payload)
+    return event_type
+
+
+for _name, _channel, _payload in (
+    ("thread.created", "thread_updates", ThreadCreatedPayload),
+    ("thread.updated", "thread_updates", ThreadUpdatedPayload),
+    ("thread.deleted", "thread_updates", DeletedPayload),
+    ("comment.created", "thread_updates", CommentCreatedPayload),
+    ("comment.updated", "thread_updates", CommentUpdatedPayload),
+    ("comment.deleted", "thread_updates", CommentDeletedPayload),
+    ("thread.like.updated", "thread_updates", ThreadLikeUpdatedPayload),
+    ("comment.like.updated", "thread_updates", CommentLikeUpdatedPayload),
+    ("thread.liked", "discussion_events", ThreadLikedPayload),
+    ("comment.liked", "discussion_events", CommentLikedPayload),
+    ("thread.commented", "discussion_events", ThreadCommentedPayload),
+    ("comment.replied", "discussion_events", CommentRepliedPayload),
+    ("mention", "discussion_events", MentionPayload),
+):
+    register_event_type(_name, _channel, _payload)
+
+
+def make_envelope(event: str, thread_id: str, actor_id: str, payload: dict) -> dict:
+    """
+    Build an envelope, checking the payload of registered event types.
+
+    A payload missing keys is logged rather than rejected: publishing
+    happens inside the caller's write and must not fail it. Unregistered
+    types pass unchecked so producers can add events before consumers
+    know them.
+    """
+    event_type = EVENT_TYPES.get(event)
+    if event_type is not None:
+        missing = event_type.required_keys - payload.keys()
+        if missing:
+            logger.warning("%s payload is missing %s", event, ", ".join(sorted(missing)))
+    return {
+        "v": ENVELOPE_VERSION,
+        "event_id": str(uuid.uuid4()),
+        "event": event,
+        "thread_id": thread_id,
+        "actor_id": actor_id,
+        "payload": payload,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def check_envelope(message: dict) -> dict:
+    """Return `message`, or raise UnsupportedEnvelope if it is from a newer schema version."""
+    # Events from before the envelope was versioned have no "v" and read as version 0.
+    if message.get("v", 0) > ENVELOPE_VERSION:
+        raise UnsupportedEnvelope(f"envelope version {message['v']} is newer than {ENVELOPE_VERSION}")
+    return message
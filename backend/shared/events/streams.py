@@ -0,0 +1,250 @@
+"""
+Redis Streams transport for the event bus.
+
+With EVENT_BUS=streams, `discussion_events` and `user_notifications` are
+written with XADD (capped at roughly EVENT_STREAM_MAXLEN entries) instead
+of PUBLISH. The notification service reads `discussion_events` through a
+consumer group, so each event is handled by exactly one worker, is
+acknowledged once handled, and survives a restart; entries left pending
+by a crashed worker are reclaimed with XAUTOCLAIM. `thread_updates` and
+the default EVENT_BUS=pubsub stay on plain pub/sub.
+
+Configuration comes from the environment rather than the auth settings
+because the realtime service imports this module too.
+"""
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from backend.shared.events.codec import event_codec
+from backend.shared.metrics.registry import Counter
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHANNELS = frozenset({"discussion_events", "user_notifications"})
+# Each stream entry carries the encoded event in a single field.
+FIELD = "data"
+
+RECLAIMED = Counter("redis_stream_reclaimed_total", "Pending stream entries claimed from idle consumers.", ("stream",))
+DEAD_LETTERED = Counter(
+    "redis_stream_dead_letters_total",
+    "Stream entries moved to the dead-letter stream, by reason (invalid, failed).",
+    ("stream", "reason"),
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class StreamSettings:
+    enabled: bool
+    maxlen: int
+    batch_size: int
+    block_ms: int
+    claim_idle_ms: int
+    max_deliveries: int
+    start_id: str
+
+    @classmethod
+    def from_env(cls) -> "StreamSettings":
+        return cls(
+            enabled=os.getenv("EVENT_BUS", "pubsub").lower() == "streams",
+            maxlen=_env_int("EVENT_STREAM_MAXLEN", 100_000),
+            batch_size=_env_int("EVENT_STREAM_BATCH_SIZE", 100),
+            block_ms=_env_int("EVENT_STREAM_BLOCK_MS", 5_000),
+            claim_idle_ms=_env_int("EVENT_STREAM_CLAIM_IDLE_MS", 60_000),
+            max_deliveries=_env_int("EVENT_STREAM_MAX_DELIVERIES", 5),
+            start_id=os.getenv("EVENT_STREAM_START_ID", "$"),
+        )
+
+
+stream_settings = StreamSettings.from_env()
+
+
+def uses_stream(channel: str, settings: StreamSettings | None = None) -> bool:
+    return (settings or stream_settings).enabled and channel in STREAM_CHANNELS
+
+
+def queue_publish(client, channel: str, data: bytes | str, settings: StreamSettings | None = None):
+    """
+    PUBLISH `data`, or XADD it when `channel` is a stream.
+
+    Works on clients and pipelines, sync or async: the caller awaits or
+    executes whatever the Redis call returns.
+    """
+    settings = settings or stream_settings
+    if uses_stream(channel, settings):
+        return client.xadd(channel, {FIELD: data}, maxlen=settings.maxlen, approximate=True)
+    return client.publish(channel, data)
+
+
+def consumer_name() -> str:
+    """Unique per process, so a restarted worker's leftovers are reclaimed rather than resumed."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _entries(response) -> list:
+    """Flatten an XREAD/XREADGROUP reply (a list under RESP2, a dict under RESP3)."""
+    if not response:
+        return []
+    streams = response.items() if isinstance(response, dict) else response
+    entries = []
+    for _, stream_entries in streams:
+        entries.extend(stream_entries)
+    return entries
+
+
+class StreamConsumer:
+    """
+    Read one stream as a member of a consumer group.
+
+    The handler gets each decoded event; the entry is acknowledged when it
+    returns and stays pending when it raises. Pending entries idle for
+    longer than `claim_idle_ms` (the handler failed, or its consumer
+    died) are claimed and retried, and after `max_deliveries` attempts
+    they move to `<stream>:dead` so one bad event cannot block the group.
+    """
+
+    def __init__(
+        self,
+        client,
+        stream: str,
+        group: str,
+        handler: Callable[[dict], Awaitable[None]],
+        consumer: str | None = None,
+        settings: StreamSettings | None = None,
+    ):
+        self.client = client
+        self.stream = stream
+        self.group = group
+        self.handler = handler
+        self.consumer = consumer or consumer_name()
+        self.settings = settings or stream_settings
+        self._last_claim = 0.0
+
+    async def ensure_group(self) -> None:
+        """Create the group (and the stream) unless it already exists."""
+        try:
+            await self.client.xgroup_create(self.stream, self.group, id=self.settings.start_id, mkstream=True)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def run(self) -> None:
+        await self.ensure_group()
+        while True:
+            await self.poll()
+
+    async def poll(self) -> int:
+        """Reclaim stale entries if due, then read and handle one batch of new ones."""
+        handled = await self.reclaim()
+        response = await self.client.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=self.settings.batch_size,
+            block=self.settings.block_ms,
+        )
+        for entry_id, fields in _entries(response):
+            await self._handle(entry_id, fields)
+            handled += 1
+        return handled
+
+    async def reclaim(self, force: bool = False) -> int:
+        """Claim and retry entries that have been pending for longer than claim_idle_ms."""
+        now = time.monotonic()
+        if not force and now - self._last_claim < self.settings.claim_idle_ms / 2000:
+            return 0
+        self._last_claim = now
+
+        handled = 0
+        start_id = "0-0"
+        while True:
+            reply = await self.client.xautoclaim(
+                self.stream,
+                self.group,
+                self.consumer,
+                min_idle_time=self.settings.claim_idle_ms,
+                start_id=start_id,
+                count=self.settings.batch_size,
+            )
+            start_id, claimed = reply[0], reply[1]
+            for entry_id, fields in claimed:
+                RECLAIMED.inc(stream=self.stream)
+                await self._handle(entry_id, fields, retry=True)
+                handled += 1
+            if start_id in ("0-0", b"0-0") or not claimed:
+                return handled
+
+    async def _handle(self, entry_id, fields, retry: bool = False) -> None:
+        if not fields or FIELD not in fields:
+            # Trimmed away while pending; nothing left to handle.
+            await self.client.xack(self.stream, self.group, entry_id)
+            return
+        try:
+            data = event_codec.decode(fields[FIELD])
+        except (TypeError, ValueError):
+            await self._dead_letter(entry_id, fields, "invalid")
+            return
+
+        try:
+            await self.handler(data)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Handling %s %s failed: %s", self.stream, entry_id, exc)
+            if retry and await self._deliveries(entry_id) >= self.settings.max_deliveries:
+                await self._dead_letter(entry_id, fields, "failed")
+            return
+        await self.client.xack(self.stream, self.group, entry_id)
+
+    async def _deliveries(self, entry_id) -> int:
+        pending = await self.client.xpending_range(self.stream, self.group, min=entry_id, max=entry_id, count=1)
+        return pending[0]["times_delivered"] if pending else 0
+
+    async def _dead_letter(self, entry_id, fields, reason: str) -> None:
+        await self.client.xadd(
+            f"{self.stream}:dead",
+            {**(fields or {}), "source_id": entry_id, "group": self.group, "reason": reason},
+            maxlen=self.settings.maxlen,
+            approximate=True,
+        )
+        await self.client.xack(self.stream, self.group, entry_id)
+        DEAD_LETTERED.inc(stream=self.stream, reason=reason)
+
+
+async def tail_stream(
+    client,
+    stream: str,
+    handler: Callable[[dict, bytes | str], Awaitable[None]],
+    settings: StreamSettings | None = None,
+) -> None:
+    """
+    Hand every new entry of `stream` to `handler(event, raw)`, without a group.
+
+    For fan-out readers such as the realtime service, where every process
+    needs every entry. Reading starts after the newest entry at startup.
+    """
+    settings = settings or stream_settings
+    latest = await client.xrevrange(stream, "+", "-", count=1)
+    last_id = latest[0][0] if latest else "0-0"
+    while True:
+        response = await client.xread({stream: last_id}, count=settings.batch_size, block=settings.block_ms)
+        for entry_id, fields in _entries(response):
+            last_id = entry_id
+            try:
+                raw = fields[FIELD]
+                data = event_codec.decode(raw)
+            except (KeyError, TypeError, ValueError):
+                logger.warning("Skipping malformed %s entry %s", stream, entry_id)
+                continue
+            try:
+                await handler(data, raw)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.warning("Handling %s %s failed: %s", stream, entry_id, exc)
@@ -0,0 +1,63 @@
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.shared.metrics.registry import REGISTRY, Gauge, Histogram
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("service", "method", "route", "status"),
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served.", ("service",))
+
+
+class MetricsMiddleware:
+    """
+    Time every HTTP request and count those in flight.
+
+    Requests are labelled with the matched route template
+    (`/threads/{thread_id}`), never the raw path, so label cardinality
+    stays bounded; paths that match no route share `unmatched`.
+    """
+
+    def __init__(self, app, service: str):
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc(service=self.service)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.dec(service=self.service)
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                service=self.service,
+                method=scope["method"],
+                route=getattr(scope.get("route"), "path", None) or "unmatched",
+                status=status,
+            )
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
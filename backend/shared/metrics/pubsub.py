@@ -0,0 +1,62 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
+
+from backend.shared.metrics.registry import Counter, Histogram
+
+# Messages handled later than this after publishing count as lagged.
+LAG_WARN_SECONDS = 1.0
+
+PUBLISH_DURATION = Histogram(
+    "redis_publish_duration_seconds",
+    "Time to publish one message to Redis.",
+    ("service", "channel"),
+)
+EVENTS_CONSUMED = Counter(
+    "redis_listener_events_total",
+    "Pub/sub messages handled by a listener, by outcome (ok, invalid, error).",
+    ("service", "channel", "outcome"),
+)
+EVENT_LAG = Histogram(
+    "redis_listener_lag_seconds",
+    "Delay between publishing a message and handling it, for messages with a timestamp.",
+    ("service", "channel"),
+)
+EVENTS_LAGGED = Counter(
+    "redis_listener_lagged_events_total",
+    f"Messages handled more than {LAG_WARN_SECONDS:g}s after they were published.",
+    ("service", "channel"),
+)
+
+
+@contextmanager
+def timed_publish(service: str, channel: str) -> Iterator[None]:
+    """Record how long a successful publish inside the block took."""
+    started = time.perf_counter()
+    yield
+    PUBLISH_DURATION.observe(time.perf_counter() - started, service=service, channel=channel)
+
+
+def event_age(message: dict, field: str = "timestamp") -> float | None:
+    """Seconds since the ISO timestamp in `message[field]`, or None without one."""
+    timestamp = message.get(field) if isinstance(message, dict) else None
+    if not timestamp:
+        return None
+    try:
+        published = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - published).total_seconds())
+
+
+def record_consumed(service: str, channel: str, message: dict | None, outcome: str = "ok") -> None:
+    EVENTS_CONSUMED.inc(service=service, channel=channel, outcome=outcome)
+    lag = event_age(message) if message is not None else None
+    if lag is None:
+        return
+    EVENT_LAG.observe(lag, service=service, channel=channel)
+    if lag > LAG_WARN_SECONDS:
+        EVENTS_LAGGED.inc(service=service, channel=channel)
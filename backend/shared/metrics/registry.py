@@ -0,0 +1,163 @@
+"""
+Prometheus text-format metrics without a client library.
+
+Updates never take a lock: each thread writes to its own shard (a plain
+dict found through threading.local) and a scrape sums the shards. Only
+the owning thread mutates a shard, so under the GIL no increment is
+lost, and the scrape copies each shard with one atomic dict.copy().
+"""
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+# (metric name, type, help, [(labels, value), ...])
+Family = tuple[str, str, str, list[tuple[dict, float]]]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Sharded:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        (registry or REGISTRY).register(self)
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            self._shards.append(shard)
+        return shard
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _merged(self) -> dict:
+        merged: dict = {}
+        for shard in list(self._shards):
+            for key, value in shard.copy().items():
+                merged[key] = self._combine(merged.get(key), value)
+        return merged
+
+    @staticmethod
+    def _combine(total, value):
+        return value if total is None else total + value
+
+    def collect(self) -> list[Family]:
+        samples = [(dict(zip(self.labelnames, key)), value) for key, value in sorted(self._merged().items())]
+        return [(self.name, self.type, self.documentation, samples)]
+
+
+class Counter(_Sharded):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+
+class Gauge(Counter):
+    """A sum of per-thread deltas, so inc and dec may happen on different threads."""
+
+    type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Sharded):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, **labels) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        row = shard.get(key)
+        if row is None:
+            # One slot per bucket, +Inf, then the sum.
+            row = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    @staticmethod
+    def _combine(total, value):
+        return list(value) if total is None else [a + b for a, b in zip(total, value)]
+
+    def collect(self) -> list[Family]:
+        buckets, sums, counts = [], [], []
+        for key, row in sorted(self._merged().items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), row):
+                cumulative += count
+                buckets.append((labels | {"le": _format(bound)}, cumulative))
+            sums.append((labels, row[-1]))
+            counts.append((labels, cumulative))
+        return [
+            (f"{self.name}_bucket", "histogram", self.documentation, buckets),
+            (f"{self.name}_sum", "", "", sums),
+            (f"{self.name}_count", "", "", counts),
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Sharded] = []
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def register(self, metric: _Sharded) -> None:
+        self._metrics.append(metric)
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """Register a callback that produces samples at scrape time (pool stats, room sizes)."""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def collect(self) -> list[Family]:
+        families = [family for metric in self._metrics for family in metric.collect()]
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        """The Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, kind, documentation, samples in self.collect():
+            family = name.removesuffix("_bucket") if kind == "histogram" else name
+            if kind:
+                lines.append(f"# HELP {family} {documentation}")
+                lines.append(f"# TYPE {family} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(labels)} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+REGISTRY = Registry()
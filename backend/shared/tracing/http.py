@@ -0,0 +1,41 @@
+from backend.shared.tracing.tracer import SpanContext, start_span
+
+
+class TracingMiddleware:
+    """
+    Open a server span per HTTP request.
+
+    An incoming `traceparent` header continues the caller's trace. The
+    span is renamed to the matched route template once routing is done.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        parent = SpanContext.parse(headers.get(b"traceparent", b"").decode("latin-1"))
+        method = scope["method"]
+
+        with start_span(f"{method} {scope['path']}", parent=parent, kind="server") as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.name = f"{method} {route}"
+                    span.set_attribute("http.route", route)
+                span.set_attribute("http.method", method)
@@ -0,0 +1,178 @@
+"""
+Minimal W3C trace-context tracing for the event pipeline.
+
+A span's context travels between services as a `traceparent` string, in
+the `traceparent` HTTP header or in the `traceparent` field of a Redis
+event, so a like can be followed from the HTTP request through
+publish_event, the notification listener and the realtime broadcast.
+Finished spans are batched to the exporter chosen by TRACE_EXPORTER.
+
+Configuration comes from the environment rather than the auth settings
+because the realtime service imports this module too.
+"""
+import functools
+import logging
+import os
+import random
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @classmethod
+    def parse(cls, traceparent: str | None) -> "SpanContext | None":
+        match = _TRACEPARENT.match(traceparent or "")
+        if match is None or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+            return None
+        return cls(match.group(1), match.group(2), int(match.group(3), 16) & 1 == 1)
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_id: str | None = None
+    kind: str = "internal"
+    attributes: dict = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    error: str | None = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1_000_000
+
+
+_current: ContextVar[Span | None] = ContextVar("trace_span", default=None)
+_service_name = "forum"
+_sample_ratio = 1.0
+_processor = None
+
+
+def setup_tracing(service_name: str) -> None:
+    """Name this process's spans and start the exporter from TRACE_EXPORTER (`none`, `file` or `otlp`)."""
+    global _service_name, _sample_ratio, _processor
+    from backend.shared.tracing.exporters import BatchProcessor, FileExporter, OTLPHttpExporter
+
+    _service_name = service_name
+    try:
+        _sample_ratio = min(1.0, max(0.0, float(os.getenv("TRACE_SAMPLE_RATIO", "1.0"))))
+    except ValueError:
+        _sample_ratio = 1.0
+
+    kind = os.getenv("TRACE_EXPORTER", "none").lower()
+    if kind == "file":
+        exporter = FileExporter(os.getenv("TRACE_FILE", "logs/traces.jsonl"))
+    elif kind == "otlp":
+        exporter = OTLPHttpExporter(os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces"))
+    else:
+        if kind != "none":
+            logger.warning("Unknown TRACE_EXPORTER %r; tracing disabled", kind)
+        exporter = None
+
+    if _processor is not None:
+        _processor.shutdown()
+    _processor = BatchProcessor(exporter) if exporter is not None else None
+
+
+def set_processor(processor) -> None:
+    """Swap the span processor (tests pass one that keeps spans in memory; None disables tracing)."""
+    global _processor
+    _processor = processor
+
+
+def tracing_enabled() -> bool:
+    return _processor is not None
+
+
+def service_name() -> str:
+    return _service_name
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+@contextmanager
+def start_span(name: str, parent: SpanContext | None = None, kind: str = "internal", **attributes) -> Iterator[Span | None]:
+    """
+    Run the block inside a new span.
+
+    The parent defaults to the current span; pass one extracted from an
+    event or header to continue a trace from another service. When
+    tracing is off this yields None and costs one attribute lookup.
+    """
+    if _processor is None:
+        yield None
+        return
+
+    current = _current.get()
+    if parent is None and current is not None:
+        parent = current.context
+    if parent is None:
+        context = SpanContext(secrets.token_hex(16), secrets.token_hex(8), random.random() < _sample_ratio)
+    else:
+        context = SpanContext(parent.trace_id, secrets.token_hex(8), parent.sampled)
+
+    span = Span(name, context, parent.span_id if parent else None, kind, attributes)
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _current.reset(token)
+        span.end_ns = time.time_ns()
+        if context.sampled and _processor is not None:
+            _processor.submit(span)
+
+
+def traced(name: str):
+    """Decorator form of start_span for service methods."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def inject(message: dict) -> dict:
+    """Add the current span's `traceparent` to an outgoing event."""
+    span = _current.get()
+    if span is not None:
+        message["traceparent"] = span.context.traceparent
+    return message
+
+
+def extract(message: dict | None) -> SpanContext | None:
+    """The span context an incoming event was published under, if any."""
+    if not isinstance(message, dict):
+        return None
+    return SpanContext.parse(message.get("traceparent"))